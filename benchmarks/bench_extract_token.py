@@ -0,0 +1,71 @@
+"""Скорость извлечения токена: исходная реализация против предкомпилированной.
+
+Запуск из корня репозитория: python -m benchmarks.bench_extract_token
+"""
+import re
+import timeit
+from urllib.parse import unquote
+
+from src.bot.handlers.start_handler import extract_token
+
+TOKEN = "y0_AgAAAAAbCdEfGhIjKlMnOpQrStUvWxYz0123456789-_"
+N = 20_000
+
+SAMPLES = {
+    "URL после авторизации": (
+        f"https://music.yandex.ru/#access_token={TOKEN}&token_type=bearer&expires_in=31535645"
+    ),
+    "закодированный URL": f"https%3A%2F%2Fmusic.yandex.ru%2F%23access_token%253D{TOKEN}%26token_type%3Dbearer",
+    "голый токен": f"  {TOKEN}\n",
+    "текст без токена": "привет, вот мой токен: " + "очень длинное сообщение " * 20,
+}
+
+
+def legacy_extract_token(raw_string):
+    clean_string = ''.join(raw_string.split())
+
+    patterns = [
+        r'access_token=([A-Za-z0-9_-]{30,})',
+        r'access_token%3D([A-Za-z0-9_-]{30,})',
+        r'access_token%253D([A-Za-z0-9_-]{30,})',
+    ]
+
+    for pattern in patterns:
+        match = re.search(pattern, clean_string)
+        if match:
+            return match.group(1)
+
+    try:
+        decoded = unquote(clean_string)
+        for pattern in patterns[:2]:
+            match = re.search(pattern, decoded)
+            if match:
+                return match.group(1)
+    except:
+        pass
+
+    direct_match = re.search(r'\b(y0_[A-Za-z0-9_-]{30,})\b', clean_string)
+    if direct_match:
+        return direct_match.group(1)
+
+    fallback = re.search(r'(y0_[A-Za-z0-9_-]{30,})|(AQ[A-Za-z0-9_-]{30,})', clean_string)
+    if fallback:
+        return fallback.group(1) or fallback.group(2)
+
+    return None
+
+
+def main():
+    for label, raw in SAMPLES.items():
+        assert legacy_extract_token(raw) == extract_token(raw)
+        legacy = timeit.timeit(lambda: legacy_extract_token(raw), number=N)
+        current = timeit.timeit(lambda: extract_token(raw), number=N)
+        print(
+            f"{label}: было {legacy / N * 1e6:.2f} мкс, "
+            f"стало {current / N * 1e6:.2f} мкс "
+            f"(x{legacy / current:.1f})"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""Стоимость клавиатуры на одно обновление: создание заново против кэша.
+
+Обновление - это получение клавиатуры и её сериализация (model_dump), как при
+отправке сообщения. Запуск из корня репозитория: python -m benchmarks.bench_keyboards
+"""
+import timeit
+import tracemalloc
+
+from aiogram.types import InlineKeyboardButton, InlineKeyboardMarkup
+
+from src.bot.keyboards import get_back_button, get_playlists_keyboard
+from src.bot.keyboards.main_menu import PLAYLIST_PAGE_SIZES
+
+N = 20_000
+PAGE_SIZE = PLAYLIST_PAGE_SIZES[0]
+
+
+def legacy_back_button():
+    return InlineKeyboardMarkup(inline_keyboard=[
+        [InlineKeyboardButton(text="🔙 Назад в меню", callback_data="back_to_menu")]
+    ])
+
+
+def legacy_nav_button(text, offset, limit):
+    if offset is None:
+        return InlineKeyboardButton(text="·", callback_data="noop")
+    return InlineKeyboardButton(text=text, callback_data=f"playlists:o:{offset}:{limit}")
+
+
+def legacy_playlists_keyboard(offset, limit, total, items=()):
+    """Та же клавиатура, что у get_playlists_keyboard, но все кнопки создаются заново."""
+    buttons = [
+        [InlineKeyboardButton(text=f"{number}. {title}", callback_data=f"playlist:{kind}:0:{offset}:{limit}")]
+        for number, (kind, title) in enumerate(items, start=offset + 1)
+    ]
+    total_pages = max(1, -(-total // limit))
+    if total > limit:
+        last_offset = (total_pages - 1) * limit
+        buttons.append([
+            legacy_nav_button("⏮", 0 if offset > 0 else None, limit),
+            legacy_nav_button("◀️", max(0, offset - limit) if offset > 0 else None, limit),
+            InlineKeyboardButton(text=f"· {offset // limit + 1}/{total_pages} ·", callback_data="noop"),
+            legacy_nav_button("▶️", offset + limit if offset + limit < total else None, limit),
+            legacy_nav_button("⏭", last_offset if offset < last_offset else None, limit),
+        ])
+        buttons.append([
+            InlineKeyboardButton(text="🔢 К странице", callback_data=f"playlists:jump:{limit}"),
+            InlineKeyboardButton(text="🔎 Поиск", callback_data=f"playlists:search:{limit}"),
+        ])
+    if total > PLAYLIST_PAGE_SIZES[0]:
+        buttons.append([
+            InlineKeyboardButton(text=f"· {size} ·", callback_data="noop") if size == limit
+            else legacy_nav_button(f"По {size}", offset // size * size, size)
+            for size in PLAYLIST_PAGE_SIZES
+        ])
+    buttons.append([InlineKeyboardButton(text="🔙 Назад в меню", callback_data="back_to_menu")])
+    return InlineKeyboardMarkup(inline_keyboard=buttons)
+
+
+def page_args(i):
+    """Аргументы i-й страницы из десяти: смещение, размер, всего плейлистов и пары (kind, название)."""
+    offset = i % 10 * PAGE_SIZE
+    items = tuple((kind, f"Плейлист {kind}") for kind in range(offset + 1, offset + PAGE_SIZE + 1))
+    return offset, PAGE_SIZE, 10 * PAGE_SIZE, items
+
+
+def measure(update):
+    update(0)
+    seconds = timeit.timeit(lambda: update(0), number=N)
+
+    tracemalloc.start()
+    allocated = 0
+    for i in range(1000):
+        current, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        update(i)
+        _, peak = tracemalloc.get_traced_memory()
+        allocated += peak - current
+    tracemalloc.stop()
+    return seconds / N * 1e6, allocated / 1000
+
+
+def main():
+    for i in range(10):
+        assert legacy_playlists_keyboard(*page_args(i)) == get_playlists_keyboard(*page_args(i))
+    cases = [
+        ("get_back_button", lambda i: legacy_back_button().model_dump(), lambda i: get_back_button().model_dump()),
+        (
+            "get_playlists_keyboard",
+            lambda i: legacy_playlists_keyboard(*page_args(i)).model_dump(),
+            lambda i: get_playlists_keyboard(*page_args(i)).model_dump(),
+        ),
+    ]
+    for label, legacy, cached in cases:
+        legacy_us, legacy_bytes = measure(legacy)
+        cached_us, cached_bytes = measure(cached)
+        print(
+            f"{label}: было {legacy_us:.2f} мкс и {legacy_bytes:.0f} Б, "
+            f"стало {cached_us:.2f} мкс и {cached_bytes:.0f} Б на обновление"
+        )
+
+
+if __name__ == "__main__":
+    main()
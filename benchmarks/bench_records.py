@@ -0,0 +1,68 @@
+"""Сравнение памяти: словари против slotted-записей сервисного слоя.
+
+Запуск из корня репозитория: python -m benchmarks.bench_records
+"""
+import tracemalloc
+
+from src.services.records import AddResult, PlaylistInfo
+
+N = 100_000
+
+
+def make_playlist_dict(i):
+    return {
+        "kind": i,
+        "title": f"Плейлист {i}",
+        "description": None,
+        "track_count": i % 500,
+        "created": "2024-01-01T00:00:00+00:00",
+        "modified": "2024-06-01T00:00:00+00:00",
+        "cover": None,
+        "owner_login": "user",
+    }
+
+
+def make_playlist_record(i):
+    return PlaylistInfo(
+        kind=i,
+        title=f"Плейлист {i}",
+        track_count=i % 500,
+        created="2024-01-01T00:00:00+00:00",
+        modified="2024-06-01T00:00:00+00:00",
+        owner_login="user",
+    )
+
+
+def make_result_dict(i):
+    return {"query": f"query {i}", "title": f"Artist - Song {i}"}
+
+
+def make_result_record(i):
+    return AddResult(f"query {i}", title=f"Artist - Song {i}")
+
+
+def measure(factory):
+    tracemalloc.start()
+    items = [factory(i) for i in range(N)]
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del items
+    return current
+
+
+def main():
+    for label, as_dict, as_record in [
+        ("PlaylistInfo", make_playlist_dict, make_playlist_record),
+        ("AddResult", make_result_dict, make_result_record),
+    ]:
+        dict_bytes = measure(as_dict)
+        record_bytes = measure(as_record)
+        print(
+            f"{label}: dict {dict_bytes / N:.0f} Б/объект, "
+            f"slots {record_bytes / N:.0f} Б/объект "
+            f"({1 - record_bytes / dict_bytes:.0%} экономии)"
+        )
+
+
+if __name__ == "__main__":
+    main()
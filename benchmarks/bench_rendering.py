@@ -0,0 +1,115 @@
+"""Скорость сборки сообщений: конкатенация через += против шаблонов и join.
+
+Исходная реализация не экранировала пользовательские строки, поэтому она
+замеряется в двух вариантах: как была и с добавленным html.escape.
+Запуск из корня репозитория: python -m benchmarks.bench_rendering
+"""
+import html
+import timeit
+from datetime import date, timedelta
+
+from src.bot.rendering import render_playlists_page, render_stats
+from src.services.records import PlaylistInfo, PlaylistPage
+
+N = 2_000
+PAGE_SIZE = 100
+
+PLAYLISTS = [
+    PlaylistInfo(kind=i, title=f"Плейлист {i}", track_count=i % 300, owner_login="friend" if i % 3 else None)
+    for i in range(PAGE_SIZE)
+]
+STATS = {
+    "liked_tracks_count": 12345,
+    "recent_likes_last_month": 42,
+    "top_artists": [{"name": f"Артист {i}", "count": 50 - i} for i in range(5)],
+    "top_genres_recent": [{"name": f"жанр {i}", "count": 30 - i} for i in range(5)],
+    "listening_minutes": {
+        "days": 30,
+        "total": 1800,
+        "per_day": [{"date": (date(2024, 5, 1) + timedelta(days=i)).isoformat(), "minutes": 60} for i in range(30)],
+    },
+    "top_genres_library": [{"name": f"жанр {i}", "count": 100 - i} for i in range(5)],
+}
+
+
+def legacy_playlists_page(page_playlists, total_playlists, page, total_pages, user_id, escape=str):
+    text = "📁 <b>Ваши плейлисты</b>\n"
+    text += f"Всего: {total_playlists} • Страница {page + 1}/{total_pages}\n\n"
+    for pl in page_playlists:
+        title = pl.title or "Без названия"
+        track_count = pl.track_count or 0
+        if pl.kind == 3:
+            icon = "❤️"
+        elif title.lower() in ["избранное", "favorites", "liked"]:
+            icon = "⭐"
+        else:
+            icon = "📁"
+        text += f"{icon} <b>{escape(title)}</b>\n"
+        text += f"   └ {track_count} {'трек' if track_count == 1 else 'треков'}\n"
+        owner_login = pl.owner_login
+        if owner_login and str(owner_login) != str(user_id):
+            text += f"   👤 by @{escape(owner_login)}\n"
+        text += "\n"
+    return text
+
+
+def legacy_stats(stats, escape=str):
+    text = "📊 <b>Ваша статистика</b>\n\n"
+    text += f"❤️ Лайкнутых треков: <b>{stats.get('liked_tracks_count', 0):,}</b>\n"
+    text += f"📅 Лайков за месяц: <b>{stats.get('recent_likes_last_month', 0)}</b>\n\n"
+    for key, title, unit in [
+        ("top_artists", "🎤 <b>Топ артистов:</b>\n", "треков"),
+        ("top_genres_recent", "🎵 <b>Топ жанров (90 дней):</b>\n", "раз"),
+    ]:
+        items = stats.get(key, [])
+        if items:
+            text += title
+            for i, item in enumerate(items[:5], 1):
+                text += f"  {i}. {escape(item.get('name', '?'))} — {item.get('count', 0)} {unit}\n"
+            text += "\n"
+    listening = stats.get('listening_minutes') or {}
+    if listening:
+        text += f"🎧 <b>Прослушано за {listening.get('days', 7)} дн.:</b> {listening.get('total', 0)} мин\n"
+        for day in listening.get('per_day', []):
+            day_label = date.fromisoformat(day['date']).strftime('%d.%m')
+            text += f"  {day_label} — {day.get('minutes', 0)} мин\n"
+        text += "\n"
+    top_genres_lib = stats.get('top_genres_library', [])
+    if top_genres_lib:
+        text += "📚 <b>Топ жанров (библиотека):</b>\n"
+        for i, genre in enumerate(top_genres_lib[:5], 1):
+            text += f"  {i}. {escape(genre.get('name', '?'))} — {genre.get('count', 0)} треков\n"
+    text += "\n⏳ <i>Собираю остальное...</i>"
+    return text
+
+
+def escape(value):
+    return html.escape(str(value), quote=False)
+
+
+def main():
+    cases = [
+        (
+            f"страница из {PAGE_SIZE} плейлистов",
+            lambda escape: legacy_playlists_page(PLAYLISTS, 1000, 0, 10, 42, escape),
+            lambda: render_playlists_page(PlaylistPage(tuple(PLAYLISTS), 0, PAGE_SIZE, 1000), 42),
+        ),
+        (
+            "статистика за 30 дней",
+            lambda escape: legacy_stats(STATS, escape),
+            lambda: render_stats(STATS, in_progress=True),
+        ),
+    ]
+    for label, legacy, current in cases:
+        assert legacy(escape) == current()
+        legacy_us = timeit.timeit(lambda: legacy(str), number=N) / N * 1e6
+        escaped_us = timeit.timeit(lambda: legacy(escape), number=N) / N * 1e6
+        current_us = timeit.timeit(current, number=N) / N * 1e6
+        print(
+            f"{label}: += без экранирования {legacy_us:.1f} мкс, "
+            f"+= с html.escape {escaped_us:.1f} мкс, шаблоны и join {current_us:.1f} мкс"
+        )
+
+
+if __name__ == "__main__":
+    main()
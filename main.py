@@ -7,6 +7,8 @@ from aiogram.client.default import DefaultBotProperties
 from dotenv import load_dotenv
 import os
 from src.bot.handlers import main_router
+from src.bot.send_queue import SendScheduler
+from src.bot.services import job_queue, stats_scheduler
 
 load_dotenv()
 
@@ -20,9 +22,12 @@ async def main():
         token=os.getenv("BOT_TOKEN"),
         default=DefaultBotProperties(parse_mode=ParseMode.HTML)
     )
+    bot.session.middleware(SendScheduler())
     dp = Dispatcher()
     dp.include_router(main_router)
     try:
+        await job_queue.start()
+        await stats_scheduler.start()
         await bot.delete_webhook(drop_pending_updates=True)
         logger.info("Webhook удален")
         logger.info("Бот запущен")
@@ -31,6 +36,8 @@ async def main():
         logger.error(f"Ошибка: {e}")
         raise
     finally:
+        await stats_scheduler.stop()
+        await job_queue.stop()
         await bot.session.close()
         logger.info("Бот остановлен")
 
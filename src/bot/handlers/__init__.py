@@ -8,7 +8,8 @@ from . import (
     create_playlist_handler,
     add_tracks_handler,
     like_track_handler,
-    stats_handler
+    stats_handler,
+    jobs_handler
 )
 
 
@@ -23,5 +24,6 @@ main_router.include_router(create_playlist_handler.router)
 main_router.include_router(add_tracks_handler.router)
 main_router.include_router(like_track_handler.router)
 main_router.include_router(stats_handler.router)
+main_router.include_router(jobs_handler.router)
 
 __all__ = ['main_router']
\ No newline at end of file
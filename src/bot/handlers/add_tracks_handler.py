@@ -5,8 +5,11 @@ from aiogram.fsm.context import FSMContext
 from aiogram.fsm.state import State, StatesGroup
 
 from ...database.storage import get_token
-from ..services import ym_service
-from ..keyboards.main_menu import get_back_button
+from ..services import ym_service, job_queue
+from ..jobs import JOB_CANCELLED, JOB_FAILED
+from ..keyboards.main_menu import get_back_button, get_job_keyboard
+from ..progress import ThrottledEditor
+from ..rendering import escape, render_add_tracks_result
 
 router = Router()
 logger = logging.getLogger(__name__)
@@ -52,7 +55,7 @@ async def receive_playlist_title_for_tracks(message: Message, state: FSMContext)
     await state.set_state(AddTracksStates.waiting_for_track_names)
 
     await message.answer(
-        f"📁 Плейлист: <b>{playlist_title}</b>\n\n"
+        f"📁 Плейлист: <b>{escape(playlist_title)}</b>\n\n"
         "Отправьте название трека.\n\n"
         "<b>Примеры:</b>\n"
         "• <code>Imagine Dragons Believer</code>\n"
@@ -96,46 +99,57 @@ async def receive_track_names(message: Message, state: FSMContext):
         return
 
     status_msg = await message.answer(
-        f"🎼 Добавляю {len(track_names)} трек(ов) в плейлист <b>{playlist_title}</b>...",
+        f"🎼 Добавляю {len(track_names)} трек(ов) в плейлист <b>{escape(playlist_title)}</b>...",
         reply_markup=get_back_button()
     )
 
-    try:
-        result = await ym_service.add_tracks_by_name(
-            token,
-            user_id,
-            playlist_title,
-            track_names,
+    editor = ThrottledEditor(status_msg)
+    added = []
+    failed = []
+
+    async def on_item(job, item):
+        status, result = item
+        (added if status == "added" else failed).append(result)
+        await editor.update(
+            render_add_tracks_result(playlist_title, added, failed, total=len(track_names)),
+            reply_markup=get_job_keyboard(job.id)
+        )
+
+    async def on_finish(job):
+        if job.status == JOB_FAILED:
+            logger.error(f"Ошибка: {job.error}")
+            await editor.update("❌ Произошла ошибка", reply_markup=get_back_button(), force=True)
+            return
+        await editor.update(
+            render_add_tracks_result(
+                playlist_title, added, failed, cancelled=job.status == JOB_CANCELLED
+            ),
+            reply_markup=get_back_button(),
+            force=True
         )
 
-        added = result.get("added", [])
-        failed = result.get("failed", [])
+    await state.clear()
+    job = job_queue.submit(
+        user_id,
+        "add_tracks",
+        lambda: ym_service.iter_add_tracks_by_name(token, user_id, playlist_title, track_names),
+        on_item,
+        on_finish,
+    )
+
+    if job is None:
+        await status_msg.edit_text(
+            "⏳ Предыдущее добавление ещё выполняется или очередь переполнена.\n"
+            "Попробуйте чуть позже.",
+            reply_markup=get_back_button()
+        )
+        return
 
-        text_resp = (
-            f"✅ <b>Готово!</b>\n\n"
-            f"📁 Плейлист: <b>{playlist_title}</b>\n"
-            f"➕ Добавлено: {len(added)}\n"
-            f"❌ Не добавлено: {len(failed)}\n"
+    # Быстрая задача могла уже завершиться: итог не перетираем статусом «в процессе»
+    if job.active:
+        await editor.update(
+            f"🎼 Добавляю {len(track_names)} трек(ов) в плейлист <b>{escape(playlist_title)}</b>...",
+            reply_markup=get_job_keyboard(job.id),
+            force=True
         )
 
-        if added:
-            text_resp += "\n<b>Добавленные треки:</b>\n"
-            for item in added[:10]:
-                text_resp += f"• {item['title']}\n"
-            if len(added) > 10:
-                text_resp += f"... и ещё {len(added) - 10}\n"
-
-        if failed:
-            text_resp += "\n<b>Не удалось добавить:</b>\n"
-            for item in failed[:10]:
-                text_resp += f"• {item['query']}\n"
-            if len(failed) > 10:
-                text_resp += f"... и ещё {len(failed) - 10}\n"
-
-        await status_msg.edit_text(text_resp, reply_markup=get_back_button())
-        await state.clear()
-
-    except Exception as e:
-        logger.error(f"Ошибка: {e}", exc_info=True)
-        await status_msg.edit_text("❌ Произошла ошибка")
-        await state.clear()
@@ -7,6 +7,7 @@ from aiogram.fsm.state import State, StatesGroup
 from ...database.storage import get_token
 from ..services import ym_service
 from ..keyboards.main_menu import get_back_button
+from ..rendering import escape
 
 router = Router()
 logger = logging.getLogger(__name__)
@@ -51,7 +52,7 @@ async def receive_playlist_title(message: Message, state: FSMContext):
         )
         return
 
-    status_msg = await message.answer(f"➕ Создаю плейлист '{title}'...")
+    status_msg = await message.answer(f"➕ Создаю плейлист '{escape(title)}'...")
 
     try:
         result = await ym_service.create_playlist(token, user_id, title)
@@ -59,7 +60,7 @@ async def receive_playlist_title(message: Message, state: FSMContext):
         if result:
             await status_msg.edit_text(
                 f"✅ <b>Плейлист создан!</b>\n\n"
-                f"📁 Название: <b>{result['title']}</b>",
+                f"📁 Название: <b>{escape(result['title'])}</b>",
                 reply_markup=get_back_button()
             )
         else:
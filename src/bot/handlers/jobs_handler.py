@@ -0,0 +1,22 @@
+import logging
+from aiogram import Router, F
+from aiogram.types import CallbackQuery
+
+from ..services import job_queue
+
+router = Router()
+logger = logging.getLogger(__name__)
+
+
+@router.callback_query(F.data.startswith("job:cancel:"))
+async def cancel_job_callback(callback: CallbackQuery):
+    try:
+        job_id = int(callback.data.split(":")[2])
+    except (IndexError, ValueError):
+        await callback.answer()
+        return
+
+    if job_queue.cancel(job_id, callback.from_user.id):
+        await callback.answer("⛔ Отменяю...")
+    else:
+        await callback.answer("Задача уже завершена")
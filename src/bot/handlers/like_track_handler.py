@@ -8,6 +8,7 @@ from aiogram.fsm.state import State, StatesGroup
 from ...database.storage import get_token
 from ..services import ym_service
 from ..keyboards.main_menu import get_back_button
+from ..rendering import escape
 
 
 router = Router()
@@ -56,8 +57,14 @@ async def receive_track_query(message: Message, state: FSMContext):
     status_msg = await message.answer("🔍 Ищу трек...")
     
     try:
-        from yandex_music import Client
-        client = Client(token).init()
+        client = ym_service.get_client(token, user_id) if token else None
+        if client is None:
+            await status_msg.edit_text(
+                "❌ Вы не авторизованы. Используйте /auth",
+                reply_markup=get_back_button()
+            )
+            await state.clear()
+            return
         
         track_id = None
         track_info = None
@@ -75,14 +82,12 @@ async def receive_track_query(message: Message, state: FSMContext):
         else:
             await status_msg.edit_text("🔍 Ищу трек по названию...")
             
-            clean_query = query.replace('"', '').replace("'", '').strip()
-            
-            search_result = client.search(clean_query, type_='track')
+            found = await ym_service.find_track(token, user_id, query)
             
-            if not search_result or not search_result.tracks or not search_result.tracks.results:
+            if found is None:
                 await status_msg.edit_text(
                     f"❌ <b>Трек не найден</b>\n\n"
-                    f"Запрос: <code>{query}</code>\n\n"
+                    f"Запрос: <code>{escape(query)}</code>\n\n"
                     "Попробуйте:\n"
                     "• Написать по-другому\n"
                     "• Убрать лишние символы\n"
@@ -96,25 +101,17 @@ async def receive_track_query(message: Message, state: FSMContext):
                 await state.clear()
                 return
             
-            track = search_result.tracks.results[0]
-            
-            if hasattr(track, 'albums') and track.albums and len(track.albums) > 0:
-                track_id = f"{track.id}:{track.albums[0].id}"
-            else:
-                track_id = str(track.id)
-            
-            artist_name = track.artists[0].name if track.artists else "Неизвестный исполнитель"
-            track_info = f"{artist_name} - {track.title}"
+            track_id, track_info = found.track_id, found.title
             
             logger.info(f"Найден трек: {track_info}, ID: {track_id}")
-            await status_msg.edit_text(f"✅ Найден: <b>{track_info}</b>\n\n❤️ Лайкаю...")
+            await status_msg.edit_text(f"✅ Найден: <b>{escape(track_info)}</b>\n\n❤️ Лайкаю...")
         
         try:
             client.users_likes_tracks_add(track_id)
             
             success_text = "✅ <b>Трек лайкнут!</b>\n\n"
             if track_info:
-                success_text += f"🎵 {track_info}"
+                success_text += f"🎵 {escape(track_info)}"
             
             await status_msg.edit_text(
                 success_text,
@@ -129,14 +126,14 @@ async def receive_track_query(message: Message, state: FSMContext):
             if 'already' in error_msg or 'exist' in error_msg:
                 await status_msg.edit_text(
                     f"ℹ️ <b>Трек уже в ваших лайках</b>\n\n"
-                    f"🎵 {track_info if track_info else query}",
+                    f"🎵 {escape(track_info or query)}",
                     reply_markup=get_back_button()
                 )
             else:
                 await status_msg.edit_text(
                     f"❌ <b>Не удалось лайкнуть</b>\n\n"
-                    f"🎵 {track_info if track_info else query}\n\n"
-                    f"Ошибка: <code>{str(like_error)[:100]}</code>",
+                    f"🎵 {escape(track_info or query)}\n\n"
+                    f"Ошибка: <code>{escape(str(like_error)[:100])}</code>",
                     reply_markup=get_back_button()
                 )
         
@@ -146,7 +143,7 @@ async def receive_track_query(message: Message, state: FSMContext):
         logger.error(f"Ошибка поиска/лайка трека: {e}", exc_info=True)
         await status_msg.edit_text(
             f"❌ <b>Не удалось выполнить поиск</b>\n\n"
-            f"Запрос: <code>{query}</code>\n\n"
+            f"Запрос: <code>{escape(query)}</code>\n\n"
             "Попробуйте изменить формулировку или использовать более простые ключевые слова.",
             reply_markup=get_back_button()
         )
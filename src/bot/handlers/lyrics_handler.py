@@ -5,12 +5,17 @@ from aiogram.fsm.context import FSMContext
 from aiogram.fsm.state import State, StatesGroup
 
 from ...database.storage import get_token
+from ...services.lyrics_decoder import encode_lrc
 from ..services import ym_service
-from ..keyboards.main_menu import get_back_button
+from ..keyboards.main_menu import get_back_button, get_lyrics_keyboard
+from ..text_utils import TELEGRAM_MESSAGE_LIMIT, escape, split_message
 
 router = Router()
 logger = logging.getLogger(__name__)
 
+# Запас под заголовок с названием трека и номером страницы
+LYRICS_PAGE_LIMIT = TELEGRAM_MESSAGE_LIMIT - 400
+
 
 class LyricsStates(StatesGroup):
     waiting_for_track_query = State()
@@ -66,8 +71,14 @@ async def receive_track_query(message: Message, state: FSMContext):
     status_msg = await message.answer("🔍 Ищу трек...")
 
     try:
-        from yandex_music import Client
-        client = Client(token).init()
+        client = ym_service.get_client(token, user_id)
+        if client is None:
+            await status_msg.edit_text(
+                "❌ Вы не авторизованы. Используйте /auth",
+                reply_markup=get_back_button()
+            )
+            await state.clear()
+            return
 
         track_id = None
         track_title = "Трек"
@@ -86,7 +97,7 @@ async def receive_track_query(message: Message, state: FSMContext):
                 artist_name = artists[0].name if artists else "Unknown"
                 track_title = f"{artist_name} - {track.title}"
                 await status_msg.edit_text(
-                    f"✅ Найден: <b>{track_title}</b>\n\n🎵 Получаю текст...",
+                    f"✅ Найден: <b>{escape(track_title)}</b>\n\n🎵 Получаю текст...",
                     reply_markup=get_back_button()
                 )
             except Exception as e:
@@ -112,7 +123,7 @@ async def receive_track_query(message: Message, state: FSMContext):
             if not search_result or not search_result.tracks or not search_result.tracks.results:
                 await status_msg.edit_text(
                     "❌ <b>Трек не найден</b>\n\n"
-                    f"Запрос: <code>{query}</code>\n\n"
+                    f"Запрос: <code>{escape(query)}</code>\n\n"
                     "Попробуйте:\n"
                     "• Добавить исполнителя\n"
                     "• Убрать лишние символы\n"
@@ -136,7 +147,7 @@ async def receive_track_query(message: Message, state: FSMContext):
 
             logger.info(f"[lyrics] Найден трек: {track_title} ({track_id})")
             await status_msg.edit_text(
-                f"✅ Найден: <b>{track_title}</b>\n\n🎵 Получаю текст...",
+                f"✅ Найден: <b>{escape(track_title)}</b>\n\n🎵 Получаю текст...",
                 reply_markup=get_back_button()
             )
 
@@ -153,7 +164,7 @@ async def receive_track_query(message: Message, state: FSMContext):
         if not isinstance(lyrics, str) or not lyrics.strip():
             await status_msg.edit_text(
                 f"❌ <b>Текст не найден</b>\n\n"
-                f"🎵 {track_title}\n\n"
+                f"🎵 {escape(track_title)}\n\n"
                 "Причины:\n"
                 "• У трека нет текста в базе\n"
                 "• Инструментал\n"
@@ -164,24 +175,11 @@ async def receive_track_query(message: Message, state: FSMContext):
             await state.clear()
             return
 
-        text = lyrics.strip()
-        header = f"🎵 <b>{track_title}</b>\n\n"
-
-        if len(text) > 3800:
-            await status_msg.edit_text(
-                header + "📄 Текст длинный, отправляю частями:",
-                reply_markup=get_back_button()
-            )
-            parts = [text[i:i + 3800] for i in range(0, len(text), 3800)]
-            for idx, part in enumerate(parts, 1):
-                await message.answer(
-                    f"<pre>Часть {idx}/{len(parts)}\n\n{part}</pre>"
-                )
-        else:
-            await status_msg.edit_text(
-                f"{header}<pre>{text}</pre>",
-                reply_markup=get_back_button()
-            )
+        pages = split_message(lyrics.strip(), LYRICS_PAGE_LIMIT)
+        await status_msg.edit_text(
+            render_lyrics_page(track_title, pages, 0),
+            reply_markup=get_lyrics_keyboard(track_id, 0, len(pages))
+        )
 
         logger.info(f"[lyrics] Текст отправлен пользователю {user_id}: {track_title}")
         await state.clear()
@@ -194,3 +192,82 @@ async def receive_track_query(message: Message, state: FSMContext):
             reply_markup=get_back_button()
         )
         await state.clear()
+
+
+def _parse_page_callback(data: str, prefix: str) -> tuple[str, int]:
+    track_id, _, page_raw = data[len(prefix):].rpartition(":")
+    try:
+        return track_id, int(page_raw)
+    except ValueError:
+        return track_id, 0
+
+
+async def _show_lyrics_page(callback: CallbackQuery, token: str, track_id: str, lyrics: str, page: int, synced: bool):
+    pages = split_message(lyrics.strip(), LYRICS_PAGE_LIMIT)
+    page = max(0, min(page, len(pages) - 1))
+
+    track_title = await ym_service.get_track_title(token, callback.from_user.id, track_id) or "Трек"
+
+    await callback.message.edit_text(
+        render_lyrics_page(track_title, pages, page),
+        reply_markup=get_lyrics_keyboard(track_id, page, len(pages), synced)
+    )
+
+
+@router.callback_query(F.data.startswith("lyrics:"))
+async def lyrics_page_callback(callback: CallbackQuery):
+    await callback.answer()
+
+    user_id = callback.from_user.id
+    token = get_token(user_id)
+
+    if not token:
+        await callback.message.edit_text(
+            "❌ Вы не авторизованы. Используйте /auth",
+            reply_markup=get_back_button()
+        )
+        return
+
+    track_id, page = _parse_page_callback(callback.data, "lyrics:")
+
+    lyrics = await ym_service.get_song_lyrics(token, user_id, track_id)
+    if not isinstance(lyrics, str) or not lyrics.strip():
+        await callback.message.edit_text(
+            "❌ <b>Текст не найден</b>",
+            reply_markup=get_back_button()
+        )
+        return
+
+    await _show_lyrics_page(callback, token, track_id, lyrics, page, synced=False)
+
+
+@router.callback_query(F.data.startswith("lyrics_sync:"))
+async def synced_lyrics_page_callback(callback: CallbackQuery):
+    user_id = callback.from_user.id
+    token = get_token(user_id)
+
+    if not token:
+        await callback.answer()
+        await callback.message.edit_text(
+            "❌ Вы не авторизованы. Используйте /auth",
+            reply_markup=get_back_button()
+        )
+        return
+
+    track_id, page = _parse_page_callback(callback.data, "lyrics_sync:")
+
+    lines = await ym_service.get_synced_lyrics(token, user_id, track_id)
+    if not any(line.time_ms is not None for line in lines):
+        await callback.answer("⏱ Для этого трека нет текста с таймкодами", show_alert=True)
+        return
+
+    await callback.answer()
+    logger.info(f"[lyrics] Текст с таймкодами для пользователя {user_id}: {track_id}")
+    await _show_lyrics_page(callback, token, track_id, encode_lrc(lines, with_ms=False), page, synced=True)
+
+
+def render_lyrics_page(track_title: str, pages: list[str], page: int) -> str:
+    header = f"🎵 <b>{escape(track_title)}</b>\n"
+    if len(pages) > 1:
+        header += f"📄 Страница {page + 1}/{len(pages)}\n"
+    return f"{header}\n<pre>{pages[page]}</pre>"
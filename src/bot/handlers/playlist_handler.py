@@ -1,31 +1,114 @@
 import logging
+import os
 from aiogram import Router, F
-from aiogram.types import CallbackQuery
-from typing import Any, Dict, List
+from aiogram.types import CallbackQuery, Message
+from aiogram.fsm.context import FSMContext
+from aiogram.fsm.state import State, StatesGroup
 
 from ...database.storage import get_token
 from ..services import ym_service
-from ..keyboards.main_menu import get_back_button, get_playlists_keyboard
+from ..keyboards.main_menu import (
+    PLAYLIST_PAGE_SIZES,
+    get_back_button,
+    get_playlist_tracks_keyboard,
+    get_playlists_keyboard,
+)
+from ..rendering import escape, render_playlist_tracks_page, render_playlists_page
 
 router = Router()
 logger = logging.getLogger(__name__)
 
+
+def parse_page_size(raw: str | None) -> int:
+    """Размер страницы из настройки; некорректное значение заменяется размером по умолчанию."""
+    if raw is None:
+        return PLAYLIST_PAGE_SIZES[0]
+    try:
+        value = int(raw)
+    except ValueError:
+        value = None
+    if value not in PLAYLIST_PAGE_SIZES:
+        logger.warning(
+            f"PLAYLISTS_PAGE_SIZE={raw!r} не из {PLAYLIST_PAGE_SIZES}, используется {PLAYLIST_PAGE_SIZES[0]}"
+        )
+        return PLAYLIST_PAGE_SIZES[0]
+    return value
+
+
+PLAYLISTS_PAGE_SIZE = parse_page_size(os.getenv("PLAYLISTS_PAGE_SIZE"))
+PLAYLIST_TRACKS_PAGE_SIZE = 10
+
+EMPTY_PLAYLISTS_TEXT = (
+    "📁 <b>Плейлисты</b>\n\n"
+    "У вас пока нет плейлистов.\n\n"
+    "💡 Создайте первый плейлист через меню!"
+)
+LOAD_ERROR_TEXT = (
+    "❌ <b>Ошибка загрузки</b>\n"
+    "Попробуйте переавторизоваться или повторить позже"
+)
+
+
+class PlaylistStates(StatesGroup):
+    waiting_for_page = State()
+    waiting_for_prefix = State()
+
+
+def _int_part(parts: list[str], index: int, default: int) -> int:
+    try:
+        return int(parts[index])
+    except (IndexError, ValueError):
+        return default
+
+def _page_size(value: int) -> int:
+    return value if value in PLAYLIST_PAGE_SIZES else PLAYLISTS_PAGE_SIZE
+
 @router.callback_query(F.data == "menu_playlists")
 async def playlists_callback(callback: CallbackQuery):
-    await show_playlists_page(callback, page=0)
+    await show_playlists_page(callback, offset=0, limit=PLAYLISTS_PAGE_SIZE, refresh=True)
 
 @router.callback_query(F.data.startswith("playlists:"))
-async def playlists_page_callback(callback: CallbackQuery):
+async def playlists_page_callback(callback: CallbackQuery, state: FSMContext):
     await callback.answer()
     parts = callback.data.split(":")
-    if len(parts) >= 3:
-        try:
-            page = int(parts[2])
-        except ValueError:
-            page = 0
-        await show_playlists_page(callback, page=page)
-
-async def show_playlists_page(callback: CallbackQuery, page: int = 0):
+    action = parts[1] if len(parts) > 1 else ""
+
+    if action == "o":
+        limit = _page_size(_int_part(parts, 3, PLAYLISTS_PAGE_SIZE))
+        await show_playlists_page(callback, offset=_int_part(parts, 2, 0), limit=limit)
+    elif action == "page":
+        # Кнопки из сообщений, отправленных до перехода на смещения
+        await show_playlists_page(callback, offset=_int_part(parts, 2, 0) * PLAYLISTS_PAGE_SIZE, limit=PLAYLISTS_PAGE_SIZE)
+    elif action in ("jump", "search"):
+        await state.update_data(playlists_limit=_page_size(_int_part(parts, 2, PLAYLISTS_PAGE_SIZE)))
+        if action == "jump":
+            await state.set_state(PlaylistStates.waiting_for_page)
+            await callback.message.answer("🔢 Отправьте номер страницы.", reply_markup=get_back_button())
+        else:
+            await state.set_state(PlaylistStates.waiting_for_prefix)
+            await callback.message.answer("🔎 Отправьте начало названия плейлиста.", reply_markup=get_back_button())
+
+async def build_playlists_page(
+    token: str,
+    user_id: int,
+    offset: int,
+    limit: int,
+    refresh: bool = False,
+    found: int | None = None,
+):
+    page = await ym_service.get_playlists_page(token, user_id, offset, limit, refresh=refresh)
+    if page is None:
+        return EMPTY_PLAYLISTS_TEXT, get_back_button()
+
+    logger.info(
+        f"Показаны плейлисты {page.offset + 1}-{page.offset + len(page.items)} из {page.total} "
+        f"пользователя {user_id}"
+    )
+    items = tuple((playlist.kind, playlist.title) for playlist in page.items)
+    keyboard = get_playlists_keyboard(page.offset, page.limit, page.total, items)
+    return render_playlists_page(page, user_id, found=found), keyboard
+
+async def show_playlists_page(callback: CallbackQuery, offset: int = 0, limit: int = PLAYLISTS_PAGE_SIZE, refresh: bool = False):
     user_id = callback.from_user.id
     token = get_token(user_id)
 
@@ -36,75 +119,99 @@ async def show_playlists_page(callback: CallbackQuery, page: int = 0):
         )
         return
 
-    if page == 0:
+    if refresh:
         await callback.message.edit_text("📁 Загружаю плейлисты...")
 
     try:
-        playlists = await ym_service.get_user_playlists(token, user_id)
-
-        if not playlists:
-            await callback.message.edit_text(
-                "📁 <b>Плейлисты</b>\n\n"
-                "У вас пока нет плейлистов.\n\n"
-                "💡 Создайте первый плейлист через меню!",
-                reply_markup=get_back_button()
-            )
-            return
+        text, keyboard = await build_playlists_page(token, user_id, offset, limit, refresh=refresh)
+        await callback.message.edit_text(text, reply_markup=keyboard)
+    except Exception as e:
+        logger.error(f"Ошибка получения плейлистов: {e}", exc_info=True)
+        await callback.message.edit_text(LOAD_ERROR_TEXT, reply_markup=get_back_button())
 
-        def _modified_key(pl: Dict[str, Any]) -> str:
-            return pl.get("modified") or ""
+@router.callback_query(F.data.startswith("playlist:"))
+async def playlist_tracks_callback(callback: CallbackQuery):
+    await callback.answer()
+    parts = callback.data.split(":")
+    kind = _int_part(parts, 1, -1)
+    if kind < 0:
+        return
+    offset = _int_part(parts, 2, 0)
+    list_offset = _int_part(parts, 3, 0)
+    list_limit = _page_size(_int_part(parts, 4, PLAYLISTS_PAGE_SIZE))
 
-        playlists_sorted = sorted(playlists, key=_modified_key, reverse=True)
+    user_id = callback.from_user.id
+    token = get_token(user_id)
+    if not token:
+        await callback.message.edit_text(
+            "❌ Вы не авторизованы. Используйте /auth",
+            reply_markup=get_back_button()
+        )
+        return
 
-        per_page = 5
-        total_playlists = len(playlists_sorted)
-        total_pages = (total_playlists + per_page - 1) // per_page
+    if offset == 0:
+        await callback.message.edit_text("📁 Загружаю треки плейлиста...")
 
-        if page < 0:
-            page = 0
-        elif page >= total_pages:
-            page = total_pages - 1
+    page = await ym_service.get_playlist_tracks_page(token, user_id, kind, offset, PLAYLIST_TRACKS_PAGE_SIZE)
+    if page is None:
+        await callback.message.edit_text(LOAD_ERROR_TEXT, reply_markup=get_back_button())
+        return
 
-        start_idx = page * per_page
-        end_idx = min(start_idx + per_page, total_playlists)
-        page_playlists = playlists_sorted[start_idx:end_idx]
+    logger.info(f"Показаны треки {page.offset + 1}-{page.offset + len(page.items)} плейлиста {kind} пользователя {user_id}")
+    await callback.message.edit_text(
+        render_playlist_tracks_page(page),
+        reply_markup=get_playlist_tracks_keyboard(kind, page.offset, page.limit, page.total, list_offset, list_limit)
+    )
 
-        text = "📁 <b>Ваши плейлисты</b>\n"
-        text += f"Всего: {total_playlists} • Страница {page + 1}/{total_pages}\n\n"
+@router.message(PlaylistStates.waiting_for_page)
+async def receive_page_number(message: Message, state: FSMContext):
+    try:
+        number = int((message.text or "").strip())
+    except ValueError:
+        await message.answer("❌ Отправьте номер страницы числом.", reply_markup=get_back_button())
+        return
 
-        for i, pl in enumerate(page_playlists, start=start_idx + 1):
-            title = pl.get("title") or "Без названия"
-            track_count = pl.get("track_count", 0)
+    limit = (await state.get_data()).get("playlists_limit", PLAYLISTS_PAGE_SIZE)
+    await state.clear()
+    await answer_playlists_page(message, offset=max(0, number - 1) * limit, limit=limit)
 
-            kind = pl.get("kind")
-            if kind == 3:
-                icon = "❤️"
-            elif title.lower() in ["избранное", "favorites", "liked"]:
-                icon = "⭐"
-            else:
-                icon = "📁"
+@router.message(PlaylistStates.waiting_for_prefix)
+async def receive_playlist_prefix(message: Message, state: FSMContext):
+    prefix = (message.text or "").strip()
+    if not prefix:
+        await message.answer("❌ Пустой запрос. Отправьте начало названия плейлиста.", reply_markup=get_back_button())
+        return
 
-            text += f"{icon} <b>{title}</b>\n"
-            text += (
-                f"   └ {track_count} "
-                f"{'трек' if track_count == 1 else 'треков'}\n"
-            )
+    limit = (await state.get_data()).get("playlists_limit", PLAYLISTS_PAGE_SIZE)
+    token = get_token(message.from_user.id)
+    if not token:
+        await state.clear()
+        await message.answer("❌ Вы не авторизованы. Используйте /auth", reply_markup=get_back_button())
+        return
 
-            owner_login = pl.get("owner_login")
-            if owner_login and str(owner_login) != str(user_id):
-                text += f"   👤 by @{owner_login}\n"
+    positions = await ym_service.search_playlists(token, message.from_user.id, prefix)
+    if not positions:
+        await message.answer(
+            f"🔎 Плейлистов, название которых начинается с «{escape(prefix)}», не найдено.\n"
+            "Отправьте другой запрос.",
+            reply_markup=get_back_button()
+        )
+        return
 
-            text += "\n"
+    await state.clear()
+    await answer_playlists_page(message, offset=positions[0], limit=limit, found=len(positions))
 
-        logger.info(f"Показана страница {page + 1}/{total_pages} плейлистов пользователя {user_id}")
+async def answer_playlists_page(message: Message, offset: int, limit: int, found: int | None = None):
+    user_id = message.from_user.id
+    token = get_token(user_id)
 
-        keyboard = get_playlists_keyboard(page, total_pages)
-        await callback.message.edit_text(text, reply_markup=keyboard)
+    if not token:
+        await message.answer("❌ Вы не авторизованы. Используйте /auth", reply_markup=get_back_button())
+        return
 
+    try:
+        text, keyboard = await build_playlists_page(token, user_id, offset, limit, found=found)
+        await message.answer(text, reply_markup=keyboard)
     except Exception as e:
         logger.error(f"Ошибка получения плейлистов: {e}", exc_info=True)
-        await callback.message.edit_text(
-            "❌ <b>Ошибка загрузки</b>\n"
-            "Попробуйте переавторизоваться или повторить позже",
-            reply_markup=get_back_button()
-        )
\ No newline at end of file
+        await message.answer(LOAD_ERROR_TEXT, reply_markup=get_back_button())
@@ -8,14 +8,27 @@ from aiogram.fsm.context import FSMContext
 from aiogram.fsm.state import State, StatesGroup
 from yandex_music import Client
 
-from ...database.storage import set_token, get_token, has_token, remove_token
+from ...database.storage import set_token, get_token, has_token, remove_token, remove_user_stats
 from ..keyboards.main_menu import get_main_menu_keyboard, get_auth_keyboard
+from ..jobs import JOB_DONE, Job
+from ..services import job_queue, ym_service
 
 router = Router()
 logger = logging.getLogger(__name__)
 
+TRACK_INDEX_JOB = "track_index"
+
 AUTH_URL = "https://oauth.yandex.ru/authorize?response_type=token&client_id=23cabbbdc6cd418abb4b39c32c41195d"
 
+ACCESS_TOKEN_SEPARATORS = ("=", "%3D", "%253D")
+ACCESS_TOKEN_PATTERN = re.compile(r'access_token(=|%3D|%253D)([A-Za-z0-9_-]{30,})')
+ACCESS_TOKEN_PATTERNS = {
+    separator: re.compile(rf'access_token{separator}([A-Za-z0-9_-]{{30,}})')
+    for separator in ACCESS_TOKEN_SEPARATORS
+}
+DIRECT_TOKEN_PATTERN = re.compile(r'\b(y0_[A-Za-z0-9_-]{30,})\b')
+FALLBACK_TOKEN_PATTERN = re.compile(r'(y0_[A-Za-z0-9_-]{30,})|(AQ[A-Za-z0-9_-]{30,})')
+
 class AuthStates(StatesGroup):
     waiting_for_token = State()
 
@@ -88,6 +101,8 @@ async def logout_command(message: Message, state: FSMContext):
         return
     
     remove_token(user_id)
+    remove_user_stats(user_id)
+    ym_service.forget_user(user_id)
     await state.clear()
     
     logger.info(f"Пользователь {user_id} разлогинился")
@@ -135,9 +150,11 @@ async def process_token(message: Message, raw_string: str, state: FSMContext):
     
     try:
         client = Client(token).init()
-        account = client.account_status()
+        account = client.me
         
-        set_token(message.from_user.id, token)
+        set_token(message.from_user.id, token, account.account.uid)
+        ym_service.register_client(message.from_user.id, client)
+        schedule_track_index(message.from_user.id, token)
         await state.clear()
         
         logger.info(f"Токен установлен для пользователя {message.from_user.id}")
@@ -159,34 +176,62 @@ async def process_token(message: Message, raw_string: str, state: FSMContext):
             "через команду /auth и попробуйте снова."
         )
 
+def schedule_track_index(user_id: int, token: str) -> Job | None:
+    """Построить локальный индекс библиотеки в фоне, чтобы поиск треков сначала шёл по нему."""
+    async def on_item(job: Job, size: int) -> None:
+        logger.info(f"Индекс библиотеки пользователя {user_id}: {size} треков")
+
+    async def on_finish(job: Job) -> None:
+        if job.status != JOB_DONE:
+            logger.warning(f"Индекс библиотеки пользователя {user_id} не построен: {job.status}")
+
+    return job_queue.submit(
+        user_id,
+        TRACK_INDEX_JOB,
+        lambda: ym_service.iter_build_track_index(token, user_id),
+        on_item,
+        on_finish,
+    )
+
+def _find_access_token(text: str, separators: tuple[str, ...]) -> str | None:
+    """Первое вхождение с самым приоритетным разделителем из separators.
+
+    Общий шаблон находит самое левое вхождение с любым разделителем. Раньше
+    него других вхождений нет, поэтому более приоритетные разделители
+    достаточно искать только правее.
+    """
+    match = ACCESS_TOKEN_PATTERN.search(text)
+    while match and match.group(1) not in separators:
+        match = ACCESS_TOKEN_PATTERN.search(text, match.start() + 1)
+    if not match:
+        return None
+    
+    for separator in separators[:separators.index(match.group(1))]:
+        better = ACCESS_TOKEN_PATTERNS[separator].search(text, match.start())
+        if better:
+            return better.group(1)
+    return match.group(2)
+
 def extract_token(raw_string: str) -> str | None:
     clean_string = ''.join(raw_string.split())
     
-    patterns = [
-        r'access_token=([A-Za-z0-9_-]{30,})',
-        r'access_token%3D([A-Za-z0-9_-]{30,})',
-        r'access_token%253D([A-Za-z0-9_-]{30,})',
-    ]
+    if "access_token" in clean_string:
+        token = _find_access_token(clean_string, ACCESS_TOKEN_SEPARATORS)
+        if token:
+            return token
     
-    for pattern in patterns:
-        match = re.search(pattern, clean_string)
-        if match:
-            return match.group(1)
-    
-    try:
+    if "%" in clean_string:
         decoded = unquote(clean_string)
-        for pattern in patterns[:2]:
-            match = re.search(pattern, decoded)
-            if match:
-                return match.group(1)
-    except:
-        pass
-    
-    direct_match = re.search(r'\b(y0_[A-Za-z0-9_-]{30,})\b', clean_string)
+        if "access_token" in decoded:
+            token = _find_access_token(decoded, ACCESS_TOKEN_SEPARATORS[:2])
+            if token:
+                return token
+    
+    direct_match = DIRECT_TOKEN_PATTERN.search(clean_string)
     if direct_match:
         return direct_match.group(1)
     
-    fallback = re.search(r'(y0_[A-Za-z0-9_-]{30,})|(AQ[A-Za-z0-9_-]{30,})', clean_string)
+    fallback = FALLBACK_TOKEN_PATTERN.search(clean_string)
     if fallback:
         return fallback.group(1) or fallback.group(2)
     
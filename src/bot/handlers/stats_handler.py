@@ -1,10 +1,14 @@
 import logging
+import time
 from aiogram import Router, F
 from aiogram.types import CallbackQuery
 
-from ...database.storage import get_token
-from ..services import ym_service
-from ..keyboards.main_menu import get_back_button
+from ...database.storage import get_token, get_user_stats
+from ..services import stats_scheduler
+from ..jobs import JOB_CANCELLED, JOB_FAILED
+from ..keyboards.main_menu import get_back_button, get_job_keyboard
+from ..progress import ThrottledEditor
+from ..rendering import render_stats
 
 router = Router()
 logger = logging.getLogger(__name__)
@@ -23,52 +27,77 @@ async def stats_callback(callback: CallbackQuery):
         )
         return
 
-    status_msg = await callback.message.edit_text("📊 Собираю статистику...")
+    stats_scheduler.mark_active(user_id)
+    stored = get_user_stats(user_id)
+    if stored is not None and stats_scheduler.is_fresh(stored[1]):
+        stats, updated_at = stored
+        await callback.message.edit_text(
+            render_stats(stats, updated_at=updated_at),
+            reply_markup=get_back_button()
+        )
+        return
+
+    editor = ThrottledEditor(callback.message)
+    # Пока идёт сбор, показываем старый снимок, обновляя его по мере готовности
+    # разделов; итог - только разделы, полученные заново.
+    stats = dict(stored[0]) if stored is not None else {}
+    collected = {}
 
-    try:
-        stats = await ym_service.get_user_statistics(token, user_id)
+    async def on_item(job, item):
+        key, value = item
+        stats[key] = collected[key] = value
+        await editor.update(render_stats(stats, in_progress=True), reply_markup=get_job_keyboard(job.id))
 
-        if not stats:
-            await status_msg.edit_text(
+    async def on_finish(job):
+        if job.status == JOB_CANCELLED:
+            await editor.update(
+                "⛔ Сбор статистики отменён.",
+                reply_markup=get_back_button(),
+                force=True
+            )
+        elif job.status == JOB_FAILED:
+            logger.error(f"Ошибка получения статистики: {job.error}")
+            await editor.update(
+                "❌ <b>Не удалось получить статистику</b>\n\n"
+                "Произошла ошибка при обработке запроса.\n"
+                "Попробуйте повторить попытку позже или обратитесь в поддержку.",
+                reply_markup=get_back_button(),
+                force=True
+            )
+        elif not collected:
+            await editor.update(
                 "📊 <b>Статистика недоступна</b>\n\n"
                 "Возможно, у вас мало активности или проблемы с доступом.",
-                reply_markup=get_back_button()
+                reply_markup=get_back_button(),
+                force=True
+            )
+        else:
+            await editor.update(
+                render_stats(collected, updated_at=time.time()),
+                reply_markup=get_back_button(),
+                force=True
             )
-            return
-
-        text = "📊 <b>Ваша статистика</b>\n\n"
-
-        text += f"❤️ Лайкнутых треков: <b>{stats.get('liked_tracks_count', 0):,}</b>\n"
-        text += f"📅 Лайков за месяц: <b>{stats.get('recent_likes_last_month', 0)}</b>\n\n"
-
-        top_artists = stats.get('top_artists', [])
-        if top_artists:
-            text += "🎤 <b>Топ артистов:</b>\n"
-            for i, artist in enumerate(top_artists[:5], 1):
-                text += f"  {i}. {artist.get('name', '?')} — {artist.get('count', 0)} треков\n"
-            text += "\n"
-
-        top_genres_recent = stats.get('top_genres_recent', [])
-        if top_genres_recent:
-            text += "🎵 <b>Топ жанров (90 дней):</b>\n"
-            for i, genre in enumerate(top_genres_recent[:5], 1):
-                text += f"  {i}. {genre.get('name', '?')} — {genre.get('count', 0)} раз\n"
-            text += "\n"
 
-        top_genres_lib = stats.get('top_genres_library', [])
-        if top_genres_lib:
-            text += "📚 <b>Топ жанров (библиотека):</b>\n"
-            for i, genre in enumerate(top_genres_lib[:5], 1):
-                text += f"  {i}. {genre.get('name', '?')} — {genre.get('count', 0)} треков\n"
+    job = stats_scheduler.submit_refresh(user_id, token, on_item, on_finish)
+    if job is None:
+        if stored is not None:
+            await callback.message.edit_text(
+                render_stats(stored[0], updated_at=stored[1]),
+                reply_markup=get_back_button()
+            )
+        else:
+            await callback.message.edit_text(
+                "⏳ Статистика уже собирается или очередь переполнена.\n"
+                "Попробуйте чуть позже.",
+                reply_markup=get_back_button()
+            )
+        return
 
-        await status_msg.edit_text(text, reply_markup=get_back_button(), parse_mode="HTML")
+    # Быстрая задача могла уже завершиться: итог не перетираем статусом «в процессе»
+    if job.active:
+        await editor.update(
+            render_stats(stats, in_progress=True) if stats else "📊 Собираю статистику...",
+            reply_markup=get_job_keyboard(job.id),
+            force=True
+        )
 
-    except Exception as e:
-        logger.error(f"Ошибка получения статистики: {e}", exc_info=True)
-        await status_msg.edit_text(
-            "❌ <b>Не удалось получить статистику</b>\n\n"
-            "Произошла ошибка при обработке запроса.\n"
-            "Попробуйте повторить попытку позже или обратитесь в поддержку.",
-            reply_markup=get_back_button(),
-            parse_mode="HTML"
-        )
\ No newline at end of file
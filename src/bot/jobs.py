@@ -0,0 +1,164 @@
+import asyncio
+import itertools
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_DONE = "done"
+JOB_CANCELLED = "cancelled"
+JOB_FAILED = "failed"
+
+_END = object()
+
+
+@dataclass(eq=False)
+class Job:
+    id: int
+    user_id: int
+    name: str
+    source: Callable[[], AsyncIterator[Any]]
+    on_item: Callable[["Job", Any], Awaitable[None]]
+    on_finish: Callable[["Job"], Awaitable[None]]
+    status: str = JOB_QUEUED
+    error: Optional[BaseException] = None
+    cancel_event: threading.Event = field(default_factory=threading.Event)
+
+    @property
+    def active(self) -> bool:
+        return self.status in (JOB_QUEUED, JOB_RUNNING)
+
+
+class JobQueue:
+    """Очередь тяжёлых пользовательских задач.
+
+    Источник задачи (асинхронный генератор сервиса) выполняется в отдельном
+    потоке со своим event loop, поэтому блокирующие вызовы API не задерживают
+    обработку апдейтов. Элементы и итог доставляются обратно в основной loop
+    через on_item/on_finish. Число одновременно выполняемых задач ограничено
+    количеством воркеров.
+    Общее состояние сервиса, которое задачи меняют из своих потоков, защищено
+    замком сервиса (YandexMusicService.state_lock) и собственным замком
+    TrackCache.
+    """
+
+    def __init__(self, workers: int = 4, max_queued: int = 100):
+        self.workers = workers
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=max_queued)
+        self._jobs: Dict[int, Job] = {}
+        self._ids = itertools.count(1)
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._worker_tasks: List[asyncio.Task] = []
+
+    async def start(self) -> None:
+        if self._worker_tasks:
+            return
+        self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="job")
+        self._worker_tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+        logger.info(f"Очередь задач запущена, воркеров: {self.workers}")
+
+    async def stop(self) -> None:
+        for job in list(self._jobs.values()):
+            job.cancel_event.set()
+        for task in self._worker_tasks:
+            task.cancel()
+        await asyncio.gather(*self._worker_tasks, return_exceptions=True)
+        self._worker_tasks = []
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def submit(
+        self,
+        user_id: int,
+        name: str,
+        source: Callable[[], AsyncIterator[Any]],
+        on_item: Callable[[Job, Any], Awaitable[None]],
+        on_finish: Callable[[Job], Awaitable[None]],
+    ) -> Optional[Job]:
+        for job in self._jobs.values():
+            if job.user_id == user_id and job.name == name and job.active:
+                return None
+        if self._queue.full():
+            logger.warning(f"Очередь задач переполнена, задача '{name}' пользователя {user_id} отклонена")
+            return None
+
+        job = Job(next(self._ids), user_id, name, source, on_item, on_finish)
+        self._jobs[job.id] = job
+        self._queue.put_nowait(job)
+        logger.info(f"Задача #{job.id} '{name}' пользователя {user_id} поставлена в очередь")
+        return job
+
+    def get(self, job_id: int) -> Optional[Job]:
+        return self._jobs.get(job_id)
+
+    def cancel(self, job_id: int, user_id: int) -> bool:
+        job = self._jobs.get(job_id)
+        if job is None or job.user_id != user_id or not job.active:
+            return False
+        job.cancel_event.set()
+        logger.info(f"Задача #{job_id} пользователя {user_id} отменена")
+        return True
+
+    async def _worker(self) -> None:
+        while True:
+            job = await self._queue.get()
+            try:
+                if job.cancel_event.is_set():
+                    job.status = JOB_CANCELLED
+                else:
+                    job.status = JOB_RUNNING
+                    await self._run(job)
+                await self._finish(job)
+            finally:
+                self._jobs.pop(job.id, None)
+                self._queue.task_done()
+
+    async def _run(self, job: Job) -> None:
+        loop = asyncio.get_running_loop()
+        items: asyncio.Queue = asyncio.Queue()
+
+        def produce() -> None:
+            async def drain() -> None:
+                async for item in job.source():
+                    if job.cancel_event.is_set():
+                        break
+                    loop.call_soon_threadsafe(items.put_nowait, item)
+
+            asyncio.run(drain())
+
+        future = loop.run_in_executor(self._executor, produce)
+        future.add_done_callback(lambda _: items.put_nowait(_END))
+
+        while True:
+            item = await items.get()
+            if item is _END:
+                break
+            if job.cancel_event.is_set():
+                continue
+            try:
+                await job.on_item(job, item)
+            except Exception as e:
+                logger.error(f"Задача #{job.id}: ошибка доставки результата: {e}")
+
+        if future.cancelled():
+            job.status = JOB_CANCELLED
+        elif future.exception() is not None:
+            job.error = future.exception()
+            job.status = JOB_FAILED
+            logger.error(f"Задача #{job.id} '{job.name}' завершилась с ошибкой: {job.error}")
+        elif job.cancel_event.is_set():
+            job.status = JOB_CANCELLED
+        else:
+            job.status = JOB_DONE
+
+    async def _finish(self, job: Job) -> None:
+        try:
+            await job.on_finish(job)
+        except Exception as e:
+            logger.error(f"Задача #{job.id}: ошибка доставки итога: {e}")
@@ -2,12 +2,18 @@ from .main_menu import (
     get_main_menu_keyboard, 
     get_back_button, 
     get_auth_keyboard,   
-    get_playlists_keyboard  
+    get_playlists_keyboard,
+    get_playlist_tracks_keyboard,
+    get_lyrics_keyboard,
+    get_job_keyboard
 )
 
 __all__ = [
     'get_main_menu_keyboard', 
     'get_back_button', 
     'get_auth_keyboard',      
-    'get_playlists_keyboard'  
+    'get_playlists_keyboard',
+    'get_playlist_tracks_keyboard',
+    'get_lyrics_keyboard',
+    'get_job_keyboard'
 ]
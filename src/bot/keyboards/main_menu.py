@@ -1,39 +1,43 @@
+from functools import lru_cache
+
 from aiogram.types import InlineKeyboardMarkup, InlineKeyboardButton
 
+# Клавиатуры ниже создаются один раз и переиспользуются во всех сообщениях,
+# поэтому изменять их на месте нельзя.
+BACK_TO_MENU_BUTTON = InlineKeyboardButton(text="🔙 Назад в меню", callback_data="back_to_menu")
+NOOP_BUTTON = InlineKeyboardButton(text="·", callback_data="noop")
+
+MAIN_MENU_KEYBOARD = InlineKeyboardMarkup(inline_keyboard=[
+    [
+        InlineKeyboardButton(text="📁 Плейлисты", callback_data="menu_playlists"),
+        InlineKeyboardButton(text="🎵 Текст песни", callback_data="menu_lyrics")
+    ],
+    [
+        InlineKeyboardButton(text="➕ Создать плейлист", callback_data="menu_create_playlist"),
+        InlineKeyboardButton(text="🎼 Добавить треки", callback_data="menu_add_tracks")
+    ],
+    [
+        InlineKeyboardButton(text="❤️ Лайкнуть трек", callback_data="menu_like_track"),
+        InlineKeyboardButton(text="📊 Статистика", callback_data="menu_stats")
+    ],
+    [
+        InlineKeyboardButton(text="❓ Помощь", callback_data="menu_help")
+    ]
+])
+
+BACK_KEYBOARD = InlineKeyboardMarkup(inline_keyboard=[[BACK_TO_MENU_BUTTON]])
+
+PAGINATION_CACHE_SIZE = 256
+PLAYLIST_PAGE_SIZES = (5, 10, 20)
+PLAYLIST_BUTTON_TITLE_LIMIT = 40
+
 def get_main_menu_keyboard():
-    keyboard = InlineKeyboardMarkup(inline_keyboard=[
-        [
-            InlineKeyboardButton(text="📁 Плейлисты", callback_data="menu_playlists"),
-            InlineKeyboardButton(text="🎵 Текст песни", callback_data="menu_lyrics")
-        ],
-        [
-            InlineKeyboardButton(text="➕ Создать плейлист", callback_data="menu_create_playlist"),
-            InlineKeyboardButton(text="🎼 Добавить треки", callback_data="menu_add_tracks")
-        ],
-        [
-            InlineKeyboardButton(text="❤️ Лайкнуть трек", callback_data="menu_like_track"),
-            InlineKeyboardButton(text="📊 Статистика", callback_data="menu_stats")
-        ],
-        [
-            InlineKeyboardButton(text="❓ Помощь", callback_data="menu_help")
-        ]
-    ])
-    return keyboard
+    return MAIN_MENU_KEYBOARD
 
 def get_back_button():
-    keyboard = InlineKeyboardMarkup(inline_keyboard=[
-        [InlineKeyboardButton(text="🔙 Назад в меню", callback_data="back_to_menu")]
-    ])
-    return keyboard
+    return BACK_KEYBOARD
 
-def get_auth_keyboard(auth_url: str):
-    keyboard = InlineKeyboardMarkup(inline_keyboard=[
-        [InlineKeyboardButton(text="🔑 Получить токен", url=auth_url)],
-        [InlineKeyboardButton(text="❓ Как получить токен?", callback_data="auth_help")]
-    ])
-    return keyboard
-
-def get_playlists_keyboard(current_page: int, total_pages: int):
+def _pagination_keyboard(callback_prefix: str, current_page: int, total_pages: int, extra_rows: tuple = ()):
     buttons = []
     if total_pages > 1:
         nav_row = []
@@ -41,16 +45,11 @@ def get_playlists_keyboard(current_page: int, total_pages: int):
             nav_row.append(
                 InlineKeyboardButton(
                     text="◀️ Назад",
-                    callback_data=f"playlists:page:{current_page - 1}"
+                    callback_data=f"{callback_prefix}{current_page - 1}"
                 )
             )
         else:
-            nav_row.append(
-                InlineKeyboardButton(
-                    text="·",
-                    callback_data="noop"
-                )
-            )
+            nav_row.append(NOOP_BUTTON)
         nav_row.append(
             InlineKeyboardButton(
                 text=f"· {current_page + 1}/{total_pages} ·",
@@ -61,19 +60,98 @@ def get_playlists_keyboard(current_page: int, total_pages: int):
             nav_row.append(
                 InlineKeyboardButton(
                     text="Вперед ▶️",
-                    callback_data=f"playlists:page:{current_page + 1}"
+                    callback_data=f"{callback_prefix}{current_page + 1}"
                 )
             )
         else:
-            nav_row.append(
-                InlineKeyboardButton(
-                    text="·",
-                    callback_data="noop"
-                )
-            )
+            nav_row.append(NOOP_BUTTON)
         buttons.append(nav_row)
+    buttons.extend(list(row) for row in extra_rows)
+    buttons.append([BACK_TO_MENU_BUTTON])
+    return InlineKeyboardMarkup(inline_keyboard=buttons)
+
+def get_job_keyboard(job_id: int):
+    keyboard = InlineKeyboardMarkup(inline_keyboard=[
+        [InlineKeyboardButton(text="⛔ Отменить", callback_data=f"job:cancel:{job_id}")],
+        [BACK_TO_MENU_BUTTON]
+    ])
+    return keyboard
+
+@lru_cache(maxsize=8)
+def get_auth_keyboard(auth_url: str):
+    keyboard = InlineKeyboardMarkup(inline_keyboard=[
+        [InlineKeyboardButton(text="🔑 Получить токен", url=auth_url)],
+        [InlineKeyboardButton(text="❓ Как получить токен?", callback_data="auth_help")]
+    ])
+    return keyboard
+
+def _playlists_nav_button(text: str, offset, limit: int):
+    if offset is None:
+        return NOOP_BUTTON
+    return InlineKeyboardButton(text=text, callback_data=f"playlists:o:{offset}:{limit}")
+
+def _button_label(text: str, limit: int = PLAYLIST_BUTTON_TITLE_LIMIT) -> str:
+    return text if len(text) <= limit else text[:limit - 1].rstrip() + "…"
+
+@lru_cache(maxsize=PAGINATION_CACHE_SIZE)
+def get_playlists_keyboard(offset: int, limit: int, total: int, items: tuple = ()):
+    """items - пары (kind, название) плейлистов страницы, по кнопке на каждый."""
+    buttons = [
+        [InlineKeyboardButton(
+            text=_button_label(f"{number}. {title or 'Без названия'}"),
+            callback_data=f"playlist:{kind}:0:{offset}:{limit}"
+        )]
+        for number, (kind, title) in enumerate(items, start=offset + 1)
+    ]
+    total_pages = max(1, -(-total // limit))
+    if total > limit:
+        last_offset = (total_pages - 1) * limit
+        buttons.append([
+            _playlists_nav_button("⏮", 0 if offset > 0 else None, limit),
+            _playlists_nav_button("◀️", max(0, offset - limit) if offset > 0 else None, limit),
+            InlineKeyboardButton(text=f"· {offset // limit + 1}/{total_pages} ·", callback_data="noop"),
+            _playlists_nav_button("▶️", offset + limit if offset + limit < total else None, limit),
+            _playlists_nav_button("⏭", last_offset if offset < last_offset else None, limit),
+        ])
+        buttons.append([
+            InlineKeyboardButton(text="🔢 К странице", callback_data=f"playlists:jump:{limit}"),
+            InlineKeyboardButton(text="🔎 Поиск", callback_data=f"playlists:search:{limit}"),
+        ])
+    if total > PLAYLIST_PAGE_SIZES[0]:
+        buttons.append([
+            InlineKeyboardButton(text=f"· {size} ·", callback_data="noop") if size == limit
+            else _playlists_nav_button(f"По {size}", offset // size * size, size)
+            for size in PLAYLIST_PAGE_SIZES
+        ])
+    buttons.append([BACK_TO_MENU_BUTTON])
+    return InlineKeyboardMarkup(inline_keyboard=buttons)
+
+@lru_cache(maxsize=PAGINATION_CACHE_SIZE)
+def get_playlist_tracks_keyboard(kind: int, offset: int, limit: int, total: int, list_offset: int, list_limit: int):
+    buttons = []
+    if total > limit:
+        total_pages = -(-total // limit)
+        page_callback = f"playlist:{kind}:{{offset}}:{list_offset}:{list_limit}".format
+        buttons.append([
+            InlineKeyboardButton(text="◀️ Назад", callback_data=page_callback(offset=max(0, offset - limit)))
+            if offset > 0 else NOOP_BUTTON,
+            InlineKeyboardButton(text=f"· {offset // limit + 1}/{total_pages} ·", callback_data="noop"),
+            InlineKeyboardButton(text="Вперед ▶️", callback_data=page_callback(offset=offset + limit))
+            if offset + limit < total else NOOP_BUTTON,
+        ])
     buttons.append([
-        InlineKeyboardButton(text="🔙 Назад в меню", callback_data="back_to_menu")
+        InlineKeyboardButton(text="📁 К плейлистам", callback_data=f"playlists:o:{list_offset}:{list_limit}")
     ])
-    keyboard = InlineKeyboardMarkup(inline_keyboard=buttons)
-    return keyboard
\ No newline at end of file
+    buttons.append([BACK_TO_MENU_BUTTON])
+    return InlineKeyboardMarkup(inline_keyboard=buttons)
+
+@lru_cache(maxsize=PAGINATION_CACHE_SIZE)
+def get_lyrics_keyboard(track_id: str, current_page: int, total_pages: int, synced: bool = False):
+    """Страницы текста; synced - текст с таймкодами, кнопка переключает режим."""
+    if synced:
+        prefix = f"lyrics_sync:{track_id}:"
+        toggle = InlineKeyboardButton(text="📝 Без таймкодов", callback_data=f"lyrics:{track_id}:0")
+    else:
+        prefix = f"lyrics:{track_id}:"
+        toggle = InlineKeyboardButton(text="⏱ С таймкодами", callback_data=f"lyrics_sync:{track_id}:0")
+    return _pagination_keyboard(prefix, current_page, total_pages, ((toggle,),))
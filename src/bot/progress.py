@@ -0,0 +1,62 @@
+import asyncio
+import logging
+import time
+from typing import Any, Optional
+
+from aiogram.exceptions import TelegramBadRequest
+from aiogram.types import Message
+
+logger = logging.getLogger(__name__)
+
+
+class ThrottledEditor:
+    """Редактирует статусное сообщение не чаще раза в interval секунд.
+
+    Промежуточные состояния, пришедшие между правками, не отправляются —
+    при flush() отправляется только последнее. Если обновление пришло внутри
+    интервала, оно отправится само по его истечении, даже если следующих
+    обновлений не будет.
+    """
+
+    def __init__(self, message: Message, interval: float = 1.5):
+        self.message = message
+        self.interval = interval
+        self._last_edit = 0.0
+        self._last_text: Optional[str] = None
+        self._pending: Optional[tuple] = None
+        self._flush_task: Optional[asyncio.Task] = None
+        self._lock = asyncio.Lock()
+
+    async def update(self, text: str, reply_markup: Any = None, force: bool = False) -> None:
+        self._pending = (text, reply_markup)
+        delay = self.interval - (time.monotonic() - self._last_edit)
+        if force or delay <= 0:
+            await self.flush()
+        elif self._flush_task is None:
+            self._flush_task = asyncio.create_task(self._flush_later(delay))
+
+    async def _flush_later(self, delay: float) -> None:
+        await asyncio.sleep(delay)
+        self._flush_task = None
+        try:
+            await self.flush()
+        except Exception as e:
+            logger.warning(f"Не удалось отправить отложенное обновление статуса: {e}")
+
+    async def flush(self) -> None:
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+            self._flush_task = None
+        async with self._lock:
+            if self._pending is None:
+                return
+            text, reply_markup = self._pending
+            self._pending = None
+            if text == self._last_text:
+                return
+            try:
+                await self.message.edit_text(text, reply_markup=reply_markup)
+                self._last_text = text
+            except TelegramBadRequest as e:
+                logger.warning(f"Не удалось обновить статусное сообщение: {e}")
+            self._last_edit = time.monotonic()
@@ -0,0 +1,152 @@
+"""Сборка HTML-сообщений бота.
+
+Неизменные части сообщений вынесены в константы модуля, строки с данными
+собираются f-строками (они компилируются в байткод вместе с модулем), а
+сообщение целиком - одним join по списку фрагментов. Всё, что пришло от
+пользователя или из API (названия плейлистов и треков, имена артистов
+и жанров), экранируется через escape.
+"""
+import time
+from datetime import date
+from typing import Iterable, List, Optional, Sequence
+
+from ..services.records import AddResult, PlaylistInfo, PlaylistPage, TrackPage
+from .text_utils import escape
+
+TOP_LIMIT = 5
+ADD_RESULT_LIMIT = 10
+FAVORITE_TITLES = frozenset({"избранное", "favorites", "liked"})
+
+STATS_HEADER = "📊 <b>Ваша статистика</b>\n\n"
+STATS_IN_PROGRESS = "\n⏳ <i>Собираю остальное...</i>"
+STATS_UPDATED_NOW = "\n🕒 <i>Обновлено только что</i>"
+PLAYLISTS_HEADER = "📁 <b>Ваши плейлисты</b>\n"
+ADD_CANCELLED_HEADER = "⛔ <b>Добавление остановлено</b>\n\n"
+ADD_DONE_HEADER = "✅ <b>Готово!</b>\n\n"
+
+
+def _day_label(iso_date: str) -> str:
+    """'2024-05-01' -> '01.05' без разбора даты целиком."""
+    if len(iso_date) == 10 and iso_date[4] == "-" and iso_date[7] == "-":
+        return f"{iso_date[8:]}.{iso_date[5:7]}"
+    return date.fromisoformat(iso_date).strftime("%d.%m")
+
+
+def _top_section(parts: List[str], header: str, items: Sequence[dict], unit: str) -> None:
+    parts.append(header)
+    parts.extend(
+        f"  {index}. {escape(item.get('name', '?'))} — {item.get('count', 0)} {unit}\n"
+        for index, item in enumerate(items[:TOP_LIMIT], 1)
+    )
+
+
+def _bullet_section(parts: List[str], header: str, lines: Iterable[str], total: int) -> None:
+    parts.append(header)
+    parts.extend(f"• {escape(line)}\n" for line in lines)
+    if total > ADD_RESULT_LIMIT:
+        parts.append(f"... и ещё {total - ADD_RESULT_LIMIT}\n")
+
+
+def render_stats(stats: dict, in_progress: bool = False, updated_at: Optional[float] = None) -> str:
+    parts = [
+        STATS_HEADER,
+        f"❤️ Лайкнутых треков: <b>{stats.get('liked_tracks_count', 0):,}</b>\n",
+        f"📅 Лайков за месяц: <b>{stats.get('recent_likes_last_month', 0)}</b>\n\n",
+    ]
+
+    top_artists = stats.get("top_artists", [])
+    if top_artists:
+        _top_section(parts, "🎤 <b>Топ артистов:</b>\n", top_artists, "треков")
+        parts.append("\n")
+
+    top_genres_recent = stats.get("top_genres_recent", [])
+    if top_genres_recent:
+        _top_section(parts, "🎵 <b>Топ жанров (90 дней):</b>\n", top_genres_recent, "раз")
+        parts.append("\n")
+
+    listening = stats.get("listening_minutes") or {}
+    if listening:
+        parts.append(f"🎧 <b>Прослушано за {listening.get('days', 7)} дн.:</b> {listening.get('total', 0)} мин\n")
+        parts.extend(
+            f"  {_day_label(day['date'])} — {day.get('minutes', 0)} мин\n"
+            for day in listening.get("per_day", [])
+        )
+        parts.append("\n")
+
+    top_genres_lib = stats.get("top_genres_library", [])
+    if top_genres_lib:
+        _top_section(parts, "📚 <b>Топ жанров (библиотека):</b>\n", top_genres_lib, "треков")
+
+    if in_progress:
+        parts.append(STATS_IN_PROGRESS)
+    elif updated_at is not None:
+        minutes = int((time.time() - updated_at) // 60)
+        parts.append(f"\n🕒 <i>Обновлено {minutes} мин. назад</i>" if minutes else STATS_UPDATED_NOW)
+
+    return "".join(parts)
+
+
+def _playlist_icon(playlist: PlaylistInfo, title: str) -> str:
+    if playlist.kind == 3:
+        return "❤️"
+    if title.lower() in FAVORITE_TITLES:
+        return "⭐"
+    return "📁"
+
+
+def render_playlists_page(page: PlaylistPage, user_id: int, found: Optional[int] = None) -> str:
+    parts = [PLAYLISTS_HEADER, f"Всего: {page.total} • Страница {page.page + 1}/{page.total_pages}\n\n"]
+    if found is not None:
+        parts.append(f"🔎 Найдено по запросу: {found}\n\n")
+    viewer = str(user_id)
+    for playlist in page.items:
+        title = playlist.title or "Без названия"
+        track_count = playlist.track_count or 0
+        noun = "трек" if track_count == 1 else "треков"
+        parts.append(f"{_playlist_icon(playlist, title)} <b>{escape(title)}</b>\n   └ {track_count} {noun}\n")
+        owner_login = playlist.owner_login
+        if owner_login and str(owner_login) != viewer:
+            parts.append(f"   👤 by @{escape(owner_login)}\n")
+        parts.append("\n")
+    return "".join(parts)
+
+
+def render_playlist_tracks_page(page: TrackPage) -> str:
+    parts = [f"📁 <b>{escape(page.title or 'Без названия')}</b>\n"]
+    if not page.total:
+        parts.append("\nВ плейлисте пока нет треков.")
+        return "".join(parts)
+    parts.append(f"Треков: {page.total} • Страница {page.page + 1}/{page.total_pages}\n\n")
+    parts.extend(
+        f"{number}. {escape(track.title)}\n"
+        for number, track in enumerate(page.items, start=page.offset + 1)
+    )
+    return "".join(parts)
+
+
+def render_add_tracks_result(
+    playlist_title: str,
+    added: Sequence[AddResult],
+    failed: Sequence[AddResult],
+    total: Optional[int] = None,
+    cancelled: bool = False,
+) -> str:
+    if cancelled:
+        header = ADD_CANCELLED_HEADER
+    elif total is not None:
+        header = f"🎼 <b>Добавляю треки...</b> {len(added) + len(failed)}/{total}\n\n"
+    else:
+        header = ADD_DONE_HEADER
+    parts = [
+        header,
+        f"📁 Плейлист: <b>{escape(playlist_title)}</b>\n"
+        f"➕ Добавлено: {len(added)}\n"
+        f"❌ Не добавлено: {len(failed)}\n",
+    ]
+
+    if added:
+        _bullet_section(parts, "\n<b>Добавленные треки:</b>\n", (item.title for item in added[:ADD_RESULT_LIMIT]), len(added))
+    if failed:
+        _bullet_section(parts, "\n<b>Не удалось добавить:</b>\n", (item.query for item in failed[:ADD_RESULT_LIMIT]), len(failed))
+
+    return "".join(parts)
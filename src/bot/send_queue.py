@@ -0,0 +1,164 @@
+import asyncio
+import logging
+import time
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+from aiogram import Bot
+from aiogram.client.session.middlewares.base import BaseRequestMiddleware, NextRequestMiddlewareType
+from aiogram.exceptions import TelegramRetryAfter
+from aiogram.methods import EditMessageText, Response, TelegramMethod
+from aiogram.methods.base import TelegramType
+
+logger = logging.getLogger(__name__)
+
+
+class TokenBucket:
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    @property
+    def idle(self) -> bool:
+        elapsed = time.monotonic() - self._updated
+        return not self._lock.locked() and self._tokens + elapsed * self.rate >= self.capacity
+
+    async def acquire(self, skip: Optional[Callable[[], bool]] = None) -> bool:
+        """Дождаться токена; если skip() стал истинным раньше, выйти, не расходуя токен."""
+        async with self._lock:
+            while True:
+                if skip is not None and skip():
+                    return False
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return True
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+class SendScheduler(BaseRequestMiddleware):
+    """Планировщик исходящих запросов к Telegram.
+
+    Ограничивает частоту сообщений глобально и по каждому чату, повторяет запросы
+    после RetryAfter и схлопывает устаревшие правки одного и того же сообщения:
+    если правка ещё ждёт очереди, а для сообщения пришла более новая,
+    отправляется только новая. Устаревшая правка не расходует лимит чата и
+    возвращает результат новой, а если новая не удалась - просто True: ошибку
+    получит только вызвавший новую правку.
+    """
+
+    def __init__(
+        self,
+        global_rate: float = 30,
+        chat_rate: float = 1,
+        chat_burst: float = 3,
+        group_rate: float = 20 / 60,
+        max_retries: int = 3,
+        max_idle_buckets: int = 10000,
+    ):
+        self.global_bucket = TokenBucket(global_rate, global_rate)
+        self.chat_rate = chat_rate
+        self.chat_burst = chat_burst
+        self.group_rate = group_rate
+        self.max_retries = max_retries
+        self.max_idle_buckets = max_idle_buckets
+        self._chat_buckets: Dict[Hashable, TokenBucket] = {}
+        self._pending_edits: Dict[Tuple[Any, Any], Tuple[int, asyncio.Future]] = {}
+        self._edit_counter = 0
+
+    def _chat_bucket(self, chat_id: Any) -> TokenBucket:
+        bucket = self._chat_buckets.get(chat_id)
+        if bucket is None:
+            if len(self._chat_buckets) >= self.max_idle_buckets:
+                self._chat_buckets = {k: b for k, b in self._chat_buckets.items() if not b.idle}
+            is_group = isinstance(chat_id, str) or (isinstance(chat_id, int) and chat_id < 0)
+            bucket = self._chat_buckets[chat_id] = (
+                TokenBucket(self.group_rate, 1) if is_group else TokenBucket(self.chat_rate, self.chat_burst)
+            )
+        return bucket
+
+    def _superseded(self, edit_key: Tuple[Any, Any], generation: int) -> bool:
+        newest = self._pending_edits.get(edit_key)
+        return newest is not None and newest[0] != generation
+
+    async def _newest_edit_result(self, edit_key: Tuple[Any, Any]) -> Any:
+        newest = self._pending_edits.get(edit_key)
+        if newest is None:
+            return True
+        newest_future = newest[1]
+        try:
+            return await asyncio.shield(newest_future)
+        except asyncio.CancelledError:
+            if newest_future.cancelled():
+                return True
+            raise
+        except Exception:
+            return True
+
+    async def __call__(
+        self,
+        make_request: NextRequestMiddlewareType[TelegramType],
+        bot: Bot,
+        method: TelegramMethod[TelegramType],
+    ) -> Response[TelegramType]:
+        chat_id = getattr(method, "chat_id", None)
+        if chat_id is None:
+            return await make_request(bot, method)
+
+        edit_key = None
+        skip = None
+        if isinstance(method, EditMessageText) and method.message_id is not None:
+            edit_key = (chat_id, method.message_id)
+            self._edit_counter += 1
+            generation = self._edit_counter
+            future = asyncio.get_running_loop().create_future()
+            future.add_done_callback(lambda f: f.cancelled() or f.exception())
+            self._pending_edits[edit_key] = (generation, future)
+            skip = lambda: self._superseded(edit_key, generation)
+
+        try:
+            if await self._chat_bucket(chat_id).acquire(skip):
+                response = await self._send(make_request, bot, method)
+            else:
+                logger.debug(f"Правка сообщения {edit_key} заменена более новой")
+                response = await self._newest_edit_result(edit_key)
+        except BaseException as e:
+            if edit_key is not None and not future.done():
+                if isinstance(e, asyncio.CancelledError):
+                    future.cancel()
+                else:
+                    future.set_exception(e)
+            raise
+        finally:
+            if edit_key is not None and self._pending_edits.get(edit_key, (None,))[0] == generation:
+                del self._pending_edits[edit_key]
+
+        if edit_key is not None and not future.done():
+            future.set_result(response)
+        return response
+
+    async def _send(
+        self,
+        make_request: NextRequestMiddlewareType[TelegramType],
+        bot: Bot,
+        method: TelegramMethod[TelegramType],
+    ) -> Response[TelegramType]:
+        attempt = 0
+        while True:
+            await self.global_bucket.acquire()
+            try:
+                return await make_request(bot, method)
+            except TelegramRetryAfter as e:
+                attempt += 1
+                if attempt > self.max_retries:
+                    raise
+                logger.warning(
+                    f"Flood control для {type(method).__name__}: повтор через {e.retry_after} с "
+                    f"(попытка {attempt}/{self.max_retries})"
+                )
+                await asyncio.sleep(e.retry_after)
+
@@ -1,5 +1,10 @@
 from src.services.yandex_music_service import YandexMusicService
 
+from .jobs import JobQueue
+from .stats_scheduler import StatsScheduler
+
 
 ym_service = YandexMusicService()
+job_queue = JobQueue()
+stats_scheduler = StatsScheduler(ym_service, job_queue)
 
@@ -0,0 +1,125 @@
+import asyncio
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from ..database.storage import get_stats_updated_at, get_token, set_user_stats
+from .jobs import JOB_DONE, Job, JobQueue
+
+logger = logging.getLogger(__name__)
+
+STATS_JOB = "stats"
+
+
+class StatsScheduler:
+    """Поддерживает сохранённую статистику активных пользователей свежей.
+
+    Раз в refresh_interval секунд обновляет не более batch_size пользователей,
+    чья статистика старше refresh_after, — так нагрузка на API распределяется
+    во времени, а экран статистики отрисовывается из базы.
+    """
+
+    def __init__(
+        self,
+        service: Any,
+        job_queue: JobQueue,
+        refresh_interval: float = 60,
+        refresh_after: float = 6 * 3600,
+        active_window: float = 3 * 24 * 3600,
+        batch_size: int = 2,
+    ):
+        self.service = service
+        self.job_queue = job_queue
+        self.refresh_interval = refresh_interval
+        self.refresh_after = refresh_after
+        self.active_window = active_window
+        self.batch_size = batch_size
+        self._last_seen: Dict[int, float] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    def mark_active(self, user_id: int) -> None:
+        self._last_seen[user_id] = time.time()
+
+    def is_fresh(self, updated_at: float) -> bool:
+        return time.time() - updated_at < self.refresh_after
+
+    def submit_refresh(
+        self,
+        user_id: int,
+        token: str,
+        on_item: Optional[Callable[[Job, Any], Awaitable[None]]] = None,
+        on_finish: Optional[Callable[[Job], Awaitable[None]]] = None,
+    ) -> Optional[Job]:
+        """Собрать статистику заново и сохранить её целиком.
+
+        Сохраняются только разделы, полученные этим запуском: старый снимок
+        в основу не берётся, иначе не обновившийся раздел получил бы новую
+        отметку времени.
+        """
+        collected: Dict[str, Any] = {}
+
+        async def handle_item(job: Job, item: Any) -> None:
+            key, value = item
+            collected[key] = value
+            if on_item is not None:
+                await on_item(job, item)
+
+        async def handle_finish(job: Job) -> None:
+            if job.status == JOB_DONE and collected:
+                set_user_stats(user_id, collected)
+                logger.info(f"Статистика пользователя {user_id} сохранена")
+            if on_finish is not None:
+                await on_finish(job)
+
+        return self.job_queue.submit(
+            user_id,
+            STATS_JOB,
+            lambda: self.service.iter_user_statistics(token, user_id),
+            handle_item,
+            handle_finish,
+        )
+
+    async def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._loop())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def _loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.refresh_interval)
+            try:
+                self.refresh_stale()
+            except Exception as e:
+                logger.error(f"Ошибка планового обновления статистики: {e}")
+
+    def refresh_stale(self) -> int:
+        now = time.time()
+        for user_id, seen in list(self._last_seen.items()):
+            if now - seen > self.active_window:
+                del self._last_seen[user_id]
+
+        updated = get_stats_updated_at(list(self._last_seen))
+        candidates = []
+        for user_id in self._last_seen:
+            updated_at = updated.get(user_id, 0.0)
+            if not self.is_fresh(updated_at):
+                candidates.append((updated_at, user_id))
+
+        submitted = 0
+        for _, user_id in sorted(candidates):
+            if submitted >= self.batch_size:
+                break
+            token = get_token(user_id)
+            if not token:
+                self._last_seen.pop(user_id, None)
+                continue
+            if self.submit_refresh(user_id, token) is not None:
+                submitted += 1
+        if submitted:
+            logger.info(f"Плановое обновление статистики: {submitted} пользовател(ей)")
+        return submitted
@@ -0,0 +1,60 @@
+import html
+import re
+from typing import Any, List
+
+TELEGRAM_MESSAGE_LIMIT = 4096
+
+_NEEDS_ESCAPE = re.compile("[&<>]").search
+
+
+def escape(value: Any) -> str:
+    """HTML-экранирование для parse_mode=HTML; строки без спецсимволов возвращаются как есть."""
+    text = str(value)
+    return html.escape(text, quote=False) if _NEEDS_ESCAPE(text) else text
+
+
+def _split_long_line(line: str, limit: int) -> List[str]:
+    if len(escape(line)) <= limit:
+        return [line]
+
+    pieces: List[str] = []
+    current = ""
+    for word in line.split(" "):
+        candidate = f"{current} {word}" if current else word
+        if len(escape(candidate)) <= limit:
+            current = candidate
+            continue
+        if current:
+            pieces.append(current)
+        current = ""
+        for char in word:
+            if len(escape(current + char)) > limit:
+                pieces.append(current)
+                current = ""
+            current += char
+    if current:
+        pieces.append(current)
+    return pieces
+
+
+def split_message(text: str, limit: int = TELEGRAM_MESSAGE_LIMIT) -> List[str]:
+    """Делит текст по границам строк на HTML-экранированные части длиной не больше limit."""
+    pages: List[str] = []
+    current: List[str] = []
+    current_len = 0
+
+    for line in text.split("\n"):
+        for piece in _split_long_line(line, limit):
+            escaped = escape(piece)
+            extra = len(escaped) + (1 if current else 0)
+            if current and current_len + extra > limit:
+                pages.append("\n".join(current))
+                current = []
+                extra = len(escaped)
+                current_len = 0
+            current.append(escaped)
+            current_len += extra
+
+    if current:
+        pages.append("\n".join(current))
+    return [page.strip("\n") for page in pages if page.strip()]
@@ -1,4 +1,4 @@
-from sqlalchemy import create_engine, Column, String, BigInteger, ForeignKey
+from sqlalchemy import create_engine, inspect, text, Column, String, BigInteger, ForeignKey, Integer, Float, LargeBinary, Text
 from sqlalchemy.orm import declarative_base, relationship
 
 engine = create_engine("sqlite:///yandex_music_bot.db", echo=True)
@@ -9,6 +9,41 @@ class UserToken(Base):
 
     nickname = Column(String, primary_key=True)
     token = Column(String, nullable=False)
+    uid = Column(BigInteger, nullable=True)
+
+
+class LyricsCacheEntry(Base):
+    __tablename__ = "lyrics_cache"
+
+    track_id = Column(String, primary_key=True)
+    data = Column(LargeBinary, nullable=False)
+    size = Column(Integer, nullable=False)
+    accessed_at = Column(Float, nullable=False, index=True)
+
+
+class UserStats(Base):
+    __tablename__ = "user_stats"
+
+    nickname = Column(String, primary_key=True)
+    payload = Column(Text, nullable=False)
+    updated_at = Column(Float, nullable=False)
+
+
+class ListeningDay(Base):
+    __tablename__ = "listening_days"
+
+    nickname = Column(String, primary_key=True)
+    day = Column(Integer, primary_key=True)
+    payload = Column(Text, nullable=False)
+
+
+def migrate(bind) -> None:
+    """Добавить в существующие таблицы колонки, появившиеся после их создания."""
+    columns = {column["name"] for column in inspect(bind).get_columns("user_tokens")}
+    if "uid" not in columns:
+        with bind.begin() as connection:
+            connection.execute(text("ALTER TABLE user_tokens ADD COLUMN uid BIGINT"))
 
 
 Base.metadata.create_all(engine)
+migrate(engine)
@@ -1,19 +1,28 @@
+import json
+import os
+import time
+import zlib
+
+from sqlalchemy import delete, func, select
 from sqlalchemy.orm import sessionmaker
 
-from .repository import engine, UserToken
+from .repository import engine, UserToken, LyricsCacheEntry, UserStats, ListeningDay
 
 SessionLocal = sessionmaker(bind=engine)
 
+LYRICS_CACHE_MAX_BYTES = int(os.getenv("LYRICS_CACHE_MAX_BYTES", str(16 * 1024 * 1024)))
+
 
-def set_token(user_id: int, token: str) -> None:
-    """Сохранить токен пользователя (upsert по user_id)."""
+def set_token(user_id: int, token: str, uid: int | None = None) -> None:
+    """Сохранить токен пользователя и uid его аккаунта (upsert по user_id)."""
     nickname = str(user_id)
     with SessionLocal() as session:
         row = session.get(UserToken, nickname)
         if row is None:
-            session.add(UserToken(nickname=nickname, token=token))
+            session.add(UserToken(nickname=nickname, token=token, uid=uid))
         else:
             row.token = token
+            row.uid = uid
         session.commit()
 
 
@@ -25,6 +34,24 @@ def get_token(user_id: int) -> str | None:
         return None if row is None else row.token
 
 
+def get_uid(user_id: int) -> int | None:
+    """Получить сохранённый uid аккаунта пользователя."""
+    nickname = str(user_id)
+    with SessionLocal() as session:
+        row = session.get(UserToken, nickname)
+        return None if row is None else row.uid
+
+
+def set_uid(user_id: int, uid: int) -> None:
+    """Сохранить uid аккаунта пользователя, если его токен уже записан."""
+    nickname = str(user_id)
+    with SessionLocal() as session:
+        row = session.get(UserToken, nickname)
+        if row is not None:
+            row.uid = uid
+            session.commit()
+
+
 def has_token(user_id: int) -> bool:
     """Проверить наличие токена у пользователя."""
     nickname = str(user_id)
@@ -40,3 +67,109 @@ def remove_token(user_id: int) -> None:
         if row is not None:
             session.delete(row)
             session.commit()
+
+
+def get_cached_lyrics(track_id: str) -> str | None:
+    """Получить текст песни из кэша."""
+    with SessionLocal() as session:
+        row = session.get(LyricsCacheEntry, track_id)
+        if row is None:
+            return None
+        row.accessed_at = time.time()
+        session.commit()
+        return zlib.decompress(row.data).decode("utf-8")
+
+
+def set_cached_lyrics(track_id: str, text: str) -> None:
+    """Сохранить текст песни в кэш в сжатом виде, вытесняя давно запрошенные записи."""
+    data = zlib.compress(text.encode("utf-8"), 9)
+    with SessionLocal() as session:
+        row = session.get(LyricsCacheEntry, track_id)
+        if row is None:
+            session.add(LyricsCacheEntry(track_id=track_id, data=data, size=len(data), accessed_at=time.time()))
+        else:
+            row.data = data
+            row.size = len(data)
+            row.accessed_at = time.time()
+        session.flush()
+
+        total = session.scalar(select(func.coalesce(func.sum(LyricsCacheEntry.size), 0)))
+        if total > LYRICS_CACHE_MAX_BYTES:
+            oldest = session.execute(
+                select(LyricsCacheEntry.track_id, LyricsCacheEntry.size)
+                .where(LyricsCacheEntry.track_id != track_id)
+                .order_by(LyricsCacheEntry.accessed_at)
+            ).all()
+            for old_id, old_size in oldest:
+                if total <= LYRICS_CACHE_MAX_BYTES:
+                    break
+                session.delete(session.get(LyricsCacheEntry, old_id))
+                total -= old_size
+        session.commit()
+
+
+def get_user_stats(user_id: int) -> tuple[dict, float] | None:
+    """Получить сохранённую статистику пользователя и время её обновления."""
+    nickname = str(user_id)
+    with SessionLocal() as session:
+        row = session.get(UserStats, nickname)
+        return None if row is None else (json.loads(row.payload), row.updated_at)
+
+
+def set_user_stats(user_id: int, stats: dict) -> None:
+    """Сохранить статистику пользователя (upsert по user_id)."""
+    nickname = str(user_id)
+    payload = json.dumps(stats, ensure_ascii=False)
+    with SessionLocal() as session:
+        row = session.get(UserStats, nickname)
+        if row is None:
+            session.add(UserStats(nickname=nickname, payload=payload, updated_at=time.time()))
+        else:
+            row.payload = payload
+            row.updated_at = time.time()
+        session.commit()
+
+
+def get_stats_updated_at(user_ids: list[int]) -> dict[int, float]:
+    """Время обновления сохранённой статистики для нескольких пользователей одним запросом."""
+    nicknames = [str(user_id) for user_id in user_ids]
+    if not nicknames:
+        return {}
+    with SessionLocal() as session:
+        rows = session.execute(
+            select(UserStats.nickname, UserStats.updated_at).where(UserStats.nickname.in_(nicknames))
+        ).all()
+        return {int(nickname): updated_at for nickname, updated_at in rows}
+
+
+def remove_user_stats(user_id: int) -> None:
+    """Удалить сохранённую статистику и историю прослушиваний пользователя."""
+    nickname = str(user_id)
+    with SessionLocal() as session:
+        session.execute(delete(UserStats).where(UserStats.nickname == nickname))
+        session.execute(delete(ListeningDay).where(ListeningDay.nickname == nickname))
+        session.commit()
+
+
+def get_listening_days(user_id: int) -> dict[int, dict]:
+    """Получить дневные агрегаты истории прослушиваний пользователя."""
+    nickname = str(user_id)
+    with SessionLocal() as session:
+        rows = session.execute(
+            select(ListeningDay.day, ListeningDay.payload).where(ListeningDay.nickname == nickname)
+        ).all()
+        return {day: json.loads(payload) for day, payload in rows}
+
+
+def save_listening_days(user_id: int, days: dict[int, dict]) -> None:
+    """Сохранить дневные агрегаты истории прослушиваний (upsert по дню)."""
+    nickname = str(user_id)
+    with SessionLocal() as session:
+        for day, bucket in days.items():
+            payload = json.dumps(bucket, ensure_ascii=False)
+            row = session.get(ListeningDay, (nickname, day))
+            if row is None:
+                session.add(ListeningDay(nickname=nickname, day=day, payload=payload))
+            else:
+                row.payload = payload
+        session.commit()
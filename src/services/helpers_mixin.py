@@ -1,14 +1,30 @@
 import logging
-from collections import Counter
+from contextlib import nullcontext
 from datetime import datetime, timezone
-from typing import Any, Iterable, List, Optional, Dict, Tuple
+from typing import Any, Iterable, Iterator, List, Optional, Dict, Tuple
 
 from yandex_music import Client
 
+from .lazy_playlist import LazyPlaylist
+from .likes_store import LikesStore
+from .playlist_index import PlaylistTitleIndex, normalize_title
+from .playlist_tracks import PlaylistTracks
+from .track_index import IndexedTrack, TrackSearchIndex
+
 logger = logging.getLogger(__name__)
 
+TRACKS_CHUNK_SIZE = 200
+# Доля токенов запроса, которые должны совпасть с локальным индексом точно,
+# чтобы не обращаться к поиску API; остальное уходит в client.search
+LOCAL_MATCH_MIN_EXACT_SHARE = 0.5
+
 
 class YandexMusicHelperMixin:
+    def _locked(self) -> Any:
+        """Замок состояния пользователей (индексы, лайки, история), если он задан сервисом."""
+        lock = getattr(self, "state_lock", None)
+        return lock if lock is not None else nullcontext()
+
     @staticmethod
     def _normalize_timestamp(value: Any) -> Optional[datetime]:
         if value is None:
@@ -40,15 +56,29 @@ class YandexMusicHelperMixin:
             return str(track_id)
         return None
 
+    @classmethod
+    def _track_key(cls, track_like: Any) -> Optional[str]:
+        formatted = cls._format_track_id(track_like)
+        return formatted.split(":", 1)[0] if formatted else None
+
     @staticmethod
     def _extract_artists(track: Any) -> List[str]:
         artists = []
-        for artist in getattr(track, "artists", []) or []:
-            name = getattr(artist, "name", None)
+        track_artists = getattr(track, "artists", None)
+        if not isinstance(track_artists, (list, tuple)):
+            return artists
+        for artist in track_artists:
+            name = artist if isinstance(artist, str) else getattr(artist, "name", None)
             if name:
                 artists.append(name)
         return artists
 
+    @classmethod
+    def _format_track_title(cls, track: Any, default_artist: str = "Unknown") -> str:
+        artists = cls._extract_artists(track)
+        artist_name = artists[0] if artists else default_artist
+        return f"{artist_name} - {getattr(track, 'title', '')}"
+
     @staticmethod
     def _extract_genre(track: Any) -> Optional[str]:
         genre = getattr(track, "genre", None)
@@ -73,7 +103,7 @@ class YandexMusicHelperMixin:
                 return None
         return None
 
-    def _to_top_list(self, counter: Counter, limit: int = 5) -> List[Dict[str, Any]]:
+    def _to_top_list(self, counter: Any, limit: int = 5) -> List[Dict[str, Any]]:
         return [{"name": name, "count": count} for name, count in counter.most_common(limit)]
 
     def _fetch_tracks(self, client: Client, track_refs: Iterable[Any]) -> List[Any]:
@@ -90,6 +120,58 @@ class YandexMusicHelperMixin:
             logger.error(f"Ошибка при получении треков {track_ids}: {e}")
             return []
 
+    @staticmethod
+    def _is_hydrated(track_like: Any) -> bool:
+        return (
+            not isinstance(track_like, str)
+            and isinstance(getattr(track_like, "artists", None), list)
+            and isinstance(getattr(track_like, "title", None), str)
+        )
+
+    def _cache_tracks(self, tracks: Iterable[Any]) -> None:
+        cache = getattr(self, "track_cache", None)
+        if cache is None:
+            return
+        for track in tracks:
+            cache.put(self._track_key(track), track)
+
+    def _plan_hydration(self, track_refs: Iterable[Any]) -> Tuple[List[Any], List[Any]]:
+        """Разделить ссылки на готовые треки (полные объекты и попадания в кэш) и ссылки для загрузки."""
+        cache = getattr(self, "track_cache", None)
+        ready: List[Any] = []
+        missing: List[Any] = []
+        for ref in track_refs:
+            if self._is_hydrated(ref):
+                ready.append(ref)
+                continue
+            cached = cache.get(self._track_key(ref)) if cache is not None else None
+            if cached is not None:
+                ready.append(cached)
+            else:
+                missing.append(ref)
+        self._cache_tracks(ref for ref in ready)
+        return ready, missing
+
+    def _hydrate_tracks(self, client: Client, track_refs: Iterable[Any]) -> List[Any]:
+        ready, missing = self._plan_hydration(track_refs)
+        if not missing:
+            return ready
+        fetched = self._fetch_tracks(client, missing)
+        self._cache_tracks(fetched)
+        return ready + fetched
+
+    def _iter_fetch_tracks(
+        self, client: Client, track_refs: Iterable[Any], chunk_size: int = TRACKS_CHUNK_SIZE
+    ) -> Iterator[List[Any]]:
+        ready, missing = self._plan_hydration(track_refs)
+        if ready:
+            yield ready
+        for start in range(0, len(missing), chunk_size):
+            chunk = self._fetch_tracks(client, missing[start:start + chunk_size])
+            self._cache_tracks(chunk)
+            if chunk:
+                yield chunk
+
     def _unwrap_history_items(self, history: Any) -> List[Any]:
         if history is None:
             return []
@@ -120,6 +202,7 @@ class YandexMusicHelperMixin:
     def _collect_tracks_from_history(self, client: Client, history_items: List[Any]) -> List[Tuple[Any, Optional[datetime]]]:
         tracks_with_ts: List[Tuple[Any, Optional[datetime]]] = []
         missing_ids: List[Tuple[str, Optional[datetime]]] = []
+        cache = getattr(self, "track_cache", None)
 
         for item in history_items:
             timestamp = self._normalize_timestamp(
@@ -134,10 +217,15 @@ class YandexMusicHelperMixin:
 
             track_id = self._format_track_id(item)
             if track_id:
-                missing_ids.append((track_id, timestamp))
+                cached = cache.get(self._track_key(track_id)) if cache is not None else None
+                if cached is not None:
+                    tracks_with_ts.append((cached, timestamp))
+                else:
+                    missing_ids.append((track_id, timestamp))
 
         if missing_ids:
             fetched = self._fetch_tracks(client, [tid for tid, _ in missing_ids])
+            self._cache_tracks(fetched)
             for fetched_track, (_, ts) in zip(fetched, missing_ids):
                 if fetched_track:
                     tracks_with_ts.append((fetched_track, ts))
@@ -152,16 +240,48 @@ class YandexMusicHelperMixin:
             logger.error(f"Не удалось получить uid пользователя: {e}")
         return None
 
-    def _get_playlist_tracks(self, client: Client, uid: int) -> List[Any]:
+    def _load_account_uid(self, user_id: int) -> Optional[int]:
+        return None
+
+    def _save_account_uid(self, user_id: int, uid: int) -> None:
+        pass
+
+    def _get_user_uid(self, client: Client, user_id: int) -> Optional[int]:
+        """uid аккаунта пользователя: из памяти, из хранилища или запросом account_status."""
+        uids = getattr(self, "account_uids", None)
+        uid = uids.get(user_id) if uids is not None else None
+        if uid is not None:
+            return uid
+
+        uid = self._load_account_uid(user_id)
+        if uid is None:
+            uid = self._get_account_uid(client)
+            if uid is None:
+                return None
+            self._save_account_uid(user_id, uid)
+        if uids is not None:
+            uids[user_id] = uid
+        return uid
+
+    def _list_playlists(self, client: Client, uid: Optional[int] = None) -> List[LazyPlaylist]:
+        headers = client.users_playlists_list(uid) if uid is not None else client.users_playlists_list()
+        return [LazyPlaylist(client, header, uid) for header in headers or []]
+
+    @staticmethod
+    def _get_playlist(client: Client, kind: int, uid: Optional[int] = None) -> Optional[Any]:
+        return client.users_playlists(kind, uid) if uid is not None else client.users_playlists(kind)
+
+    def _get_playlist_track_refs(self, client: Client, uid: int) -> List[Any]:
         try:
-            playlists = client.users_playlists(uid)
+            playlists = self._list_playlists(client, uid)
+            LazyPlaylist.load_many(client, playlists)
         except Exception as e:
             logger.error(f"Не удалось получить плейлисты для uid={uid}: {e}")
             return []
 
         playlist_track_refs = []
-        for playlist in playlists or []:
-            for track_ref in getattr(playlist, "tracks", []) or []:
+        for playlist in playlists:
+            for track_ref in playlist:
                 track_obj = getattr(track_ref, "track", None)
                 if track_obj:
                     playlist_track_refs.append(track_obj)
@@ -169,7 +289,39 @@ class YandexMusicHelperMixin:
                 track_id = self._format_track_id(track_ref)
                 if track_id:
                     playlist_track_refs.append(track_id)
-        return self._fetch_tracks(client, playlist_track_refs)
+        return playlist_track_refs
+
+    def _get_playlist_tracks(self, client: Client, uid: int) -> List[Any]:
+        return self._hydrate_tracks(client, self._get_playlist_track_refs(client, uid))
+
+    def _load_playlist_tracks(
+        self, client: Client, user_id: int, kind: int, preload: int = 0
+    ) -> Optional[PlaylistTracks]:
+        """Загрузить плейлист и оставить от него только id треков.
+
+        Треки, которые API вложил в ответ, кладутся в кэш только для первых
+        preload позиций: их покажет первая страница, остальные догрузятся
+        по мере листания.
+        """
+        uid = self._get_user_uid(client, user_id)
+        playlist = self._get_playlist(client, kind, uid)
+        if playlist is None:
+            return None
+
+        track_ids = []
+        embedded = []
+        for ref in getattr(playlist, "tracks", None) or []:
+            track_id = self._format_track_id(ref)
+            if not track_id:
+                continue
+            track_ids.append(track_id)
+            if len(track_ids) <= preload:
+                track = getattr(ref, "track", None)
+                if self._is_hydrated(track):
+                    embedded.append(track)
+        self._cache_tracks(embedded)
+        logger.info(f"Плейлист {kind} пользователя {user_id}: {len(track_ids)} треков, {len(embedded)} в ответе")
+        return PlaylistTracks(kind, getattr(playlist, "title", None) or "", getattr(playlist, "revision", None), track_ids)
 
     def _search_track_id(self, client: Client, query: str) -> Optional[str]:
         try:
@@ -188,12 +340,122 @@ class YandexMusicHelperMixin:
 
     def _find_playlist_by_title(self, client: Client, uid: int, title: str) -> Optional[Any]:
         try:
-            playlists = client.users_playlists(uid)
-            for playlist in playlists or []:
-                if getattr(playlist, "title", "").lower() == title.lower():
-                    return playlist
+            normalized = normalize_title(title)
+            for playlist in self._list_playlists(client, uid):
+                if normalize_title(playlist.title) == normalized:
+                    return playlist.header
             return None
         except Exception as e:
             logger.error(f"Не удалось получить плейлисты для поиска '{title}': {e}")
             return None
 
+    def _rebuild_playlist_index(self, client: Client, user_id: int) -> PlaylistTitleIndex:
+        playlists = self._list_playlists(client, self._get_user_uid(client, user_id))
+        with self._locked():
+            indexes = getattr(self, "playlist_indexes", None)
+            index = indexes.get(user_id) if indexes is not None else None
+            if index is None:
+                index = PlaylistTitleIndex()
+                if indexes is not None:
+                    indexes[user_id] = index
+            index.rebuild(playlists)
+        logger.info(f"Построен индекс плейлистов пользователя {user_id}: {len(index)}")
+        return index
+
+    def _resolve_playlist(self, client: Client, user_id: int, title: str) -> Optional[Any]:
+        """Найти плейлист по названию через индекс пользователя.
+
+        При попадании список плейлистов не запрашивается: загружается только
+        найденный плейлист, и его название сверяется с индексом. При промахе
+        или расхождении индекс перестраивается.
+        """
+        index = (getattr(self, "playlist_indexes", None) or {}).get(user_id)
+        if index is None:
+            index = self._rebuild_playlist_index(client, user_id)
+            fresh = True
+        else:
+            fresh = False
+
+        with self._locked():
+            kind = index.get(title)
+        uid = self._get_user_uid(client, user_id)
+        if kind is not None:
+            playlist = self._get_playlist(client, kind, uid)
+            with self._locked():
+                if playlist is not None and normalize_title(getattr(playlist, "title", None)) == normalize_title(title):
+                    index.add(kind, playlist.title)
+                    return playlist
+                index.discard(kind)
+        elif fresh:
+            return None
+
+        index = self._rebuild_playlist_index(client, user_id)
+        with self._locked():
+            kind = index.get(title)
+        return self._get_playlist(client, kind, uid) if kind is not None else None
+
+    def _index_playlist(self, user_id: int, playlist: Any) -> None:
+        index = (getattr(self, "playlist_indexes", None) or {}).get(user_id)
+        kind = getattr(playlist, "kind", None)
+        if index is not None and kind is not None:
+            with self._locked():
+                index.add(kind, getattr(playlist, "title", None))
+
+    def _get_track_index(self, user_id: int) -> Optional[TrackSearchIndex]:
+        indexes = getattr(self, "track_indexes", None)
+        if indexes is None:
+            return None
+        with self._locked():
+            index = indexes.get(user_id)
+            if index is None:
+                index = indexes[user_id] = TrackSearchIndex()
+            return index
+
+    def _index_tracks(self, user_id: int, tracks: Iterable[Any]) -> None:
+        index = self._get_track_index(user_id)
+        if index is None:
+            return
+        with self._locked():
+            added = index.add_many(tracks)
+        if added:
+            logger.info(f"Локальный индекс пользователя {user_id}: +{added}, всего {len(index)}")
+
+    def _find_local_track(self, user_id: int, query: str) -> Optional[IndexedTrack]:
+        index = (getattr(self, "track_indexes", None) or {}).get(user_id)
+        if index is None:
+            return None
+        with self._locked():
+            return index.search(query, min_exact_share=LOCAL_MATCH_MIN_EXACT_SHARE)
+
+    def _sync_likes(self, client: Client, user_id: int) -> LikesStore:
+        stores = getattr(self, "likes_stores", None)
+        with self._locked():
+            store = stores.get(user_id) if stores is not None else None
+            if store is None:
+                store = LikesStore()
+                if stores is not None:
+                    stores[user_id] = store
+
+        likes = client.users_likes_tracks(if_modified_since_revision=store.revision or 0)
+        revision = getattr(likes, "revision", None)
+        if not isinstance(revision, int):
+            revision = None
+        if likes is None or (revision is not None and revision == store.revision):
+            return store
+
+        entries = []
+        skipped = 0
+        for track_ref in getattr(likes, "tracks", []) or []:
+            track_id = self._format_track_id(track_ref)
+            if not track_id:
+                # Без id трек нельзя ни загрузить, ни сопоставить между ревизиями
+                skipped += 1
+                continue
+            ts = self._normalize_timestamp(getattr(track_ref, "timestamp", None) or getattr(track_ref, "added", None))
+            entries.append((track_id, ts.timestamp() if ts else None))
+        with self._locked():
+            added, removed = store.apply(revision, entries)
+        if skipped:
+            logger.warning(f"Лайки пользователя {user_id}: пропущено {skipped} записей без id трека")
+        logger.info(f"Лайки пользователя {user_id}: ревизия {revision}, +{added}, -{removed}, всего {len(store)}")
+        return store
@@ -0,0 +1,62 @@
+import logging
+from collections import defaultdict
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class LazyPlaylist:
+    """Плейлист, у которого заголовок загружен сразу, а треки — по требованию.
+
+    Заголовки берутся из users_playlists_list, который не содержит треков.
+    Треки запрашиваются при первом обращении к tracks; load_many загружает
+    сразу несколько плейлистов одним запросом.
+    """
+
+    __slots__ = ("header", "kind", "title", "revision", "track_count", "owner_uid", "_client", "_tracks")
+
+    def __init__(self, client: Any, header: Any, owner_uid: Optional[int] = None):
+        self.header = header
+        self.kind = getattr(header, "kind", None)
+        self.title = getattr(header, "title", None) or ""
+        self.revision = getattr(header, "revision", None)
+        self.track_count = getattr(header, "track_count", None) or 0
+        self.owner_uid = owner_uid if owner_uid is not None else getattr(header, "uid", None)
+        self._client = client
+        self._tracks: Optional[List[Any]] = None
+
+        embedded = getattr(header, "tracks", None)
+        if isinstance(embedded, list) and (embedded or self.track_count == 0):
+            self._tracks = embedded
+
+    @property
+    def loaded(self) -> bool:
+        return self._tracks is not None
+
+    @property
+    def tracks(self) -> List[Any]:
+        if self._tracks is None:
+            self.load_many(self._client, [self])
+        return self._tracks or []
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(self.tracks)
+
+    @staticmethod
+    def load_many(client: Any, playlists: Iterable["LazyPlaylist"]) -> None:
+        by_owner: Dict[Any, Dict[Any, LazyPlaylist]] = defaultdict(dict)
+        for playlist in playlists:
+            if not playlist.loaded and playlist.kind is not None:
+                by_owner[playlist.owner_uid][playlist.kind] = playlist
+
+        for owner_uid, pending in by_owner.items():
+            full = client.users_playlists(list(pending), owner_uid)
+            if full is not None and not isinstance(full, list):
+                full = [full]
+            for item in full or []:
+                playlist = pending.pop(getattr(item, "kind", None), None)
+                if playlist is not None:
+                    playlist._tracks = list(getattr(item, "tracks", None) or [])
+            for playlist in pending.values():
+                playlist._tracks = []
+            logger.info(f"Загружены треки {len(full or [])} плейлистов пользователя {owner_uid}")
@@ -0,0 +1,57 @@
+from bisect import bisect_left, insort
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+
+class LikesStore:
+    """Локальная копия лайков пользователя с ревизией библиотеки.
+
+    Хранит id лайкнутых треков и отсортированный список времени лайков:
+    количество лайков после заданного момента считается бинарным поиском.
+    При синхронизации применяется только разница с предыдущим состоянием.
+    """
+
+    def __init__(self):
+        self.revision: Optional[int] = None
+        self._timestamps: Dict[str, Optional[float]] = {}
+        self._sorted: List[float] = []
+
+    def __len__(self) -> int:
+        return len(self._timestamps)
+
+    def __contains__(self, track_id: str) -> bool:
+        return track_id in self._timestamps
+
+    def __iter__(self) -> Iterator[str]:
+        # Снимок: синхронизация из другой задачи может менять словарь во время обхода
+        return iter(list(self._timestamps))
+
+    def apply(self, revision: Optional[int], likes: Iterable[Tuple[str, Optional[float]]]) -> Tuple[int, int]:
+        """Привести хранилище к полному списку likes; возвращает (добавлено, удалено)."""
+        current = dict(likes)
+        removed = [
+            track_id for track_id, ts in self._timestamps.items()
+            if track_id not in current or current[track_id] != ts
+        ]
+        added = [
+            track_id for track_id, ts in current.items()
+            if track_id not in self._timestamps or self._timestamps[track_id] != ts
+        ]
+
+        if len(added) + len(removed) > len(self._sorted) // 2:
+            self._timestamps = current
+            self._sorted = sorted(ts for ts in current.values() if ts is not None)
+        else:
+            for track_id in removed:
+                ts = self._timestamps.pop(track_id)
+                if ts is not None:
+                    del self._sorted[bisect_left(self._sorted, ts)]
+            for track_id in added:
+                ts = self._timestamps[track_id] = current[track_id]
+                if ts is not None:
+                    insort(self._sorted, ts)
+
+        self.revision = revision
+        return len(added), len(removed)
+
+    def count_since(self, timestamp: float) -> int:
+        return len(self._sorted) - bisect_left(self._sorted, timestamp)
@@ -0,0 +1,178 @@
+import time
+from bisect import bisect_left
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+DAY_SECONDS = 86400
+
+
+@dataclass
+class DayBucket:
+    plays: int = 0
+    duration_ms: int = 0
+    last_ts: float = 0.0
+    # id треков, прослушанных ровно в last_ts; None - неизвестно (данные
+    # старого формата), тогда все прослушивания в last_ts считаются учтёнными
+    last_ids: Optional[Set[str]] = field(default_factory=set)
+    artists: Counter = field(default_factory=Counter)
+    genres: Counter = field(default_factory=Counter)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "plays": self.plays,
+            "duration_ms": self.duration_ms,
+            "last_ts": self.last_ts,
+            "last_ids": None if self.last_ids is None else sorted(self.last_ids),
+            "artists": dict(self.artists),
+            "genres": dict(self.genres),
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "DayBucket":
+        return cls(
+            plays=data.get("plays", 0),
+            duration_ms=data.get("duration_ms", 0),
+            last_ts=data.get("last_ts", 0.0),
+            last_ids=set(data["last_ids"]) if data.get("last_ids") is not None else None,
+            artists=Counter(data.get("artists") or {}),
+            genres=Counter(data.get("genres") or {}),
+        )
+
+
+class ListeningHistory:
+    """Локальная история прослушиваний, разложенная по дням (UTC).
+
+    Окно в days дней — это последние days календарных дней, включая текущий.
+
+    Прослушивания только дописываются: из каждой новой выгрузки берутся записи
+    не старше последней сохранённой, а совпадающие с ней по времени
+    отсеиваются по паре (ts, id трека). Для каждого дня хранятся готовые
+    счётчики, поэтому минуты и число прослушиваний за окно считаются по
+    префиксным суммам за O(log дней). Топы складываются из счётчиков дней
+    окна: O(дней окна × ключей в дне) на запрос. Окно не длиннее года, а топы
+    запрашиваются раз на обновление статистики, поэтому скользящие агрегаты
+    не ведутся.
+    """
+
+    def __init__(self, buckets: Optional[Dict[int, DayBucket]] = None):
+        self._buckets: Dict[int, DayBucket] = dict(buckets or {})
+        self._days: List[int] = []
+        self._prefix_ms: List[int] = []
+        self._prefix_plays: List[int] = []
+        self._dirty = True
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+    @property
+    def last_ts(self) -> float:
+        return max((bucket.last_ts for bucket in self._buckets.values()), default=0.0)
+
+    def bucket(self, day: int) -> Optional[DayBucket]:
+        return self._buckets.get(day)
+
+    def _last_bucket(self) -> Optional[DayBucket]:
+        return max(self._buckets.values(), key=lambda bucket: bucket.last_ts, default=None)
+
+    @staticmethod
+    def _is_known(last: Optional[DayBucket], ts: float, track_id: str) -> bool:
+        if last is None or ts > last.last_ts:
+            return False
+        if ts < last.last_ts or last.last_ids is None:
+            return True
+        return track_id in last.last_ids
+
+    def extend(self, plays: Iterable[Tuple[float, Optional[str], int, Iterable[str], Optional[str]]]) -> Set[int]:
+        """Дописать прослушивания (ts, track_id, duration_ms, artists, genre); возвращает изменённые дни.
+
+        plays ожидаются по возрастанию ts: запись старше последней сохранённой
+        отбрасывается, а с тем же временем - если этот трек в нём уже учтён.
+        """
+        changed: Set[int] = set()
+        last = self._last_bucket()
+        for ts, track_id, duration_ms, artists, genre in plays:
+            track_id = track_id or ""
+            if self._is_known(last, ts, track_id):
+                continue
+            day = int(ts // DAY_SECONDS)
+            bucket = self._buckets.get(day)
+            if bucket is None:
+                bucket = self._buckets[day] = DayBucket()
+            bucket.plays += 1
+            bucket.duration_ms += duration_ms or 0
+            if ts > bucket.last_ts:
+                bucket.last_ts = ts
+                bucket.last_ids = set()
+            if bucket.last_ids is not None:
+                bucket.last_ids.add(track_id)
+            if last is None or bucket.last_ts >= last.last_ts:
+                last = bucket
+            bucket.artists.update(artists)
+            if genre:
+                bucket.genres[genre] += 1
+            changed.add(day)
+        if changed:
+            self._dirty = True
+        return changed
+
+    def _rebuild(self) -> None:
+        self._days = sorted(self._buckets)
+        self._prefix_ms = [0]
+        self._prefix_plays = [0]
+        for day in self._days:
+            bucket = self._buckets[day]
+            self._prefix_ms.append(self._prefix_ms[-1] + bucket.duration_ms)
+            self._prefix_plays.append(self._prefix_plays[-1] + bucket.plays)
+        self._dirty = False
+
+    def _window_start(self, days: int, now: Optional[float]) -> int:
+        if self._dirty:
+            self._rebuild()
+        return bisect_left(self._days, self._first_day(days, now))
+
+    @staticmethod
+    def _first_day(days: int, now: Optional[float]) -> int:
+        now = time.time() if now is None else now
+        return int(now // DAY_SECONDS) - days + 1
+
+    def minutes(self, days: int, now: Optional[float] = None) -> int:
+        start = self._window_start(days, now)
+        return int((self._prefix_ms[-1] - self._prefix_ms[start]) / 60000)
+
+    def plays(self, days: int, now: Optional[float] = None) -> int:
+        start = self._window_start(days, now)
+        return self._prefix_plays[-1] - self._prefix_plays[start]
+
+    def minutes_by_day(self, days: int, now: Optional[float] = None) -> List[Tuple[int, int]]:
+        """Минуты прослушивания за каждый из последних days дней, включая дни без прослушиваний."""
+        first_day = self._first_day(days, now)
+        result = []
+        for day in range(first_day, first_day + days):
+            bucket = self._buckets.get(day)
+            result.append((day, int(bucket.duration_ms / 60000) if bucket else 0))
+        return result
+
+    def top_artists(self, days: int, now: Optional[float] = None) -> Counter:
+        """Суммирует счётчики артистов по дням окна, O(дней × артистов в дне)."""
+        start = self._window_start(days, now)
+        counter: Counter = Counter()
+        for day in self._days[start:]:
+            counter.update(self._buckets[day].artists)
+        return counter
+
+    def top_genres(self, days: int, now: Optional[float] = None) -> Counter:
+        """Суммирует счётчики жанров по дням окна, O(дней × жанров в дне)."""
+        start = self._window_start(days, now)
+        counter: Counter = Counter()
+        for day in self._days[start:]:
+            counter.update(self._buckets[day].genres)
+        return counter
+
+    def to_dict(self, days: Optional[Iterable[int]] = None) -> Dict[int, Dict[str, Any]]:
+        selected = self._buckets if days is None else days
+        return {day: self._buckets[day].to_dict() for day in selected}
+
+    @classmethod
+    def from_dict(cls, data: Dict[int, Dict[str, Any]]) -> "ListeningHistory":
+        return cls({int(day): DayBucket.from_dict(bucket) for day, bucket in data.items()})
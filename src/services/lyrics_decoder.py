@@ -0,0 +1,85 @@
+import logging
+import re
+from typing import Any, Iterable, Iterator, List, NamedTuple, Optional
+
+logger = logging.getLogger(__name__)
+
+LRC_TIMESTAMP_RE = re.compile(r"\[[0-9:\.\-]+\]")
+LRC_TIME_RE = re.compile(r"\[(\d+):(\d{1,2})(?:[.:](\d{1,3}))?\]")
+
+LYRICS_MAX_BYTES = 256 * 1024
+LYRICS_CHUNK_SIZE = 8 * 1024
+
+
+class SyncedLine(NamedTuple):
+    time_ms: Optional[int]
+    text: str
+
+
+def _parse_time_ms(line: str) -> Optional[int]:
+    match = LRC_TIME_RE.search(line)
+    if match is None:
+        return None
+    minutes, seconds, fraction = match.groups()
+    fraction_ms = int(fraction.ljust(3, "0")) if fraction else 0
+    return (int(minutes) * 60 + int(seconds)) * 1000 + fraction_ms
+
+
+def _decode_line(raw: bytes) -> str:
+    return raw.rstrip(b"\r").decode("utf-8", errors="replace")
+
+
+def iter_response_lines(
+    response: Any, max_bytes: int = LYRICS_MAX_BYTES, chunk_size: int = LYRICS_CHUNK_SIZE
+) -> Iterator[str]:
+    """Читает ответ кусками по chunk_size байт и отдаёт его построчно.
+
+    Лимит max_bytes проверяется на каждом куске, а не на каждой строке, поэтому
+    ответ без переводов строк тоже не читается в память целиком. Строки, не
+    уместившиеся в лимит, отбрасываются.
+    """
+    consumed = 0
+    pending = b""
+    for chunk in response.iter_content(chunk_size=chunk_size):
+        if not chunk:
+            continue
+        if consumed + len(chunk) > max_bytes:
+            lines = (pending + chunk[:max_bytes - consumed]).split(b"\n")
+            for raw in lines[:-1]:
+                yield _decode_line(raw)
+            logger.warning(f"Текст песни превышает {max_bytes} байт, остаток отброшен")
+            return
+        consumed += len(chunk)
+        *lines, pending = (pending + chunk).split(b"\n")
+        for raw in lines:
+            yield _decode_line(raw)
+    if pending:
+        yield _decode_line(pending)
+
+
+def format_timestamp(time_ms: int, with_ms: bool = True) -> str:
+    """62500 -> '[01:02.500]' (или '[01:02]' без миллисекунд)."""
+    minutes, rest = divmod(time_ms, 60000)
+    seconds, millis = divmod(rest, 1000)
+    if with_ms:
+        return f"[{minutes:02d}:{seconds:02d}.{millis:03d}]"
+    return f"[{minutes:02d}:{seconds:02d}]"
+
+
+def encode_lrc(lines: Iterable[SyncedLine], with_ms: bool = True) -> str:
+    """Обратное к decode_lrc(keep_timings=True): строки с метками времени."""
+    return "\n".join(
+        f"{format_timestamp(line.time_ms, with_ms)} {line.text}" if line.time_ms is not None else line.text
+        for line in lines
+    )
+
+
+def decode_lrc(lines: Iterable[str], keep_timings: bool = False) -> List[SyncedLine]:
+    """Убирает LRC-метки времени; при keep_timings сохраняет время начала строки."""
+    result: List[SyncedLine] = []
+    for line in lines:
+        clean = LRC_TIMESTAMP_RE.sub("", line).strip()
+        if not clean:
+            continue
+        result.append(SyncedLine(_parse_time_ms(line) if keep_timings else None, clean))
+    return result
@@ -0,0 +1,46 @@
+from typing import Any, Dict, Iterable, Optional
+
+
+def normalize_title(title: Optional[str]) -> str:
+    return " ".join((title or "").casefold().split())
+
+
+class PlaylistTitleIndex:
+    """Индекс плейлистов пользователя: нормализованное название → kind.
+
+    Строится один раз по заголовкам плейлистов и дальше обновляется событиями
+    бота (создание плейлиста) и проверкой актуальности при использовании.
+    """
+
+    def __init__(self):
+        self._kinds: Dict[str, int] = {}
+        self._titles: Dict[int, str] = {}
+
+    def __len__(self) -> int:
+        return len(self._titles)
+
+    def rebuild(self, playlists: Iterable[Any]) -> None:
+        self._kinds.clear()
+        self._titles.clear()
+        for playlist in playlists:
+            kind = getattr(playlist, "kind", None)
+            if kind is not None:
+                self.add(kind, getattr(playlist, "title", None))
+
+    def add(self, kind: int, title: Optional[str]) -> None:
+        self.discard(kind)
+        normalized = normalize_title(title)
+        self._kinds.setdefault(normalized, kind)
+        self._titles[kind] = normalized
+
+    def discard(self, kind: int) -> None:
+        normalized = self._titles.pop(kind, None)
+        if normalized is not None and self._kinds.get(normalized) == kind:
+            del self._kinds[normalized]
+            for other_kind, other_title in self._titles.items():
+                if other_title == normalized:
+                    self._kinds[normalized] = other_kind
+                    break
+
+    def get(self, title: str) -> Optional[int]:
+        return self._kinds.get(normalize_title(title))
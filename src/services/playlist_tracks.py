@@ -0,0 +1,36 @@
+import time
+from typing import Sequence, Tuple
+
+
+class PlaylistTracks:
+    """Открытый пользователем плейлист: только id треков, без объектов треков.
+
+    Полный ответ users_playlists разбирается один раз, после чего хранятся
+    лишь строки вида "track_id:album_id". Сами треки загружаются постранично
+    через кэш треков, поэтому даже плейлист на тысячи треков занимает в
+    памяти немного.
+    """
+
+    __slots__ = ("kind", "title", "revision", "track_ids", "expires_at")
+
+    def __init__(self, kind: int, title: str, revision, track_ids: Sequence[str], ttl: float = 300.0):
+        self.kind = kind
+        self.title = title
+        self.revision = revision
+        self.track_ids: Tuple[str, ...] = tuple(track_ids)
+        self.expires_at = time.monotonic() + ttl
+
+    def __len__(self) -> int:
+        return len(self.track_ids)
+
+    @property
+    def expired(self) -> bool:
+        return time.monotonic() >= self.expires_at
+
+    def window(self, offset: int, limit: int) -> Tuple[int, Tuple[str, ...]]:
+        """Смещение, приведённое к границам плейлиста, и id треков страницы."""
+        limit = max(1, limit)
+        offset = max(0, offset)
+        if offset >= len(self.track_ids):
+            offset = max(0, len(self.track_ids) - 1) // limit * limit
+        return offset, self.track_ids[offset:offset + limit]
@@ -0,0 +1,47 @@
+import time
+from bisect import bisect_left
+from typing import Iterable, List
+
+from .playlist_index import normalize_title
+from .records import PlaylistInfo, PlaylistPage
+
+
+class PlaylistView:
+    """Отсортированный снимок плейлистов пользователя для постраничного просмотра.
+
+    Сортировка (сначала недавно изменённые) выполняется один раз при создании,
+    страницы отдаются срезом по смещению (offset) и размеру (limit). Для поиска
+    по началу названия хранится отсортированный список нормализованных
+    названий с позициями плейлистов в снимке.
+    """
+
+    def __init__(self, playlists: Iterable[PlaylistInfo], ttl: float = 300.0):
+        self.items: List[PlaylistInfo] = sorted(playlists, key=lambda pl: pl.modified or "", reverse=True)
+        self._titles = sorted((normalize_title(pl.title), position) for position, pl in enumerate(self.items))
+        self.expires_at = time.monotonic() + ttl
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    @property
+    def expired(self) -> bool:
+        return time.monotonic() >= self.expires_at
+
+    def page(self, offset: int, limit: int) -> PlaylistPage:
+        limit = max(1, limit)
+        offset = max(0, offset)
+        if offset >= len(self.items):
+            offset = max(0, len(self.items) - 1) // limit * limit
+        return PlaylistPage(tuple(self.items[offset:offset + limit]), offset, limit, len(self.items))
+
+    def search(self, prefix: str) -> List[int]:
+        """Позиции плейлистов, чьё название начинается с prefix, в порядке снимка."""
+        normalized = normalize_title(prefix)
+        if not normalized:
+            return []
+        positions = []
+        for title, position in self._titles[bisect_left(self._titles, (normalized,)):]:
+            if not title.startswith(normalized):
+                break
+            positions.append(position)
+        return sorted(positions)
@@ -0,0 +1,75 @@
+from dataclasses import dataclass
+from typing import Optional, Tuple
+
+
+@dataclass(frozen=True, slots=True)
+class PlaylistInfo:
+    kind: Optional[int]
+    title: str
+    description: Optional[str] = None
+    track_count: int = 0
+    created: Optional[str] = None
+    modified: Optional[str] = None
+    cover: Optional[str] = None
+    owner_login: Optional[str] = None
+
+
+@dataclass(frozen=True, slots=True)
+class TrackSummary:
+    track_id: str
+    title: str
+
+
+@dataclass(frozen=True, slots=True)
+class AddResult:
+    query: str
+    title: Optional[str] = None
+    reason: Optional[str] = None
+
+
+class _Paging:
+    """Общая арифметика страниц для записей со смещением, размером и общим числом."""
+
+    __slots__ = ()
+
+    offset: int
+    limit: int
+    total: int
+
+    @property
+    def page(self) -> int:
+        return self.offset // self.limit
+
+    @property
+    def total_pages(self) -> int:
+        return max(1, -(-self.total // self.limit))
+
+    @property
+    def prev_offset(self) -> Optional[int]:
+        return max(0, self.offset - self.limit) if self.offset > 0 else None
+
+    @property
+    def next_offset(self) -> Optional[int]:
+        return self.offset + self.limit if self.offset + self.limit < self.total else None
+
+    @property
+    def last_offset(self) -> int:
+        return (self.total_pages - 1) * self.limit
+
+
+@dataclass(frozen=True, slots=True)
+class PlaylistPage(_Paging):
+    items: Tuple[PlaylistInfo, ...]
+    offset: int
+    limit: int
+    total: int
+
+
+@dataclass(frozen=True, slots=True)
+class TrackPage(_Paging):
+    kind: int
+    title: str
+    items: Tuple[TrackSummary, ...]
+    offset: int
+    limit: int
+    total: int
@@ -1,14 +1,19 @@
 import logging
 from collections import Counter
 from datetime import datetime, timedelta, timezone
-from typing import Any, Dict, List
+from typing import Any, AsyncIterator, Dict, Iterable, List, Optional, Set, Tuple
 
 from yandex_music import Client
 
 from .helpers_mixin import YandexMusicHelperMixin
+from .listening_history import DAY_SECONDS, ListeningHistory
+from .top_k import SpaceSaving
+from .track_columns import TrackColumns
 
 logger = logging.getLogger(__name__)
 
+TOP_K_CAPACITY = 1000
+
 
 class YandexMusicStatsMixin(YandexMusicHelperMixin):
     async def _get_liked_tracks_count(self, token: str, user_id: int) -> int:
@@ -16,9 +21,7 @@ class YandexMusicStatsMixin(YandexMusicHelperMixin):
             client = self.get_client(token, user_id)
             if client is None:
                 return 0
-            likes = client.users_likes_tracks()
-            tracks = getattr(likes, "tracks", []) or []
-            return len(tracks)
+            return len(self._sync_likes(client, user_id))
         except Exception as e:
             logger.error(f"Ошибка при получении количества понравившихся треков пользователя {user_id}: {e}")
             return 0
@@ -28,107 +31,207 @@ class YandexMusicStatsMixin(YandexMusicHelperMixin):
             client = self.get_client(token, user_id)
             if client is None:
                 return 0
-            likes = client.users_likes_tracks()
-            tracks = getattr(likes, "tracks", []) or []
             threshold = datetime.now(timezone.utc) - timedelta(days=days)
-            count = 0
-            for track_ref in tracks:
-                ts = self._normalize_timestamp(getattr(track_ref, "timestamp", None) or getattr(track_ref, "added", None))
-                if ts and ts >= threshold:
-                    count += 1
-            return count
+            return self._sync_likes(client, user_id).count_since(threshold.timestamp())
         except Exception as e:
             logger.error(f"Ошибка при подсчёте лайков за период у пользователя {user_id}: {e}")
             return 0
 
-    async def _get_top_genres_from_recent(self, token: str, user_id: int, limit: int = 5, days: int = 90) -> List[Dict[str, Any]]:
+    async def _get_top_genres_from_recent(
+        self, token: str, user_id: int, limit: int = 5, days: int = 90, history: Optional[ListeningHistory] = None
+    ) -> List[Dict[str, Any]]:
         try:
-            client = self.get_client(token, user_id)
-            if client is None:
-                return []
-            history_items = self._get_recent_history(client)
-            threshold = datetime.now(timezone.utc) - timedelta(days=days)
-            tracks_with_ts = self._collect_tracks_from_history(client, history_items)
-            counter: Counter = Counter()
-            for track, ts in tracks_with_ts:
-                if ts and ts < threshold:
-                    continue
-                genre = self._extract_genre(track)
-                if genre:
-                    counter[genre] += 1
+            if history is None:
+                client = self.get_client(token, user_id)
+                if client is None:
+                    return []
+                history = self._sync_listening_history(client, user_id)
+            with self._locked():
+                counter = history.top_genres(days)
             return self._to_top_list(counter, limit)
         except Exception as e:
             logger.error(f"Ошибка при получении топа жанров из истории пользователя {user_id}: {e}")
             return []
 
-    async def _get_listening_minutes(self, token: str, user_id: int, days: int = 7) -> int:
+    async def _get_listening_minutes(
+        self, token: str, user_id: int, days: int = 7, history: Optional[ListeningHistory] = None
+    ) -> int:
         try:
-            client = self.get_client(token, user_id)
-            if client is None:
-                return 0
-            history_items = self._get_recent_history(client)
-            threshold = datetime.now(timezone.utc) - timedelta(days=days)
-            tracks_with_ts = self._collect_tracks_from_history(client, history_items)
-            total_ms = 0
-            for track, ts in tracks_with_ts:
-                if ts and ts < threshold:
-                    continue
-                duration_ms = self._extract_duration_ms(track)
-                if duration_ms:
-                    total_ms += duration_ms
-            return int(total_ms / 60000)
+            if history is None:
+                client = self.get_client(token, user_id)
+                if client is None:
+                    return 0
+                history = self._sync_listening_history(client, user_id)
+            with self._locked():
+                return history.minutes(days)
         except Exception as e:
             logger.error(f"Ошибка при вычислении времени прослушивания для пользователя {user_id}: {e}")
             return 0
 
-    async def _get_top_artists(self, token: str, user_id: int, limit: int = 5) -> List[Dict[str, Any]]:
+    async def _get_listening_breakdown(
+        self, token: str, user_id: int, days: int = 7, history: Optional[ListeningHistory] = None
+    ) -> Dict[str, Any]:
+        try:
+            if history is None:
+                client = self.get_client(token, user_id)
+                if client is None:
+                    return {}
+                history = self._sync_listening_history(client, user_id)
+            with self._locked():
+                minutes_by_day = history.minutes_by_day(days)
+            per_day = [
+                {
+                    "date": datetime.fromtimestamp(day * DAY_SECONDS, tz=timezone.utc).date().isoformat(),
+                    "minutes": minutes,
+                }
+                for day, minutes in minutes_by_day
+            ]
+            return {
+                "days": days,
+                "total": await self._get_listening_minutes(token, user_id, days, history=history),
+                "per_day": per_day,
+            }
+        except Exception as e:
+            logger.error(f"Ошибка при вычислении времени прослушивания по дням для пользователя {user_id}: {e}")
+            return {}
+
+    def _load_listening_history(self, user_id: int) -> ListeningHistory:
+        return ListeningHistory()
+
+    def _save_listening_days(self, user_id: int, history: ListeningHistory, days: Set[int]) -> None:
+        pass
+
+    def _get_listening_history(self, user_id: int) -> ListeningHistory:
+        histories = getattr(self, "listening_histories", None)
+        with self._locked():
+            history = histories.get(user_id) if histories is not None else None
+            if history is None:
+                history = self._load_listening_history(user_id)
+                if histories is not None:
+                    histories[user_id] = history
+            return history
+
+    def _track_attributes(self, track: Any) -> Tuple[List[str], Optional[str], int]:
+        """(artists, genre, duration_ms) трека для статистики."""
+        genre = self._extract_genre(track)
+        duration_ms = self._extract_duration_ms(track)
+        return (
+            self._extract_artists(track),
+            genre if isinstance(genre, str) else None,
+            duration_ms if isinstance(duration_ms, int) else 0,
+        )
+
+    def _append_tracks(self, columns: TrackColumns, tracks: Iterable[Any]) -> None:
+        for track in tracks:
+            artists, genre, duration_ms = self._track_attributes(track)
+            columns.append(artists, genre, duration_ms, key=self._track_key(track))
+
+    def _sync_listening_history(self, client: Client, user_id: int) -> ListeningHistory:
+        history = self._get_listening_history(user_id)
+        history_items = self._get_recent_history(client)
+        plays = []
+        for track, ts in self._collect_tracks_from_history(client, history_items):
+            if ts is not None:
+                artists, genre, duration_ms = self._track_attributes(track)
+                plays.append((ts.timestamp(), self._track_key(track), duration_ms, artists, genre))
+        plays.sort(key=lambda play: play[0])
+        with self._locked():
+            changed = history.extend(plays)
+            if changed:
+                self._save_listening_days(user_id, history, changed)
+            logger.info(f"История прослушиваний пользователя {user_id}: обновлено дней {len(changed)}")
+        return history
+
+    async def _get_top_artists(
+        self,
+        token: str,
+        user_id: int,
+        limit: int = 5,
+        days: int = 90,
+        history: Optional[ListeningHistory] = None,
+        library: Optional[TrackColumns] = None,
+    ) -> List[Dict[str, Any]]:
+        """Топ артистов по истории прослушиваний; при пустой истории - по лайкам.
+
+        Если передан уже собранный снимок библиотеки, лайкнутые треки берутся
+        из него, иначе загружаются заново.
+        """
         try:
             client = self.get_client(token, user_id)
             if client is None:
                 return []
 
-            history_items = self._get_recent_history(client)
-            tracks_with_ts = self._collect_tracks_from_history(client, history_items)
-            counter: Counter = Counter()
-            for track, _ in tracks_with_ts:
-                for artist_name in self._extract_artists(track):
-                    counter[artist_name] += 1
-
-            if not counter:
-                likes = client.users_likes_tracks()
-                liked_full_tracks = self._fetch_tracks(client, getattr(likes, "tracks", []) or [])
-                for track in liked_full_tracks:
-                    for artist_name in self._extract_artists(track):
-                        counter[artist_name] += 1
-            return self._to_top_list(counter, limit)
+            if history is None:
+                history = self._sync_listening_history(client, user_id)
+            with self._locked():
+                counter = history.top_artists(days)
+            if counter:
+                return self._to_top_list(counter, limit)
+
+            likes = self._sync_likes(client, user_id)
+            if library is not None and len(library):
+                liked = {self._track_key(ref) for ref in likes}
+                rows = [row for row, key in enumerate(library.keys) if key in liked]
+                return self._to_top_list(library.artist_counts(rows), limit)
+
+            columns = TrackColumns()
+            for chunk in self._iter_fetch_tracks(client, likes):
+                self._index_tracks(user_id, chunk)
+                self._append_tracks(columns, chunk)
+            return self._to_top_list(columns.artist_counts(), limit)
         except Exception as e:
             logger.error(f"Ошибка при получении топа артистов пользователя {user_id}: {e}")
             return []
 
-    async def _get_top_genres_from_library(self, token: str, user_id: int, limit: int = 5) -> List[Dict[str, Any]]:
+    async def _get_top_genres_from_library(
+        self, token: str, user_id: int, limit: int = 5, unique: bool = False
+    ) -> List[Dict[str, Any]]:
+        result: List[Dict[str, Any]] = []
+        async for result in self._iter_top_genres_from_library(token, user_id, limit, unique):
+            pass
+        return result
+
+    async def _iter_top_genres_from_library(
+        self, token: str, user_id: int, limit: int = 5, unique: bool = False, library: Optional[TrackColumns] = None
+    ) -> AsyncIterator[List[Dict[str, Any]]]:
+        """Топ жанров по лайкам и плейлистам с промежуточной выдачей после каждого чанка.
+
+        Ссылки дедуплицируются по id трека до гидрации, поэтому каждый трек
+        загружается один раз. При unique=False трек учитывается столько раз,
+        сколько раз он встречается в библиотеке (лайк + каждый плейлист).
+        Загруженные треки дописываются в library, чтобы другие разделы
+        статистики могли использовать снимок без повторной загрузки.
+        """
         try:
             client = self.get_client(token, user_id)
             if client is None:
-                return []
+                return
 
-            counter: Counter = Counter()
-            likes = client.users_likes_tracks()
-            liked_tracks = self._fetch_tracks(client, getattr(likes, "tracks", []) or [])
-            for track in liked_tracks:
-                genre = self._extract_genre(track)
-                if genre:
-                    counter[genre] += 1
-
-            uid = self._get_account_uid(client)
+            refs = list(self._sync_likes(client, user_id))
+            uid = self._get_user_uid(client, user_id)
             if uid is not None:
-                playlist_tracks = self._get_playlist_tracks(client, uid)
-                for track in playlist_tracks:
-                    genre = self._extract_genre(track)
-                    if genre:
-                        counter[genre] += 1
+                refs.extend(self._get_playlist_track_refs(client, uid))
 
-            return self._to_top_list(counter, limit)
+            weights: Counter = Counter()
+            unique_refs: Dict[str, Any] = {}
+            for ref in refs:
+                key = self._track_key(ref)
+                if key is None:
+                    continue
+                weights[key] += 1
+                unique_refs.setdefault(key, ref)
+            logger.info(f"Библиотека пользователя {user_id}: {len(refs)} ссылок, {len(unique_refs)} уникальных треков")
+
+            columns = library if library is not None else TrackColumns()
+            top = SpaceSaving(TOP_K_CAPACITY)
+            for chunk in self._iter_fetch_tracks(client, unique_refs.values()):
+                self._index_tracks(user_id, chunk)
+                start = len(columns)
+                self._append_tracks(columns, chunk)
+                chunk_weights = None if unique else [weights.get(key, 1) for key in columns.keys[start:]]
+                top.update(columns.genre_counts(chunk_weights, start=start))
+                yield self._to_top_list(top, limit)
+
+            yield self._to_top_list(top, limit)
         except Exception as e:
             logger.error(f"Ошибка при получении топа жанров библиотеки пользователя {user_id}: {e}")
-            return []
-
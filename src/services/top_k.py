@@ -0,0 +1,72 @@
+import heapq
+from typing import Dict, Hashable, Iterable, List, Mapping, Tuple, Union
+
+
+class SpaceSaving:
+    """Потоковый топ-K по алгоритму Space-Saving.
+
+    Хранит не больше capacity счётчиков. Пока различных элементов не больше
+    capacity, счёт точный; после этого новый элемент вытесняет элемент
+    с минимальным счётом и наследует его значение (ошибка записывается
+    в errors). Элементы, чья реальная частота выше total / capacity,
+    гарантированно остаются в топе.
+    """
+
+    def __init__(self, capacity: int = 1000):
+        if capacity < 1:
+            raise ValueError("capacity должна быть положительной")
+        self.capacity = capacity
+        self.total = 0
+        self.counts: Dict[Hashable, int] = {}
+        self.errors: Dict[Hashable, int] = {}
+        self._heap: List[Tuple[int, int, Hashable]] = []
+        self._sequence = 0
+
+    def __len__(self) -> int:
+        return len(self.counts)
+
+    @property
+    def exact(self) -> bool:
+        return not any(self.errors.values())
+
+    def _push(self, item: Hashable) -> None:
+        self._sequence += 1
+        heapq.heappush(self._heap, (self.counts[item], self._sequence, item))
+        if len(self._heap) > 4 * self.capacity:
+            self._heap = []
+            for key, count in self.counts.items():
+                self._sequence += 1
+                self._heap.append((count, self._sequence, key))
+            heapq.heapify(self._heap)
+
+    def _pop_min(self) -> Tuple[Hashable, int]:
+        while True:
+            count, _, item = heapq.heappop(self._heap)
+            if self.counts.get(item) == count:
+                return item, count
+
+    def add(self, item: Hashable, count: int = 1) -> None:
+        self.total += count
+        if item in self.counts:
+            self.counts[item] += count
+        elif len(self.counts) < self.capacity:
+            self.counts[item] = count
+            self.errors[item] = 0
+        else:
+            evicted, floor = self._pop_min()
+            del self.counts[evicted]
+            del self.errors[evicted]
+            self.counts[item] = floor + count
+            self.errors[item] = floor
+        self._push(item)
+
+    def update(self, items: Union[Mapping[Hashable, int], Iterable[Hashable]]) -> None:
+        if isinstance(items, Mapping):
+            for item, count in items.items():
+                self.add(item, count)
+        else:
+            for item in items:
+                self.add(item)
+
+    def most_common(self, limit: int) -> List[Tuple[Hashable, int]]:
+        return heapq.nlargest(limit, self.counts.items(), key=lambda pair: pair[1])
@@ -0,0 +1,40 @@
+import threading
+from collections import OrderedDict
+from typing import Any, Optional
+
+
+class TrackCache:
+    """LRU-кэш загруженных треков по id, общий для всех пользователей.
+
+    Кэшем одновременно пользуются задачи из потоков очереди и основной
+    event loop, поэтому все операции выполняются под замком.
+    """
+
+    def __init__(self, max_size: int = 10000):
+        self.max_size = max_size
+        self._tracks: "OrderedDict[str, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._tracks)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._tracks
+
+    def get(self, key: Optional[str]) -> Optional[Any]:
+        if key is None:
+            return None
+        with self._lock:
+            track = self._tracks.get(key)
+            if track is not None:
+                self._tracks.move_to_end(key)
+            return track
+
+    def put(self, key: Optional[str], track: Any) -> None:
+        if key is None or track is None:
+            return
+        with self._lock:
+            self._tracks[key] = track
+            self._tracks.move_to_end(key)
+            while len(self._tracks) > self.max_size:
+                self._tracks.popitem(last=False)
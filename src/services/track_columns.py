@@ -0,0 +1,103 @@
+import math
+from array import array
+from collections import Counter
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+NO_GENRE = -1
+
+
+class Interner:
+    """Сопоставляет строкам последовательные целочисленные id."""
+
+    def __init__(self):
+        self._ids: Dict[str, int] = {}
+        self.names: List[str] = []
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def intern(self, name: str) -> int:
+        item_id = self._ids.get(name)
+        if item_id is None:
+            item_id = self._ids[name] = len(self.names)
+            self.names.append(name)
+        return item_id
+
+
+class TrackColumns:
+    """Колоночное представление снимка треков для агрегации статистики.
+
+    Атрибуты треков извлекаются один раз при добавлении; дальше подсчёты идут
+    по компактным массивам целых чисел. Артисты трека хранятся подряд в
+    artist_ids, границы строк — в artist_offsets (как в CSR-матрице).
+    В keys хранится id трека строки, чтобы выбирать подмножество строк
+    (например, только лайкнутые) без повторного чтения треков.
+    """
+
+    def __init__(self):
+        self.artists = Interner()
+        self.genres = Interner()
+        self.genre_ids = array("i")
+        self.duration_ms = array("q")
+        self.timestamps = array("d")
+        self.artist_offsets = array("i", [0])
+        self.artist_ids = array("i")
+        self.keys: List[Optional[str]] = []
+
+    def __len__(self) -> int:
+        return len(self.genre_ids)
+
+    def append(
+        self,
+        artists: Iterable[str],
+        genre: Optional[str],
+        duration_ms: Optional[int],
+        timestamp: Optional[float] = None,
+        key: Optional[str] = None,
+    ) -> None:
+        self.artist_ids.extend(self.artists.intern(name) for name in artists)
+        self.artist_offsets.append(len(self.artist_ids))
+        self.genre_ids.append(self.genres.intern(genre) if genre else NO_GENRE)
+        self.duration_ms.append(duration_ms or 0)
+        self.timestamps.append(math.nan if timestamp is None else timestamp)
+        self.keys.append(key)
+
+    def _bincount(self, ids: Iterable[int], names: List[str], weights: Optional[Sequence[int]] = None) -> Counter:
+        if weights is None:
+            counts = Counter(ids)
+        else:
+            counts = Counter()
+            for item_id, weight in zip(ids, weights):
+                counts[item_id] += weight
+        counts.pop(NO_GENRE, None)
+        return Counter({names[item_id]: count for item_id, count in counts.items()})
+
+    def genre_counts(self, weights: Optional[Sequence[int]] = None, start: int = 0) -> Counter:
+        """Число треков по жанрам в строках с start; weights задаёт вес каждой из них (по умолчанию 1)."""
+        return self._bincount(self.genre_ids[start:], self.genres.names, weights)
+
+    def artist_counts(self, rows: Optional[Iterable[int]] = None) -> Counter:
+        """Число треков по артистам во всех строках или только в rows."""
+        if rows is None:
+            return self._bincount(self.artist_ids, self.artists.names)
+        offsets = self.artist_offsets
+        ids = (self.artist_ids[i] for row in rows for i in range(offsets[row], offsets[row + 1]))
+        return self._bincount(ids, self.artists.names)
+
+    def total_duration_ms(self) -> int:
+        return sum(self.duration_ms)
+
+    def rows(self) -> Iterator[Tuple[Optional[float], int, List[str], Optional[str]]]:
+        """Строки снимка в виде (timestamp, duration_ms, artists, genre)."""
+        artist_names = self.artists.names
+        genre_names = self.genres.names
+        offsets = self.artist_offsets
+        for row in range(len(self)):
+            timestamp = self.timestamps[row]
+            genre_id = self.genre_ids[row]
+            yield (
+                None if math.isnan(timestamp) else timestamp,
+                self.duration_ms[row],
+                [artist_names[i] for i in self.artist_ids[offsets[row]:offsets[row + 1]]],
+                None if genre_id == NO_GENRE else genre_names[genre_id],
+            )
@@ -0,0 +1,148 @@
+import re
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+_TOKEN_RE = re.compile(r"\w+")
+
+
+class IndexedTrack(NamedTuple):
+    track_id: int
+    album_id: int
+    title: str
+    artists: Tuple[str, ...]
+
+
+def tokenize(text: str) -> List[str]:
+    return _TOKEN_RE.findall((text or "").casefold().replace("ё", "е"))
+
+
+def _trigrams(token: str) -> Set[str]:
+    padded = f"  {token} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class TrackSearchIndex:
+    """Инвертированный индекс треков пользователя: токен → id треков.
+
+    Точные совпадения ищутся по словарю токенов, опечатки — через
+    триграммный индекс словаря. Нечёткое совпадение легко находит похожий,
+    но другой трек ("hello" → "hells"), поэтому search умеет требовать, чтобы
+    заданная доля токенов запроса совпала точно.
+    """
+
+    def __init__(self, fuzzy_threshold: float = 0.5):
+        self.fuzzy_threshold = fuzzy_threshold
+        self._tracks: Dict[int, IndexedTrack] = {}
+        self._doc_tokens: Dict[int, Set[str]] = {}
+        self._postings: Dict[str, Set[int]] = {}
+        self._trigram_postings: Dict[str, Set[str]] = {}
+
+    def __len__(self) -> int:
+        return len(self._tracks)
+
+    def __contains__(self, track_id: int) -> bool:
+        return track_id in self._tracks
+
+    def add(self, track: Any) -> Optional[IndexedTrack]:
+        record = self._to_record(track)
+        if record is None:
+            return None
+        if record.track_id in self._tracks:
+            self._tracks[record.track_id] = record
+            return record
+
+        tokens = set(tokenize(record.title))
+        for artist in record.artists:
+            tokens.update(tokenize(artist))
+        if not tokens:
+            return None
+
+        self._tracks[record.track_id] = record
+        self._doc_tokens[record.track_id] = tokens
+        for token in tokens:
+            postings = self._postings.get(token)
+            if postings is None:
+                postings = self._postings[token] = set()
+                for gram in _trigrams(token):
+                    self._trigram_postings.setdefault(gram, set()).add(token)
+            postings.add(record.track_id)
+        return record
+
+    def add_many(self, tracks: Iterable[Any]) -> int:
+        added = 0
+        for track in tracks:
+            if self.add(track) is not None:
+                added += 1
+        return added
+
+    def search(self, query: str, min_exact_share: float = 0.0) -> Optional[IndexedTrack]:
+        """Лучший трек по запросу; None, если точно совпало меньше min_exact_share токенов запроса."""
+        query_tokens = set(tokenize(query))
+        if not query_tokens or not self._tracks:
+            return None
+
+        exact_tokens = sum(1 for token in query_tokens if self._postings.get(token))
+        if exact_tokens / len(query_tokens) < min_exact_share:
+            return None
+
+        candidates: Optional[Set[int]] = None
+        for token in query_tokens:
+            matched = self._match_token(token)
+            if not matched:
+                return None
+            candidates = matched if candidates is None else candidates & matched
+            if not candidates:
+                return None
+
+        # Предпочитаем трек, у которого запрос покрывает наибольшую долю токенов
+        best_id = max(
+            candidates,
+            key=lambda tid: (len(query_tokens & self._doc_tokens[tid]) / len(self._doc_tokens[tid]), -tid),
+        )
+        return self._tracks[best_id]
+
+    def _match_token(self, token: str) -> Set[int]:
+        exact = self._postings.get(token)
+        if exact:
+            return exact
+        if len(token) < 3:
+            return set()
+
+        grams = _trigrams(token)
+        overlap: Dict[str, int] = {}
+        for gram in grams:
+            for candidate in self._trigram_postings.get(gram, ()):
+                overlap[candidate] = overlap.get(candidate, 0) + 1
+
+        matched: Set[int] = set()
+        for candidate, common in overlap.items():
+            similarity = 2 * common / (len(grams) + len(_trigrams(candidate)))
+            if similarity >= self.fuzzy_threshold:
+                matched |= self._postings[candidate]
+        return matched
+
+    @staticmethod
+    def _to_record(track: Any) -> Optional[IndexedTrack]:
+        if isinstance(track, IndexedTrack):
+            return track
+        track_id = getattr(track, "id", None)
+        title = getattr(track, "title", None)
+        if track_id is None or not isinstance(title, str):
+            return None
+        try:
+            track_id = int(track_id)
+        except (TypeError, ValueError):
+            return None
+
+        albums = getattr(track, "albums", None) or []
+        album_id = getattr(albums[0], "id", None) if albums else None
+        try:
+            album_id = int(album_id) if album_id is not None else 0
+        except (TypeError, ValueError):
+            album_id = 0
+
+        artists = tuple(
+            name
+            for name in (getattr(a, "name", None) for a in getattr(track, "artists", None) or [])
+            if isinstance(name, str) and name
+        )
+        return IndexedTrack(track_id, album_id, title, artists)
@@ -1,31 +1,122 @@
 import logging
-from typing import Any, Dict, List, Optional, Tuple
+import threading
+from typing import Any, AsyncIterator, Dict, List, Optional, Set, Tuple
 
 from yandex_music import Client
 
+from ..database.storage import (
+    get_cached_lyrics,
+    get_listening_days,
+    get_uid,
+    save_listening_days,
+    set_cached_lyrics,
+    set_uid,
+)
 from .helpers_mixin import YandexMusicHelperMixin
+from .likes_store import LikesStore
+from .listening_history import ListeningHistory
+from .lyrics_decoder import SyncedLine, decode_lrc, encode_lrc, iter_response_lines
+from .playlist_index import PlaylistTitleIndex
+from .playlist_tracks import PlaylistTracks
+from .playlist_view import PlaylistView
+from .records import AddResult, PlaylistInfo, PlaylistPage, TrackPage, TrackSummary
 from .stats_mixin import YandexMusicStatsMixin
+from .track_cache import TrackCache
+from .track_columns import TrackColumns
+from .track_index import TrackSearchIndex
 import requests
 logger = logging.getLogger(__name__)
 
+PLAYLIST_VIEW_TTL = 300.0
+
 class YandexMusicService(YandexMusicStatsMixin, YandexMusicHelperMixin):
     def __init__(self):
         self.clients: Dict[int, Client] = {}
+        self.track_indexes: Dict[int, TrackSearchIndex] = {}
+        self.likes_stores: Dict[int, LikesStore] = {}
+        self.listening_histories: Dict[int, ListeningHistory] = {}
+        self.track_cache = TrackCache()
+        self.playlist_indexes: Dict[int, PlaylistTitleIndex] = {}
+        self.account_uids: Dict[int, int] = {}
+        self.playlist_views: Dict[int, PlaylistView] = {}
+        self.open_playlists: Dict[int, PlaylistTracks] = {}
+        # Сервисом пользуются задачи из потоков JobQueue и основной event loop:
+        # состояние пользователей меняется только под этим замком, сетевые
+        # вызовы выполняются вне его.
+        self.state_lock = threading.RLock()
 
     def get_client(self, token: str, user_id: int) -> Optional[Client]:
         try:
-            if user_id in self.clients:
-                return self.clients[user_id]
+            with self.state_lock:
+                client = self.clients.get(user_id)
+                if client is not None:
+                    return client
 
-            client = Client(token)
-            self.clients[user_id] = client
+                client = Client(token)
+                self.clients[user_id] = client
             logger.info(f"Создан новый клиент для пользователя {user_id}")
             return client
         except Exception as e:
             logger.error(f"Ошибка при создании клиента для пользователя {user_id}: {e}")
             return None
 
-    async def get_user_playlists(self, token: str, user_id: int) -> List[Dict[str, Any]]:
+    def register_client(self, user_id: int, client: Client) -> None:
+        """Положить в пул уже инициализированный клиент вместе с данными аккаунта."""
+        account = getattr(getattr(client, "me", None), "account", None)
+        with self.state_lock:
+            self.forget_user(user_id)
+            self.clients[user_id] = client
+            self.remember_account_uid(user_id, getattr(account, "uid", None))
+        logger.info(f"Клиент пользователя {user_id} добавлен в пул после авторизации")
+
+    def forget_user(self, user_id: int) -> None:
+        """Сбросить клиент и все данные пользователя, закэшированные в памяти."""
+        with self.state_lock:
+            for cache in (
+                self.clients,
+                self.account_uids,
+                self.track_indexes,
+                self.likes_stores,
+                self.listening_histories,
+                self.playlist_indexes,
+                self.playlist_views,
+                self.open_playlists,
+            ):
+                cache.pop(user_id, None)
+
+    def remember_account_uid(self, user_id: int, uid: Optional[int]) -> None:
+        if uid is None:
+            self.account_uids.pop(user_id, None)
+        else:
+            self.account_uids[user_id] = uid
+
+    def _load_account_uid(self, user_id: int) -> Optional[int]:
+        try:
+            return get_uid(user_id)
+        except Exception as e:
+            logger.error(f"Не удалось загрузить uid пользователя {user_id}: {e}")
+            return None
+
+    def _save_account_uid(self, user_id: int, uid: int) -> None:
+        try:
+            set_uid(user_id, uid)
+        except Exception as e:
+            logger.error(f"Не удалось сохранить uid пользователя {user_id}: {e}")
+
+    def _load_listening_history(self, user_id: int) -> ListeningHistory:
+        try:
+            return ListeningHistory.from_dict(get_listening_days(user_id))
+        except Exception as e:
+            logger.error(f"Не удалось загрузить историю прослушиваний пользователя {user_id}: {e}")
+            return ListeningHistory()
+
+    def _save_listening_days(self, user_id: int, history: ListeningHistory, days: Set[int]) -> None:
+        try:
+            save_listening_days(user_id, history.to_dict(days))
+        except Exception as e:
+            logger.error(f"Не удалось сохранить историю прослушиваний пользователя {user_id}: {e}")
+
+    async def get_user_playlists(self, token: str, user_id: int) -> List[PlaylistInfo]:
         from datetime import datetime
         from typing import Optional, Any, List, Dict
         
@@ -51,7 +142,7 @@ class YandexMusicService(YandexMusicStatsMixin, YandexMusicHelperMixin):
 
             playlists = client.users_playlists_list() or []
 
-            result: List[Dict[str, Any]] = []
+            result: List[PlaylistInfo] = []
             for pl in playlists:
                 created_raw = getattr(pl, "created", None) if hasattr(pl, "created") else None
                 modified_raw = getattr(pl, "modified", None) if hasattr(pl, "modified") else None
@@ -62,22 +153,22 @@ class YandexMusicService(YandexMusicStatsMixin, YandexMusicHelperMixin):
                 created = created_dt.isoformat() if created_dt else None
                 modified = modified_dt.isoformat() if modified_dt else None
 
-                info = {
-                    "kind": getattr(pl, "kind", None),
-                    "title": getattr(pl, "title", None) or "Без названия",
-                    "description": getattr(pl, "description", None)
+                info = PlaylistInfo(
+                    kind=getattr(pl, "kind", None),
+                    title=getattr(pl, "title", None) or "Без названия",
+                    description=getattr(pl, "description", None)
                     if hasattr(pl, "description")
                     else None,
-                    "track_count": getattr(pl, "track_count", None)
+                    track_count=getattr(pl, "track_count", None)
                     if hasattr(pl, "track_count")
                     else 0,
-                    "created": created,
-                    "modified": modified,
-                    "cover": pl.cover.uri
+                    created=created,
+                    modified=modified,
+                    cover=pl.cover.uri
                     if hasattr(pl, "cover") and getattr(pl, "cover", None)
                     else None,
-                    "owner_login": getattr(getattr(pl, "owner", None), "login", None),
-                }
+                    owner_login=getattr(getattr(pl, "owner", None), "login", None),
+                )
                 result.append(info)
 
             logger.info(f"Получено {len(result)} плейлистов для пользователя {user_id}")
@@ -87,8 +178,108 @@ class YandexMusicService(YandexMusicStatsMixin, YandexMusicHelperMixin):
             logger.error(f"Ошибка при получении плейлистов для пользователя {user_id}: {e}")
             return []
 
+    async def get_playlist_view(self, token: str, user_id: int, refresh: bool = False) -> Optional[PlaylistView]:
+        view = self.playlist_views.get(user_id)
+        if view is not None and not refresh and not view.expired:
+            return view
+
+        playlists = await self.get_user_playlists(token, user_id)
+        if not playlists:
+            self.playlist_views.pop(user_id, None)
+            return None
+        view = PlaylistView(playlists, ttl=PLAYLIST_VIEW_TTL)
+        self.playlist_views[user_id] = view
+        return view
+
+    async def get_playlists_page(
+        self,
+        token: str,
+        user_id: int,
+        offset: int = 0,
+        limit: int = 5,
+        refresh: bool = False,
+    ) -> Optional[PlaylistPage]:
+        """Страница плейлистов, начиная с позиции offset, из закэшированного снимка."""
+        view = await self.get_playlist_view(token, user_id, refresh)
+        return view.page(offset, limit) if view is not None else None
+
+    async def search_playlists(self, token: str, user_id: int, prefix: str) -> List[int]:
+        """Позиции (offset) плейлистов, чьё название начинается с prefix."""
+        view = await self.get_playlist_view(token, user_id)
+        return view.search(prefix) if view is not None else []
+
+    async def get_playlist_tracks_page(
+        self,
+        token: str,
+        user_id: int,
+        kind: int,
+        offset: int = 0,
+        limit: int = 10,
+        refresh: bool = False,
+    ) -> Optional[TrackPage]:
+        """Страница треков плейлиста: загружаются только треки этой страницы.
+
+        Список id треков открытого плейлиста хранится для пользователя
+        (по одному плейлисту), сами треки берутся из кэша или запрашиваются
+        одним вызовом tracks на страницу.
+        """
+        try:
+            client = self.get_client(token, user_id)
+            if client is None:
+                return None
+
+            tracks = self.open_playlists.get(user_id)
+            if refresh or tracks is None or tracks.kind != kind or tracks.expired:
+                tracks = self._load_playlist_tracks(client, user_id, kind, preload=offset + limit)
+                if tracks is None:
+                    logger.error(f"Плейлист {kind} пользователя {user_id} не найден")
+                    return None
+                self.open_playlists[user_id] = tracks
+
+            offset, track_ids = tracks.window(offset, limit)
+            loaded = {self._track_key(track): track for track in self._hydrate_tracks(client, track_ids)}
+            items = []
+            for track_id in track_ids:
+                track = loaded.get(self._track_key(track_id))
+                title = self._format_track_title(track) if track is not None else "Трек недоступен"
+                items.append(TrackSummary(track_id, title))
+            return TrackPage(kind, tracks.title, tuple(items), offset, limit, len(tracks))
+        except Exception as e:
+            logger.error(f"Ошибка при получении треков плейлиста {kind} пользователя {user_id}: {e}")
+            return None
+
+    async def get_track_title(self, token: str, user_id: int, track_id: str) -> Optional[str]:
+        """Название трека «Исполнитель - Трек» по id; повторные запросы обслуживает кэш треков."""
+        try:
+            client = self.get_client(token, user_id)
+            if client is None:
+                return None
+            tracks = self._hydrate_tracks(client, [track_id])
+            return self._format_track_title(tracks[0], "Неизвестный исполнитель") if tracks else None
+        except Exception as e:
+            logger.error(f"Ошибка при получении названия трека {track_id}: {e}")
+            return None
+
     async def get_song_lyrics(self, token: str, userid: int, track_id: str) -> Optional[str]:
         logger.info(f"get_song_lyrics: START user={userid}, track_id={track_id}")
+        cache_key = str(track_id).split(":", 1)[0]
+        try:
+            cached = get_cached_lyrics(cache_key)
+            if cached is not None:
+                logger.info(f"get_song_lyrics: served from cache, track_id={track_id}")
+                return cached
+        except Exception as e_cache:
+            logger.warning(f"get_song_lyrics: cache read failed: {e_cache}")
+
+        lyrics = await self._fetch_song_lyrics(token, userid, track_id)
+        if lyrics:
+            try:
+                set_cached_lyrics(cache_key, lyrics)
+            except Exception as e_cache:
+                logger.warning(f"get_song_lyrics: cache write failed: {e_cache}")
+        return lyrics
+
+    async def _fetch_song_lyrics(self, token: str, userid: int, track_id: str) -> Optional[str]:
         try:
             client = self.get_client(token, userid)
             if client is None:
@@ -126,32 +317,11 @@ class YandexMusicService(YandexMusicStatsMixin, YandexMusicHelperMixin):
                 lyrics_obj, "downloadUrl", None
             )
             if download_url:
-                logger.info(f"get_song_lyrics: downloading from {download_url}")
-                try:
-                    resp = requests.get(download_url, timeout=10)
-                    resp.raise_for_status()
-                    text_raw = resp.text
-
-                    import re
-                    lines = []
-                    for line in text_raw.splitlines():
-                        clean = re.sub(r"\[[0-9:\.\-]+\]", "", line).strip()
-                        if clean:
-                            lines.append(clean)
-
-                    if lines:
-                        text_clean = "\n".join(lines)
-                        logger.info(f"get_song_lyrics: downloaded lyrics len={len(text_clean)}")
-                        return text_clean
-
-                    if text_raw.strip():
-                        logger.info(
-                            f"get_song_lyrics: raw downloaded lyrics used, len={len(text_raw)}"
-                        )
-                        return text_raw.strip()
-
-                except Exception as e_dl:
-                    logger.error(f"get_song_lyrics: download_url request failed: {e_dl}")
+                lines = self._download_lyrics(download_url)
+                if lines:
+                    text_clean = "\n".join(line.text for line in lines)
+                    logger.info(f"get_song_lyrics: downloaded lyrics len={len(text_clean)}")
+                    return text_clean
 
             logger.warning(f"get_song_lyrics: no text available for {track_id}")
             return None
@@ -160,13 +330,61 @@ class YandexMusicService(YandexMusicStatsMixin, YandexMusicHelperMixin):
             logger.error(f"get_song_lyrics: id={track_id} error: {e}", exc_info=True)
             return None
 
+    def _download_lyrics(self, download_url: str, keep_timings: bool = False) -> List[SyncedLine]:
+        logger.info(f"get_song_lyrics: downloading from {download_url}")
+        try:
+            with requests.get(download_url, timeout=10, stream=True) as resp:
+                resp.raise_for_status()
+                return decode_lrc(iter_response_lines(resp), keep_timings=keep_timings)
+        except Exception as e_dl:
+            logger.error(f"get_song_lyrics: download_url request failed: {e_dl}")
+            return []
+
+    async def get_synced_lyrics(self, token: str, user_id: int, track_id: str) -> List[SyncedLine]:
+        """Строки синхронизированного текста с временем начала; кэшируются как LRC."""
+        cache_key = f"{str(track_id).split(':', 1)[0]}:lrc"
+        try:
+            cached = get_cached_lyrics(cache_key)
+            if cached is not None:
+                return decode_lrc(cached.split("\n"), keep_timings=True)
+        except Exception as e_cache:
+            logger.warning(f"get_synced_lyrics: cache read failed: {e_cache}")
+
+        lines = await self._fetch_synced_lyrics(token, user_id, track_id)
+        if lines:
+            try:
+                set_cached_lyrics(cache_key, encode_lrc(lines))
+            except Exception as e_cache:
+                logger.warning(f"get_synced_lyrics: cache write failed: {e_cache}")
+        return lines
+
+    async def _fetch_synced_lyrics(self, token: str, user_id: int, track_id: str) -> List[SyncedLine]:
+        try:
+            client = self.get_client(token, user_id)
+            if client is None:
+                return []
+
+            tracks = client.tracks([track_id])
+            if not tracks:
+                return []
+
+            lyrics_obj = tracks[0].get_lyrics(format="LRC")
+            download_url = getattr(lyrics_obj, "download_url", None) if lyrics_obj else None
+            if not download_url:
+                logger.info(f"get_synced_lyrics: no synced lyrics for {track_id}")
+                return []
+            return self._download_lyrics(download_url, keep_timings=True)
+        except Exception as e:
+            logger.error(f"get_synced_lyrics: id={track_id} error: {e}")
+            return []
+
     async def create_playlist(self, token: str, user_id: int, title: str, tracks: Optional[List[str]] = None) -> Optional[Dict[str, Any]]:
         try:
             client = self.get_client(token, user_id)
             if client is None:
                 return None
 
-            account_uid = self._get_account_uid(client)
+            account_uid = self._get_user_uid(client, user_id)
             if account_uid is None:
                 logger.error(f"Не удалось определить uid для пользователя {user_id}")
                 return None
@@ -175,6 +393,8 @@ class YandexMusicService(YandexMusicStatsMixin, YandexMusicHelperMixin):
             if playlist is None:
                 logger.error(f"Не удалось создать плейлист '{title}' для пользователя {user_id}")
                 return None
+            self._index_playlist(user_id, playlist)
+            self.playlist_views.pop(user_id, None)
 
             if tracks:
                 added = 0
@@ -198,43 +418,50 @@ class YandexMusicService(YandexMusicStatsMixin, YandexMusicHelperMixin):
             return None
 
     async def add_tracks_by_name(
-    self,
-    token: str,
-    user_id: int,
-    playlist_title: str,
-    track_names: List[str],
-) -> Dict[str, Any]:
-        result: Dict[str, Any] = {"added": [], "failed": []}
-
+        self,
+        token: str,
+        user_id: int,
+        playlist_title: str,
+        track_names: List[str],
+    ) -> Dict[str, List[AddResult]]:
+        result: Dict[str, List[AddResult]] = {"added": [], "failed": []}
+        async for status, item in self.iter_add_tracks_by_name(token, user_id, playlist_title, track_names):
+            result[status].append(item)
+        return result
+
+    async def iter_add_tracks_by_name(
+        self,
+        token: str,
+        user_id: int,
+        playlist_title: str,
+        track_names: List[str],
+    ) -> AsyncIterator[Tuple[str, AddResult]]:
         try:
             client = self.get_client(token, user_id)
             if client is None:
-                return result
-
-            playlists = client.users_playlists_list() or []
-            playlist = None
-            for pl in playlists:
-                if getattr(pl, "title", "").lower() == playlist_title.lower():
-                    playlist = pl
-                    break
+                return
 
+            playlist = self._resolve_playlist(client, user_id, playlist_title)
             if playlist is None:
                 playlist = client.users_playlists_create(playlist_title)
+                self._index_playlist(user_id, playlist)
 
             kind = getattr(playlist, "kind", None)
             if kind is None:
                 logger.error(f"add_tracks_by_name: kind is None for playlist '{playlist_title}'")
-                return result
+                return
+            self.playlist_views.pop(user_id, None)
+            self.open_playlists.pop(user_id, None)
 
             for raw_query in track_names:
                 query = (raw_query or "").strip()
                 if not query:
-                    result["failed"].append({"query": raw_query, "reason": "empty"})
+                    yield "failed", AddResult(raw_query, reason="empty")
                     continue
 
-                pair = self._soft_find_track(client, query)
+                pair = self._soft_find_track(client, query, user_id)
                 if pair is None:
-                    result["failed"].append({"query": raw_query, "reason": "not_found"})
+                    yield "failed", AddResult(raw_query, reason="not_found")
                     continue
 
                 track_obj, track_id, album_id = pair
@@ -244,31 +471,24 @@ class YandexMusicService(YandexMusicStatsMixin, YandexMusicHelperMixin):
                         playlist.insert_tracks([(track_id, album_id)])
                     except AttributeError:
                         playlist.insert_track(track_id, album_id)
-
-                    artist_name = (
-                        track_obj.artists[0].name
-                        if getattr(track_obj, "artists", None)
-                        else "Unknown"
-                    )
-                    title = f"{artist_name} - {track_obj.title}"
-                    result["added"].append({"query": raw_query, "title": title})
                 except Exception as e:
                     logger.warning(
                         f"add_tracks_by_name: failed to add '{raw_query}' "
                         f"({track_id}:{album_id}) to '{playlist_title}': {e}"
                     )
-                    result["failed"].append({"query": raw_query, "reason": "api_error"})
+                    yield "failed", AddResult(raw_query, reason="api_error")
+                    continue
 
-            return result
+                yield "added", AddResult(raw_query, title=self._format_track_title(track_obj))
 
         except Exception as e:
             logger.error(f"add_tracks_by_name fatal error for playlist '{playlist_title}': {e}")
-            return result
 
     def _soft_find_track(
         self,
         client: Client,
         query: str,
+        user_id: Optional[int] = None,
     ) -> Optional[Tuple[Any, int, int]]:
         try:
             for ch in ['"', "'", "«", "»"]:
@@ -304,6 +524,12 @@ class YandexMusicService(YandexMusicStatsMixin, YandexMusicHelperMixin):
                 if len(q_clean) < 2:
                     continue
 
+                if user_id is not None:
+                    local = self._find_local_track(user_id, q_clean)
+                    if local is not None:
+                        logger.info(f"_soft_find_track: '{q_clean}' найден в локальном индексе")
+                        return local, local.track_id, local.album_id
+
                 sr = client.search(q_clean, type_="track")
                 tracks_block = getattr(sr, "tracks", None)
                 items = getattr(tracks_block, "results", None) or [] if tracks_block else []
@@ -327,13 +553,64 @@ class YandexMusicService(YandexMusicStatsMixin, YandexMusicHelperMixin):
             logger.warning(f"_soft_find_track error for '{query}': {e}")
             return None
 
+    async def build_track_index(self, token: str, user_id: int) -> int:
+        """Построить локальный индекс по библиотеке пользователя: лайки и плейлисты.
+
+        Результаты поиска через API в индекс не попадают: локальное попадание
+        должно возвращать только трек, сохранённый пользователем.
+        """
+        try:
+            client = self.get_client(token, user_id)
+            if client is None:
+                return 0
+
+            tracks = self._hydrate_tracks(client, self._sync_likes(client, user_id))
+            uid = self._get_user_uid(client, user_id)
+            if uid is not None:
+                tracks.extend(self._get_playlist_tracks(client, uid))
+
+            index = TrackSearchIndex()
+            index.add_many(tracks)
+            self.track_indexes[user_id] = index
+            logger.info(f"Построен локальный индекс пользователя {user_id}: {len(index)} треков")
+            return len(index)
+        except Exception as e:
+            logger.error(f"Ошибка при построении индекса треков пользователя {user_id}: {e}")
+            return 0
+
+    async def iter_build_track_index(self, token: str, user_id: int) -> AsyncIterator[int]:
+        """build_track_index как источник задачи JobQueue: выдаёт размер индекса."""
+        yield await self.build_track_index(token, user_id)
+
+    async def find_track(self, token: str, user_id: int, query: str) -> Optional[TrackSummary]:
+        try:
+            client = self.get_client(token, user_id)
+            if client is None:
+                return None
+
+            pair = self._soft_find_track(client, query, user_id)
+            if pair is None:
+                return None
+
+            track_obj, track_id, album_id = pair
+            formatted = f"{track_id}:{album_id}" if album_id else str(track_id)
+            return TrackSummary(formatted, self._format_track_title(track_obj, "Неизвестный исполнитель"))
+        except Exception as e:
+            logger.error(f"Ошибка при поиске трека '{query}': {e}")
+            return None
+
     async def like_track(self, token: str, user_id: int, track_query: str) -> bool:
         try:
             client = self.get_client(token, user_id)
             if client is None:
                 return False
 
-            track_id = self._format_track_id(track_query) or self._search_track_id(client, track_query)
+            local = self._find_local_track(user_id, track_query)
+            track_id = (
+                self._format_track_id(track_query)
+                or (f"{local.track_id}:{local.album_id}" if local else None)
+                or self._search_track_id(client, track_query)
+            )
             if not track_id:
                 logger.warning(f"Трек '{track_query}' не найден для лайка")
                 return False
@@ -346,35 +623,57 @@ class YandexMusicService(YandexMusicStatsMixin, YandexMusicHelperMixin):
             return False
 
     async def get_user_statistics(self, token: str, user_id: int) -> Dict[str, Any]:
+        stats: Dict[str, Any] = {}
+        async for key, value in self.iter_user_statistics(token, user_id):
+            stats[key] = value
+        return stats
+
+    async def iter_user_statistics(self, token: str, user_id: int) -> AsyncIterator[Tuple[str, Any]]:
         client = self.get_client(token, user_id)
         if client is None:
-            return {}
-
-        stats = {}
-
-        try:
-            stats["liked_tracks_count"] = await self._get_liked_tracks_count(token, user_id)
-        except Exception as e:
-            logger.warning(f"Не удалось получить лайки: {e}")
-
-        try:
-            stats["recent_likes_last_month"] = await self._get_recent_likes_count(token, user_id, days=30)
-        except Exception as e:
-            logger.warning(f"Не удалось получить недавние лайки: {e}")
-
-        try:
-            stats["top_artists"] = await self._get_top_artists(token, user_id, limit=5)
-        except Exception as e:
-            logger.warning(f"Не удалось получить топ артистов: {e}")
-
-        try:
-            stats["top_genres_recent"] = await self._get_top_genres_from_recent(token, user_id, limit=5, days=90)
-        except Exception as e:
-            logger.warning(f"Не удалось получить топ жанров: {e}")
-
-        try:
-            stats["top_genres_library"] = await self._get_top_genres_from_library(token, user_id, limit=5)
-        except Exception as e:
-            logger.warning(f"Не удалось получить жанры библиотеки: {e}")
-
-        return stats
\ No newline at end of file
+            return
+
+        history = None
+
+        def shared_history() -> ListeningHistory:
+            nonlocal history
+            if history is None:
+                history = self._sync_listening_history(client, user_id)
+            return history
+
+        # Снимок библиотеки собирает раздел жанров библиотеки; топ артистов
+        # идёт после него и берёт лайкнутые треки оттуда, если история пуста
+        library = TrackColumns()
+
+        sections = [
+            ("liked_tracks_count", "лайки", lambda: self._get_liked_tracks_count(token, user_id)),
+            ("recent_likes_last_month", "недавние лайки", lambda: self._get_recent_likes_count(token, user_id, days=30)),
+            (
+                "top_genres_recent", "топ жанров",
+                lambda: self._get_top_genres_from_recent(token, user_id, limit=5, days=90, history=shared_history()),
+            ),
+            (
+                "listening_minutes", "время прослушивания",
+                lambda: self._get_listening_breakdown(token, user_id, days=7, history=shared_history()),
+            ),
+            (
+                "top_genres_library", "жанры библиотеки",
+                lambda: self._iter_top_genres_from_library(token, user_id, limit=5, library=library),
+            ),
+            (
+                "top_artists", "топ артистов",
+                lambda: self._get_top_artists(
+                    token, user_id, limit=5, days=90, history=shared_history(), library=library
+                ),
+            ),
+        ]
+        for key, label, compute in sections:
+            try:
+                result = compute()
+                if hasattr(result, "__aiter__"):
+                    async for value in result:
+                        yield key, value
+                else:
+                    yield key, await result
+            except Exception as e:
+                logger.warning(f"Не удалось получить {label}: {e}")
@@ -0,0 +1,103 @@
+import random
+import re
+import string
+from urllib.parse import quote, unquote
+
+import pytest
+
+from src.bot.handlers.start_handler import extract_token
+
+
+def reference_extract_token(raw_string: str) -> str | None:
+    """Исходная реализация extract_token, с которой сверяется текущая"""
+    clean_string = ''.join(raw_string.split())
+
+    patterns = [
+        r'access_token=([A-Za-z0-9_-]{30,})',
+        r'access_token%3D([A-Za-z0-9_-]{30,})',
+        r'access_token%253D([A-Za-z0-9_-]{30,})',
+    ]
+
+    for pattern in patterns:
+        match = re.search(pattern, clean_string)
+        if match:
+            return match.group(1)
+
+    try:
+        decoded = unquote(clean_string)
+        for pattern in patterns[:2]:
+            match = re.search(pattern, decoded)
+            if match:
+                return match.group(1)
+    except:
+        pass
+
+    direct_match = re.search(r'\b(y0_[A-Za-z0-9_-]{30,})\b', clean_string)
+    if direct_match:
+        return direct_match.group(1)
+
+    fallback = re.search(r'(y0_[A-Za-z0-9_-]{30,})|(AQ[A-Za-z0-9_-]{30,})', clean_string)
+    if fallback:
+        return fallback.group(1) or fallback.group(2)
+
+    return None
+
+
+TOKEN = "y0_AgAAAAAbCdEfGhIjKlMnOpQrStUvWxYz0123456789-_"
+FRAGMENTS = [
+    "access_token", "access_token=", "access_token=", "y0_", "y0_", "access_token%3D", "access_token%253D", "access_token%3d",
+    "%61ccess_token=", "y0_", "AQ", "=", "%3D", "%253D", "%2D", "%5F", "%", "&", "#", "?", "/",
+    " ", "\n", "\t", "-", "_", "é", "ё", "токен", "https://music.yandex.ru/",
+    "&token_type=bearer", "&expires_in=31536000",
+]
+TOKEN_ALPHABET = string.ascii_letters + string.digits + "-_"
+
+
+def random_input(rng: random.Random) -> str:
+    parts = []
+    for _ in range(rng.randint(1, 8)):
+        if rng.random() < 0.5:
+            parts.append("".join(rng.choices(TOKEN_ALPHABET, k=rng.choice([5, 27, 29, 30, 31, 45]))))
+        else:
+            parts.append(rng.choice(FRAGMENTS))
+    return "".join(parts)
+
+
+class TestExtractToken:
+    """Тесты для извлечения токена из присланной строки"""
+
+    @pytest.mark.parametrize("raw, expected", [
+        (f"https://music.yandex.ru/#access_token={TOKEN}&token_type=bearer&expires_in=31535645", TOKEN),
+        (f"https://music.yandex.ru/#access_token%3D{TOKEN}%26token_type%3Dbearer", TOKEN),
+        (f"https%3A%2F%2Fmusic.yandex.ru%2F%23access_token%253D{TOKEN}", TOKEN),
+        (f"  {TOKEN}\n", TOKEN),
+        (f"https://music.yandex.ru/#access_token={TOKEN[:20]}\n{TOKEN[20:]}&token_type=bearer", TOKEN),
+        ("AQAAAAAAbCdEfGhIjKlMnOpQrStUvWxYz0123", "AQAAAAAAbCdEfGhIjKlMnOpQrStUvWxYz0123"),
+        ("https://music.yandex.ru/#access_token=short&token_type=bearer", None),
+        ("", None),
+    ])
+    def test_realistic_inputs(self, raw, expected):
+        """Тест типичных вставок пользователя"""
+        assert extract_token(raw) == expected
+        assert reference_extract_token(raw) == expected
+
+    def test_separator_priority(self):
+        """Тест приоритета access_token= над закодированными вариантами, даже при перекрытии"""
+        encoded = "A" * 30 + "access_token"
+        raw = f"access_token%3D{encoded}={TOKEN}"
+
+        assert extract_token(raw) == reference_extract_token(raw) == TOKEN
+
+    def test_percent_encoded_token(self):
+        """Тест токена с закодированными символами внутри"""
+        raw = "access_token=" + quote(TOKEN, safe="").replace("-", "%2D").replace("_", "%5F")
+
+        assert extract_token(raw) == reference_extract_token(raw) == TOKEN
+
+    @pytest.mark.parametrize("seed", range(10))
+    def test_fuzz_matches_reference(self, seed):
+        """Тест совпадения с исходной реализацией на случайных строках"""
+        rng = random.Random(seed)
+        for _ in range(500):
+            raw = random_input(rng)
+            assert extract_token(raw) == reference_extract_token(raw), raw
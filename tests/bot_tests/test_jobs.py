@@ -0,0 +1,140 @@
+import asyncio
+import threading
+
+import pytest
+
+from src.bot.jobs import JOB_CANCELLED, JOB_DONE, JOB_FAILED, JobQueue
+
+
+def make_source(items, gate=None, error=None):
+    async def source():
+        for item in items:
+            if gate is not None:
+                gate.wait(timeout=5)
+            yield item
+        if error is not None:
+            raise error
+
+    return source
+
+
+class Collector:
+    def __init__(self):
+        self.items = []
+        self.finished = asyncio.Event()
+        self.job = None
+
+    async def on_item(self, job, item):
+        self.items.append(item)
+
+    async def on_finish(self, job):
+        self.job = job
+        self.finished.set()
+
+
+class TestJobQueue:
+    """Тесты для очереди фоновых задач"""
+
+    @pytest.mark.asyncio
+    async def test_items_and_result_delivered(self):
+        """Тест доставки элементов и итога задачи"""
+        queue = JobQueue(workers=2)
+        await queue.start()
+        collector = Collector()
+        try:
+            job = queue.submit(1, "stats", make_source([1, 2, 3]), collector.on_item, collector.on_finish)
+            await asyncio.wait_for(collector.finished.wait(), 5)
+        finally:
+            await queue.stop()
+
+        assert collector.items == [1, 2, 3]
+        assert collector.job is job
+        assert job.status == JOB_DONE
+        assert queue.get(job.id) is None
+
+    @pytest.mark.asyncio
+    async def test_source_runs_off_event_loop_thread(self):
+        """Тест выполнения источника в отдельном потоке"""
+        queue = JobQueue(workers=1)
+        await queue.start()
+        collector = Collector()
+
+        async def source():
+            yield threading.get_ident()
+
+        try:
+            queue.submit(1, "stats", source, collector.on_item, collector.on_finish)
+            await asyncio.wait_for(collector.finished.wait(), 5)
+        finally:
+            await queue.stop()
+
+        assert collector.items[0] != threading.get_ident()
+
+    @pytest.mark.asyncio
+    async def test_duplicate_job_rejected(self):
+        """Тест отклонения повторной задачи того же типа"""
+        queue = JobQueue(workers=1)
+        collector = Collector()
+
+        first = queue.submit(1, "stats", make_source([]), collector.on_item, collector.on_finish)
+        second = queue.submit(1, "stats", make_source([]), collector.on_item, collector.on_finish)
+        other_user = queue.submit(2, "stats", make_source([]), collector.on_item, collector.on_finish)
+
+        assert first is not None
+        assert second is None
+        assert other_user is not None
+
+    @pytest.mark.asyncio
+    async def test_cancel_running_job(self):
+        """Тест отмены выполняющейся задачи"""
+        queue = JobQueue(workers=1)
+        await queue.start()
+        gate = threading.Event()
+        collector = Collector()
+        try:
+            job = queue.submit(1, "stats", make_source([1, 2, 3], gate), collector.on_item, collector.on_finish)
+            await asyncio.sleep(0.05)
+            assert queue.cancel(job.id, user_id=2) is False
+            assert queue.cancel(job.id, user_id=1) is True
+            gate.set()
+            await asyncio.wait_for(collector.finished.wait(), 5)
+        finally:
+            await queue.stop()
+
+        assert job.status == JOB_CANCELLED
+        assert collector.items == []
+
+    @pytest.mark.asyncio
+    async def test_cancel_queued_job(self):
+        """Тест отмены задачи, ожидающей в очереди"""
+        queue = JobQueue(workers=1)
+        collector = Collector()
+        job = queue.submit(1, "stats", make_source([1]), collector.on_item, collector.on_finish)
+        queue.cancel(job.id, 1)
+
+        await queue.start()
+        try:
+            await asyncio.wait_for(collector.finished.wait(), 5)
+        finally:
+            await queue.stop()
+
+        assert job.status == JOB_CANCELLED
+        assert collector.items == []
+
+    @pytest.mark.asyncio
+    async def test_failed_job(self):
+        """Тест задачи, завершившейся ошибкой"""
+        queue = JobQueue(workers=1)
+        await queue.start()
+        collector = Collector()
+        try:
+            job = queue.submit(
+                1, "stats", make_source([1], error=RuntimeError("boom")), collector.on_item, collector.on_finish
+            )
+            await asyncio.wait_for(collector.finished.wait(), 5)
+        finally:
+            await queue.stop()
+
+        assert job.status == JOB_FAILED
+        assert isinstance(job.error, RuntimeError)
+        assert collector.items == [1]
@@ -0,0 +1,88 @@
+from src.bot.keyboards import (
+    get_back_button,
+    get_lyrics_keyboard,
+    get_main_menu_keyboard,
+    get_playlist_tracks_keyboard,
+    get_playlists_keyboard,
+)
+
+
+def callbacks(keyboard):
+    return [[button.callback_data for button in row] for row in keyboard.inline_keyboard]
+
+
+class TestKeyboards:
+    """Тесты для клавиатур бота"""
+
+    def test_static_keyboards_reused(self):
+        """Тест переиспользования заранее созданных клавиатур"""
+        assert get_main_menu_keyboard() is get_main_menu_keyboard()
+        assert get_back_button() is get_back_button()
+        assert callbacks(get_back_button()) == [["back_to_menu"]]
+
+    def test_playlists_keyboard_memoized(self):
+        """Тест кэширования клавиатуры пагинации по (offset, limit, total)"""
+        assert get_playlists_keyboard(5, 5, 15) is get_playlists_keyboard(5, 5, 15)
+        assert get_playlists_keyboard(5, 5, 15) is not get_playlists_keyboard(10, 5, 15)
+
+    def test_playlists_keyboard_layout(self):
+        """Тест навигации по смещениям, перехода к странице, поиска и размера страницы"""
+        assert callbacks(get_playlists_keyboard(0, 5, 15)) == [
+            ["noop", "noop", "noop", "playlists:o:5:5", "playlists:o:10:5"],
+            ["playlists:jump:5", "playlists:search:5"],
+            ["noop", "playlists:o:0:10", "playlists:o:0:20"],
+            ["back_to_menu"],
+        ]
+        assert callbacks(get_playlists_keyboard(7, 5, 15))[0] == [
+            "playlists:o:0:5", "playlists:o:2:5", "noop", "playlists:o:12:5", "playlists:o:10:5",
+        ]
+        assert callbacks(get_playlists_keyboard(10, 5, 15))[0][3:] == ["noop", "noop"]
+        assert get_playlists_keyboard(5, 5, 15).inline_keyboard[0][2].text == "· 2/3 ·"
+
+    def test_page_size_switch_keeps_position(self):
+        """Тест смены размера страницы с сохранением позиции"""
+        sizes = callbacks(get_playlists_keyboard(25, 5, 60))[2]
+
+        assert sizes == ["noop", "playlists:o:20:10", "playlists:o:20:20"]
+
+    def test_single_page_has_no_navigation(self):
+        """Тест клавиатуры без навигации, когда все плейлисты помещаются на страницу"""
+        assert callbacks(get_playlists_keyboard(0, 5, 3)) == [["back_to_menu"]]
+        assert callbacks(get_playlists_keyboard(0, 10, 8)) == [
+            ["playlists:o:0:5", "noop", "playlists:o:0:20"],
+            ["back_to_menu"],
+        ]
+
+    def test_playlist_buttons(self):
+        """Тест кнопок открытия плейлистов страницы"""
+        keyboard = get_playlists_keyboard(5, 5, 7, ((11, "Rock"), (12, "x" * 60)))
+
+        assert callbacks(keyboard)[:2] == [["playlist:11:0:5:5"], ["playlist:12:0:5:5"]]
+        assert keyboard.inline_keyboard[0][0].text == "6. Rock"
+        assert len(keyboard.inline_keyboard[1][0].text) == 40
+
+    def test_playlist_tracks_keyboard(self):
+        """Тест навигации по трекам плейлиста и возврата к списку"""
+        assert callbacks(get_playlist_tracks_keyboard(7, 10, 10, 35, 5, 5)) == [
+            ["playlist:7:0:5:5", "noop", "playlist:7:20:5:5"],
+            ["playlists:o:5:5"],
+            ["back_to_menu"],
+        ]
+        assert callbacks(get_playlist_tracks_keyboard(7, 0, 10, 3, 0, 5)) == [["playlists:o:0:5"], ["back_to_menu"]]
+
+    def test_lyrics_keyboard(self):
+        """Тест клавиатуры пагинации текста песни"""
+        assert callbacks(get_lyrics_keyboard("42:7", 0, 2)) == [
+            ["noop", "noop", "lyrics:42:7:1"],
+            ["lyrics_sync:42:7:0"],
+            ["back_to_menu"],
+        ]
+        assert get_lyrics_keyboard("42:7", 0, 2) is get_lyrics_keyboard("42:7", 0, 2)
+
+    def test_synced_lyrics_keyboard(self):
+        """Тест листания текста с таймкодами и возврата к обычному тексту"""
+        assert callbacks(get_lyrics_keyboard("42:7", 1, 2, synced=True)) == [
+            ["lyrics_sync:42:7:0", "noop", "noop"],
+            ["lyrics:42:7:0"],
+            ["back_to_menu"],
+        ]
@@ -0,0 +1,17 @@
+import pytest
+
+from src.bot.handlers.playlist_handler import parse_page_size
+from src.bot.keyboards.main_menu import PLAYLIST_PAGE_SIZES
+
+
+class TestParsePageSize:
+    """Тесты для разбора размера страницы плейлистов из настройки"""
+
+    def test_allowed_value(self):
+        """Тест допустимого значения"""
+        assert parse_page_size(str(PLAYLIST_PAGE_SIZES[-1])) == PLAYLIST_PAGE_SIZES[-1]
+
+    @pytest.mark.parametrize("raw", [None, "", "abc", "7.5", "0", "1000"])
+    def test_invalid_value_falls_back(self, raw):
+        """Тест отката к размеру по умолчанию при некорректном значении"""
+        assert parse_page_size(raw) == PLAYLIST_PAGE_SIZES[0]
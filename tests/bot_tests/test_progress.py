@@ -0,0 +1,65 @@
+import asyncio
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+
+from src.bot.progress import ThrottledEditor
+
+
+class TestThrottledEditor:
+    """Тесты для редактирования статусного сообщения с ограничением частоты"""
+
+    def setup_method(self):
+        self.message = MagicMock()
+        self.message.edit_text = AsyncMock()
+
+    @pytest.mark.asyncio
+    async def test_first_update_is_immediate(self):
+        """Тест немедленной отправки первого обновления"""
+        editor = ThrottledEditor(self.message, interval=60)
+        await editor.update("1")
+        self.message.edit_text.assert_awaited_once_with("1", reply_markup=None)
+
+    @pytest.mark.asyncio
+    async def test_intermediate_updates_are_skipped(self):
+        """Тест пропуска промежуточных состояний"""
+        editor = ThrottledEditor(self.message, interval=60)
+        for text in ("1", "2", "3"):
+            await editor.update(text)
+        await editor.update("final", force=True)
+
+        sent = [call.args[0] for call in self.message.edit_text.await_args_list]
+        assert sent == ["1", "final"]
+
+    @pytest.mark.asyncio
+    async def test_same_text_not_resent(self):
+        """Тест отсутствия повторной правки тем же текстом"""
+        editor = ThrottledEditor(self.message, interval=0)
+        await editor.update("1")
+        await editor.update("1")
+        self.message.edit_text.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_pending_update_flushed_after_interval(self):
+        """Тест отложенной отправки обновления без следующих обновлений"""
+        editor = ThrottledEditor(self.message, interval=0.05)
+        await editor.update("1")
+        await editor.update("2")
+        self.message.edit_text.assert_awaited_once_with("1", reply_markup=None)
+
+        await asyncio.sleep(0.1)
+
+        sent = [call.args[0] for call in self.message.edit_text.await_args_list]
+        assert sent == ["1", "2"]
+
+    @pytest.mark.asyncio
+    async def test_forced_update_cancels_delayed_flush(self):
+        """Тест отмены отложенной отправки принудительным обновлением"""
+        editor = ThrottledEditor(self.message, interval=0.05)
+        await editor.update("1")
+        await editor.update("2")
+        await editor.update("final", force=True)
+
+        await asyncio.sleep(0.1)
+
+        sent = [call.args[0] for call in self.message.edit_text.await_args_list]
+        assert sent == ["1", "final"]
@@ -0,0 +1,152 @@
+from unittest.mock import patch
+
+from src.bot import rendering
+from src.bot.rendering import (
+    escape,
+    render_add_tracks_result,
+    render_playlist_tracks_page,
+    render_playlists_page,
+    render_stats,
+)
+from src.services.records import AddResult, PlaylistInfo, PlaylistPage, TrackPage, TrackSummary
+
+
+class TestRenderStats:
+    """Тесты для сообщения со статистикой"""
+
+    def test_full_stats(self):
+        """Тест всех разделов статистики"""
+        stats = {
+            "liked_tracks_count": 1234,
+            "recent_likes_last_month": 7,
+            "top_artists": [{"name": "Artist", "count": 3}],
+            "top_genres_recent": [{"name": "rock", "count": 2}],
+            "listening_minutes": {"days": 2, "total": 30, "per_day": [
+                {"date": "2024-05-01", "minutes": 10},
+                {"date": "2024-05-02", "minutes": 20},
+            ]},
+            "top_genres_library": [{"name": "pop", "count": 5}],
+        }
+
+        assert render_stats(stats, in_progress=True) == (
+            "📊 <b>Ваша статистика</b>\n\n"
+            "❤️ Лайкнутых треков: <b>1,234</b>\n"
+            "📅 Лайков за месяц: <b>7</b>\n\n"
+            "🎤 <b>Топ артистов:</b>\n"
+            "  1. Artist — 3 треков\n\n"
+            "🎵 <b>Топ жанров (90 дней):</b>\n"
+            "  1. rock — 2 раз\n\n"
+            "🎧 <b>Прослушано за 2 дн.:</b> 30 мин\n"
+            "  01.05 — 10 мин\n"
+            "  02.05 — 20 мин\n\n"
+            "📚 <b>Топ жанров (библиотека):</b>\n"
+            "  1. pop — 5 треков\n"
+            "\n⏳ <i>Собираю остальное...</i>"
+        )
+
+    def test_updated_at(self):
+        """Тест подписи о времени обновления"""
+        with patch.object(rendering.time, "time", return_value=1000.0 + 5 * 60):
+            assert render_stats({}, updated_at=1000.0).endswith("\n🕒 <i>Обновлено 5 мин. назад</i>")
+            assert render_stats({}, updated_at=1000.0 + 5 * 60).endswith("\n🕒 <i>Обновлено только что</i>")
+
+    def test_artist_names_escaped(self):
+        """Тест экранирования имён артистов"""
+        text = render_stats({"top_artists": [{"name": "<Tom & Jerry>", "count": 1}]})
+
+        assert "&lt;Tom &amp; Jerry&gt;" in text
+        assert "<Tom" not in text
+
+
+class TestRenderPlaylistsPage:
+    """Тесты для страницы списка плейлистов"""
+
+    def test_page(self):
+        """Тест иконок, склонения и владельца плейлиста"""
+        playlists = (
+            PlaylistInfo(kind=3, title="Мне нравится", track_count=1),
+            PlaylistInfo(kind=5, title="Избранное", track_count=2, owner_login="friend"),
+            PlaylistInfo(kind=6, title="", track_count=0, owner_login="42"),
+        )
+
+        assert render_playlists_page(PlaylistPage(playlists, 0, 5, 13), 42) == (
+            "📁 <b>Ваши плейлисты</b>\nВсего: 13 • Страница 1/3\n\n"
+            "❤️ <b>Мне нравится</b>\n   └ 1 трек\n\n"
+            "⭐ <b>Избранное</b>\n   └ 2 треков\n   👤 by @friend\n\n"
+            "📁 <b>Без названия</b>\n   └ 0 треков\n\n"
+        )
+
+    def test_title_escaped(self):
+        """Тест экранирования названия плейлиста"""
+        page = PlaylistPage((PlaylistInfo(kind=1, title="<b>Rock & Roll</b>"),), 0, 5, 1)
+        text = render_playlists_page(page, 42)
+
+        assert "<b>&lt;b&gt;Rock &amp; Roll&lt;/b&gt;</b>" in text
+
+    def test_search_note(self):
+        """Тест строки с числом найденных плейлистов"""
+        page = PlaylistPage((PlaylistInfo(kind=1, title="Rock"),), 7, 5, 20)
+        text = render_playlists_page(page, 42, found=3)
+
+        assert text.startswith("📁 <b>Ваши плейлисты</b>\nВсего: 20 • Страница 2/4\n\n🔎 Найдено по запросу: 3\n\n")
+
+
+class TestRenderPlaylistTracksPage:
+    """Тесты для страницы треков плейлиста"""
+
+    def test_page_numbering(self):
+        """Тест сквозной нумерации треков и экранирования названий"""
+        items = (TrackSummary("11:1", "A - <Intro>"), TrackSummary("12:1", "B - Song"))
+        page = TrackPage(7, "Rock & Roll", items, 10, 10, 12)
+
+        assert render_playlist_tracks_page(page) == (
+            "📁 <b>Rock &amp; Roll</b>\n"
+            "Треков: 12 • Страница 2/2\n\n"
+            "11. A - &lt;Intro&gt;\n"
+            "12. B - Song\n"
+        )
+
+    def test_empty_playlist(self):
+        """Тест пустого плейлиста"""
+        assert render_playlist_tracks_page(TrackPage(7, "", (), 0, 10, 0)) == (
+            "📁 <b>Без названия</b>\n\nВ плейлисте пока нет треков."
+        )
+
+
+class TestRenderAddTracksResult:
+    """Тесты для сообщения о добавлении треков"""
+
+    def test_progress(self):
+        """Тест сообщения о ходе добавления"""
+        text = render_add_tracks_result("Мой <плейлист>", [AddResult("a", title="A - B")], [AddResult("c")], total=5)
+
+        assert text == (
+            "🎼 <b>Добавляю треки...</b> 2/5\n\n"
+            "📁 Плейлист: <b>Мой &lt;плейлист&gt;</b>\n"
+            "➕ Добавлено: 1\n"
+            "❌ Не добавлено: 1\n"
+            "\n<b>Добавленные треки:</b>\n"
+            "• A - B\n"
+            "\n<b>Не удалось добавить:</b>\n"
+            "• c\n"
+        )
+
+    def test_truncated_lists(self):
+        """Тест сокращения длинных списков"""
+        added = [AddResult(f"q{i}", title=f"T{i}") for i in range(12)]
+        text = render_add_tracks_result("P", added, [])
+
+        assert text.startswith("✅ <b>Готово!</b>\n\n")
+        assert text.count("• ") == 10
+        assert text.endswith("... и ещё 2\n")
+
+    def test_cancelled(self):
+        """Тест сообщения об остановке"""
+        assert render_add_tracks_result("P", [], [], cancelled=True).startswith("⛔ <b>Добавление остановлено</b>")
+
+
+def test_escape():
+    """Тест экранирования значений"""
+    assert escape("a < b & c > d") == "a &lt; b &amp; c &gt; d"
+    assert escape('"quoted"') == '"quoted"'
+    assert escape(42) == "42"
@@ -0,0 +1,129 @@
+import asyncio
+import time
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+from aiogram.exceptions import TelegramRetryAfter
+from aiogram.methods import AnswerCallbackQuery, EditMessageText, SendMessage
+
+from src.bot.send_queue import SendScheduler, TokenBucket
+
+
+class TestTokenBucket:
+    """Тесты для ограничителя частоты"""
+
+    @pytest.mark.asyncio
+    async def test_burst_then_throttle(self):
+        """Тест пропуска пачки запросов и ожидания после неё"""
+        bucket = TokenBucket(rate=50, capacity=2)
+        start = time.monotonic()
+        for _ in range(3):
+            await bucket.acquire()
+        assert time.monotonic() - start >= 0.015
+
+    @pytest.mark.asyncio
+    async def test_skip_keeps_token(self):
+        """Тест выхода без расхода токена"""
+        bucket = TokenBucket(rate=0.001, capacity=1)
+
+        assert await bucket.acquire(lambda: True) is False
+        assert await asyncio.wait_for(bucket.acquire(), timeout=0.1) is True
+
+
+class TestSendScheduler:
+    """Тесты для планировщика исходящих сообщений"""
+
+    def setup_method(self):
+        self.bot = MagicMock()
+
+    @pytest.mark.asyncio
+    async def test_passthrough_without_chat(self):
+        """Тест запросов без chat_id"""
+        scheduler = SendScheduler()
+        make_request = AsyncMock(return_value="ok")
+        method = AnswerCallbackQuery(callback_query_id="1")
+
+        assert await scheduler(make_request, self.bot, method) == "ok"
+        make_request.assert_awaited_once_with(self.bot, method)
+
+    @pytest.mark.asyncio
+    async def test_retry_after(self):
+        """Тест повтора запроса после RetryAfter"""
+        scheduler = SendScheduler()
+        method = SendMessage(chat_id=1, text="hi")
+        make_request = AsyncMock(
+            side_effect=[TelegramRetryAfter(method, "flood", 0), "ok"]
+        )
+
+        assert await scheduler(make_request, self.bot, method) == "ok"
+        assert make_request.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_retry_after_gives_up(self):
+        """Тест отказа после исчерпания попыток"""
+        scheduler = SendScheduler(max_retries=1)
+        method = SendMessage(chat_id=1, text="hi")
+        make_request = AsyncMock(side_effect=TelegramRetryAfter(method, "flood", 0))
+
+        with pytest.raises(TelegramRetryAfter):
+            await scheduler(make_request, self.bot, method)
+        assert make_request.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_superseded_edits_are_coalesced(self):
+        """Тест схлопывания устаревших правок одного сообщения"""
+        scheduler = SendScheduler(chat_rate=20, chat_burst=1)
+        sent = []
+
+        async def make_request(bot, method):
+            sent.append(method.text)
+            await asyncio.sleep(0)
+            return method.text
+
+        edits = [EditMessageText(chat_id=1, message_id=10, text=str(i)) for i in range(4)]
+        results = await asyncio.gather(*(scheduler(make_request, self.bot, e) for e in edits))
+
+        assert sent == ["0", "3"]
+        assert results == ["0", "3", "3", "3"]
+
+    @pytest.mark.asyncio
+    async def test_superseded_edits_keep_chat_budget(self):
+        """Тест: выброшенные правки не расходуют лимит чата"""
+        scheduler = SendScheduler(chat_rate=20, chat_burst=1)
+        make_request = AsyncMock(side_effect=lambda bot, method: method.text)
+
+        edits = [EditMessageText(chat_id=1, message_id=10, text=str(i)) for i in range(6)]
+        start = time.monotonic()
+        await asyncio.gather(*(scheduler(make_request, self.bot, e) for e in edits))
+
+        assert make_request.await_count == 2
+        assert time.monotonic() - start < 0.2
+
+    @pytest.mark.asyncio
+    async def test_failed_newest_edit_not_propagated(self):
+        """Тест: ошибку новой правки получает только её вызывающий"""
+        scheduler = SendScheduler(chat_rate=20, chat_burst=1)
+
+        async def make_request(bot, method):
+            if method.text == "2":
+                raise RuntimeError("edit failed")
+            return method.text
+
+        edits = [EditMessageText(chat_id=1, message_id=10, text=str(i)) for i in range(3)]
+        results = await asyncio.gather(
+            *(scheduler(make_request, self.bot, e) for e in edits), return_exceptions=True
+        )
+
+        assert results[:2] == ["0", True]
+        assert isinstance(results[2], RuntimeError)
+
+    @pytest.mark.asyncio
+    async def test_different_messages_not_coalesced(self):
+        """Тест правок разных сообщений"""
+        scheduler = SendScheduler(chat_rate=100, chat_burst=1)
+        make_request = AsyncMock(side_effect=lambda bot, method: method.text)
+
+        edits = [EditMessageText(chat_id=1, message_id=i, text=str(i)) for i in range(3)]
+        results = await asyncio.gather(*(scheduler(make_request, self.bot, e) for e in edits))
+
+        assert results == ["0", "1", "2"]
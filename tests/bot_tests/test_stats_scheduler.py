@@ -0,0 +1,134 @@
+import asyncio
+import time
+from unittest.mock import Mock, patch
+
+import pytest
+
+from src.bot import stats_scheduler as scheduler_module
+from src.bot.jobs import JOB_DONE, JOB_FAILED, JobQueue
+from src.bot.stats_scheduler import StatsScheduler
+
+
+class FakeService:
+    def __init__(self, items=None, error=None):
+        self.items = items or []
+        self.error = error
+
+    async def iter_user_statistics(self, token, user_id):
+        for item in self.items:
+            yield item
+        if self.error is not None:
+            raise self.error
+
+
+class TestStatsScheduler:
+    """Тесты для планировщика обновления статистики"""
+
+    def test_is_fresh(self):
+        """Тест проверки свежести статистики"""
+        scheduler = StatsScheduler(FakeService(), Mock(), refresh_after=60)
+
+        assert scheduler.is_fresh(time.time() - 10)
+        assert not scheduler.is_fresh(time.time() - 120)
+
+    @pytest.mark.asyncio
+    async def test_submit_refresh_persists_on_done(self):
+        """Тест сохранения статистики после успешного обновления"""
+        queue = JobQueue(workers=1)
+        scheduler = StatsScheduler(FakeService([("liked_tracks_count", 5)]), queue)
+        finished = asyncio.Event()
+        items = []
+
+        async def on_item(job, item):
+            items.append(item)
+
+        async def on_finish(job):
+            finished.set()
+
+        await queue.start()
+        try:
+            with patch.object(scheduler_module, "set_user_stats") as mock_set:
+                job = scheduler.submit_refresh(1, "token", on_item=on_item, on_finish=on_finish)
+                await asyncio.wait_for(finished.wait(), 5)
+        finally:
+            await queue.stop()
+
+        assert job.status == JOB_DONE
+        assert items == [("liked_tracks_count", 5)]
+        mock_set.assert_called_once_with(1, {"liked_tracks_count": 5})
+
+    @pytest.mark.asyncio
+    async def test_submit_refresh_not_persisted_on_failure(self):
+        """Тест отсутствия сохранения при ошибке обновления"""
+        queue = JobQueue(workers=1)
+        service = FakeService([("liked_tracks_count", 5)], error=RuntimeError("boom"))
+        scheduler = StatsScheduler(service, queue)
+        finished = asyncio.Event()
+
+        async def on_finish(job):
+            finished.set()
+
+        await queue.start()
+        try:
+            with patch.object(scheduler_module, "set_user_stats") as mock_set:
+                job = scheduler.submit_refresh(1, "token", on_finish=on_finish)
+                await asyncio.wait_for(finished.wait(), 5)
+        finally:
+            await queue.stop()
+
+        assert job.status == JOB_FAILED
+        mock_set.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_submit_refresh_saves_only_new_sections(self):
+        """Тест: раздел, не полученный новым запуском, не сохраняется как свежий"""
+        queue = JobQueue(workers=1)
+        scheduler = StatsScheduler(FakeService([("top_artists", ["new"])]), queue)
+        finished = asyncio.Event()
+
+        async def on_finish(job):
+            finished.set()
+
+        await queue.start()
+        try:
+            with patch.object(scheduler_module, "set_user_stats") as mock_set:
+                scheduler.submit_refresh(1, "token", on_finish=on_finish)
+                await asyncio.wait_for(finished.wait(), 5)
+        finally:
+            await queue.stop()
+
+        mock_set.assert_called_once_with(1, {"top_artists": ["new"]})
+
+    def test_refresh_stale_oldest_first(self):
+        """Тест выбора самых устаревших активных пользователей"""
+        queue = Mock()
+        scheduler = StatsScheduler(FakeService(), queue, refresh_after=60, batch_size=2)
+        now = time.time()
+        updated = {1: now - 10, 2: now - 500, 3: now - 1000}
+        for user_id in (1, 2, 3, 4):
+            scheduler.mark_active(user_id)
+
+        with patch.object(scheduler_module, "get_stats_updated_at", return_value=updated) as mock_updated, \
+                patch.object(scheduler_module, "get_token", return_value="token"):
+            submitted = scheduler.refresh_stale()
+
+        assert submitted == 2
+        mock_updated.assert_called_once_with([1, 2, 3, 4])
+        refreshed = [call.args[0] for call in queue.submit.call_args_list]
+        assert refreshed == [4, 3]
+
+    def test_refresh_stale_drops_inactive_and_logged_out(self):
+        """Тест исключения неактивных пользователей и пользователей без токена"""
+        queue = Mock()
+        scheduler = StatsScheduler(FakeService(), queue, active_window=60)
+        scheduler.mark_active(1)
+        scheduler.mark_active(2)
+        scheduler._last_seen[1] = time.time() - 120
+
+        with patch.object(scheduler_module, "get_stats_updated_at", return_value={}), \
+                patch.object(scheduler_module, "get_token", return_value=None):
+            submitted = scheduler.refresh_stale()
+
+        assert submitted == 0
+        queue.submit.assert_not_called()
+        assert scheduler._last_seen == {}
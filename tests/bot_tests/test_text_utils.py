@@ -0,0 +1,57 @@
+from src.bot.text_utils import TELEGRAM_MESSAGE_LIMIT, escape, split_message
+
+
+class TestSplitMessage:
+    """Тесты для разбиения длинных сообщений"""
+
+    def test_short_text_single_page(self):
+        """Тест короткого текста"""
+        assert split_message("Line 1\nLine 2") == ["Line 1\nLine 2"]
+
+    def test_splits_on_line_boundaries(self):
+        """Тест разбиения по границам строк"""
+        lines = [f"Строка {i:03d}" for i in range(100)]
+        pages = split_message("\n".join(lines), limit=100)
+
+        assert all(len(page) <= 100 for page in pages)
+        assert "\n".join(pages).split("\n") == lines
+
+    def test_limit_applies_after_escaping(self):
+        """Тест учёта HTML-экранирования в длине части"""
+        text = "\n".join(["<b>&</b>"] * 50)
+        pages = split_message(text, limit=60)
+
+        assert all(len(page) <= 60 for page in pages)
+        assert all(page.count("&lt;") == page.count("&gt;") for page in pages)
+        assert "<b>" not in "".join(pages)
+
+    def test_long_line_split_by_words(self):
+        """Тест разбиения строки длиннее лимита"""
+        line = " ".join(["слово"] * 50)
+        pages = split_message(line, limit=40)
+
+        assert all(len(page) <= 40 for page in pages)
+        assert " ".join(pages).split() == line.split()
+
+    def test_long_word_hard_split_keeps_entities(self):
+        """Тест разбиения длинного слова без разрыва HTML-сущностей"""
+        pages = split_message("&" * 30, limit=12)
+
+        assert all(len(page) <= 12 for page in pages)
+        assert "".join(pages) == "&amp;" * 30
+
+    def test_empty_text(self):
+        """Тест пустого текста"""
+        assert split_message("\n\n") == []
+
+    def test_default_limit(self):
+        """Тест лимита по умолчанию"""
+        pages = split_message("x" * (TELEGRAM_MESSAGE_LIMIT + 1))
+        assert [len(page) for page in pages] == [TELEGRAM_MESSAGE_LIMIT, 1]
+
+
+def test_escape():
+    """Тест экранирования только там, где есть спецсимволы"""
+    plain = "Imagine Dragons - Believer"
+    assert escape(plain) is plain
+    assert escape("Tom & Jerry <live>") == "Tom &amp; Jerry &lt;live&gt;"
@@ -0,0 +1,56 @@
+import pytest
+from unittest.mock import patch
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from src.database import storage
+from src.database.repository import Base, LyricsCacheEntry
+
+
+@pytest.fixture
+def session_factory():
+    """Фикстура с изолированной in-memory базой"""
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    factory = sessionmaker(bind=engine)
+    with patch.object(storage, "SessionLocal", factory):
+        yield factory
+
+
+class TestLyricsCache:
+    """Тесты для кэша текстов песен"""
+
+    def test_get_missing(self, session_factory):
+        """Тест чтения отсутствующей записи"""
+        assert storage.get_cached_lyrics("1") is None
+
+    def test_set_and_get(self, session_factory):
+        """Тест сохранения и чтения текста"""
+        text = "Куплет\nПрипев\n" * 50
+        storage.set_cached_lyrics("1", text)
+
+        assert storage.get_cached_lyrics("1") == text
+        with session_factory() as session:
+            row = session.get(LyricsCacheEntry, "1")
+            assert row.size == len(row.data) < len(text.encode("utf-8"))
+
+    def test_overwrite(self, session_factory):
+        """Тест перезаписи текста"""
+        storage.set_cached_lyrics("1", "old")
+        storage.set_cached_lyrics("1", "new")
+        assert storage.get_cached_lyrics("1") == "new"
+
+    def test_eviction_by_size(self, session_factory):
+        """Тест вытеснения давно запрошенных записей при превышении лимита"""
+        text = "x" * 100
+        storage.set_cached_lyrics("1", text)
+        size = len(storage.zlib.compress(text.encode("utf-8"), 9))
+
+        with patch.object(storage, "LYRICS_CACHE_MAX_BYTES", size * 2):
+            storage.set_cached_lyrics("2", text)
+            storage.get_cached_lyrics("1")
+            storage.set_cached_lyrics("3", text)
+
+        assert storage.get_cached_lyrics("1") == text
+        assert storage.get_cached_lyrics("2") is None
+        assert storage.get_cached_lyrics("3") == text
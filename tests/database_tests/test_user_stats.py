@@ -0,0 +1,83 @@
+import pytest
+from unittest.mock import patch
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from src.database import storage
+from src.database.repository import Base
+
+
+@pytest.fixture
+def session_factory():
+    """Фикстура с изолированной in-memory базой"""
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    factory = sessionmaker(bind=engine)
+    with patch.object(storage, "SessionLocal", factory):
+        yield factory
+
+
+class TestUserStats:
+    """Тесты для сохранённой статистики пользователей"""
+
+    def test_get_missing(self, session_factory):
+        """Тест чтения отсутствующей статистики"""
+        assert storage.get_user_stats(1) is None
+
+    def test_set_and_get(self, session_factory):
+        """Тест сохранения и чтения статистики"""
+        stats = {"liked_tracks_count": 10, "top_artists": [["Исполнитель", 3]]}
+        with patch.object(storage.time, "time", return_value=1000.0):
+            storage.set_user_stats(1, stats)
+
+        assert storage.get_user_stats(1) == (stats, 1000.0)
+
+    def test_overwrite(self, session_factory):
+        """Тест перезаписи статистики"""
+        with patch.object(storage.time, "time", return_value=1000.0):
+            storage.set_user_stats(1, {"liked_tracks_count": 1})
+        with patch.object(storage.time, "time", return_value=2000.0):
+            storage.set_user_stats(1, {"liked_tracks_count": 2})
+
+        assert storage.get_user_stats(1) == ({"liked_tracks_count": 2}, 2000.0)
+
+
+class TestListeningDays:
+    """Тесты для хранения дневных агрегатов истории прослушиваний"""
+
+    def test_save_and_get(self, session_factory):
+        """Тест сохранения и перезаписи дней"""
+        storage.save_listening_days(1, {100: {"plays": 1}, 101: {"plays": 2}})
+        storage.save_listening_days(1, {101: {"plays": 3}})
+        storage.save_listening_days(2, {100: {"plays": 5}})
+
+        assert storage.get_listening_days(1) == {100: {"plays": 1}, 101: {"plays": 3}}
+        assert storage.get_listening_days(3) == {}
+
+
+class TestUserStatsBatch:
+    """Тесты для пакетного чтения и удаления статистики"""
+
+    def test_get_stats_updated_at(self, session_factory):
+        """Тест чтения времени обновления нескольких пользователей одним запросом"""
+        with patch.object(storage.time, "time", return_value=1000.0):
+            storage.set_user_stats(1, {"liked_tracks_count": 1})
+        with patch.object(storage.time, "time", return_value=2000.0):
+            storage.set_user_stats(2, {"liked_tracks_count": 2})
+
+        assert storage.get_stats_updated_at([1, 2, 3]) == {1: 1000.0, 2: 2000.0}
+        assert storage.get_stats_updated_at([]) == {}
+
+    def test_remove_user_stats(self, session_factory):
+        """Тест удаления статистики и истории прослушиваний пользователя"""
+        storage.set_user_stats(1, {"liked_tracks_count": 1})
+        storage.set_user_stats(2, {"liked_tracks_count": 2})
+        storage.save_listening_days(1, {100: {"plays": 1}})
+        storage.save_listening_days(2, {100: {"plays": 2}})
+
+        storage.remove_user_stats(1)
+
+        assert storage.get_user_stats(1) is None
+        assert storage.get_listening_days(1) == {}
+        assert storage.get_user_stats(2) is not None
+        assert storage.get_listening_days(2) == {100: {"plays": 2}}
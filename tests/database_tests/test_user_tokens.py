@@ -0,0 +1,63 @@
+import pytest
+from unittest.mock import patch
+from sqlalchemy import create_engine, inspect, text
+from sqlalchemy.orm import sessionmaker
+
+from src.database import storage
+from src.database.repository import Base, migrate
+
+
+@pytest.fixture
+def session_factory():
+    """Фикстура с изолированной in-memory базой"""
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    factory = sessionmaker(bind=engine)
+    with patch.object(storage, "SessionLocal", factory):
+        yield factory
+
+
+class TestUserTokens:
+    """Тесты для хранения токенов и uid аккаунтов"""
+
+    def test_set_token_with_uid(self, session_factory):
+        """Тест сохранения токена вместе с uid"""
+        storage.set_token(1, "token", 123456)
+
+        assert storage.get_token(1) == "token"
+        assert storage.get_uid(1) == 123456
+
+    def test_uid_reset_with_new_token(self, session_factory):
+        """Тест сброса uid при сохранении токена другого аккаунта без uid"""
+        storage.set_token(1, "old", 111)
+        storage.set_token(1, "new")
+
+        assert storage.get_token(1) == "new"
+        assert storage.get_uid(1) is None
+
+    def test_set_uid(self, session_factory):
+        """Тест дописывания uid к существующему токену"""
+        storage.set_token(1, "token")
+        storage.set_uid(1, 42)
+        storage.set_uid(2, 43)
+
+        assert storage.get_uid(1) == 42
+        assert storage.get_uid(2) is None
+        assert not storage.has_token(2)
+
+
+def test_migrate_adds_uid_column():
+    """Тест миграции таблицы токенов, созданной до появления uid"""
+    engine = create_engine("sqlite://")
+    with engine.begin() as connection:
+        connection.execute(text("CREATE TABLE user_tokens (nickname VARCHAR PRIMARY KEY, token VARCHAR NOT NULL)"))
+        connection.execute(text("INSERT INTO user_tokens VALUES ('1', 'token')"))
+
+    migrate(engine)
+    migrate(engine)
+
+    columns = {column["name"] for column in inspect(engine).get_columns("user_tokens")}
+    assert "uid" in columns
+    with patch.object(storage, "SessionLocal", sessionmaker(bind=engine)):
+        assert storage.get_token(1) == "token"
+        assert storage.get_uid(1) is None
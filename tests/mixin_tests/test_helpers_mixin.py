@@ -306,7 +306,9 @@ class TestYandexMusicHelperMixin:
         mock_track_ref1 = Mock(track=Mock(id="1", album_id="1"))
         mock_track_ref2 = Mock(track=None, id="2", album_id="2")
 
-        mock_playlist = Mock(tracks=[mock_track_ref1, mock_track_ref2])
+        mock_header = Mock(kind=7, title="Playlist", track_count=2, tracks=[])
+        mock_playlist = Mock(kind=7, tracks=[mock_track_ref1, mock_track_ref2])
+        self.mock_client.users_playlists_list.return_value = [mock_header]
         self.mock_client.users_playlists.return_value = [mock_playlist]
 
         mock_fetched_track = Mock()
@@ -318,22 +320,34 @@ class TestYandexMusicHelperMixin:
             result = self.mixin._get_playlist_tracks(self.mock_client, 12345)
 
         assert len(result) == 2
-        self.mock_client.users_playlists.assert_called_once_with(12345)
+        self.mock_client.users_playlists_list.assert_called_once_with(12345)
+        self.mock_client.users_playlists.assert_called_once_with([7], 12345)
 
     def test_get_playlist_tracks_error(self):
         """Тест получения треков из плейлистов с ошибкой"""
-        self.mock_client.users_playlists.side_effect = Exception("API Error")
+        self.mock_client.users_playlists_list.side_effect = Exception("API Error")
 
         result = self.mixin._get_playlist_tracks(self.mock_client, 12345)
         assert result == []
 
     def test_get_playlist_tracks_no_playlists(self):
         """Тест получения треков при отсутствии плейлистов"""
-        self.mock_client.users_playlists.return_value = None
+        self.mock_client.users_playlists_list.return_value = None
 
         result = self.mixin._get_playlist_tracks(self.mock_client, 12345)
         assert result == []
 
+    def test_get_playlist_tracks_skips_empty_playlists(self):
+        """Тест отсутствия запроса треков для пустых плейлистов"""
+        self.mock_client.users_playlists_list.return_value = [
+            Mock(kind=1, title="Empty", track_count=0, tracks=[])
+        ]
+
+        result = self.mixin._get_playlist_tracks(self.mock_client, 12345)
+
+        assert result == []
+        self.mock_client.users_playlists.assert_not_called()
+
     # Тесты для _search_track_id
     def test_search_track_id_no_results(self):
         """Тест поиска ID трека без результатов"""
@@ -364,17 +378,18 @@ class TestYandexMusicHelperMixin:
         """Тест успешного поиска плейлиста по названию"""
         mock_playlist1 = Mock(title="My Playlist")
         mock_playlist2 = Mock(title="Other Playlist")
-        self.mock_client.users_playlists.return_value = [mock_playlist1, mock_playlist2]
+        self.mock_client.users_playlists_list.return_value = [mock_playlist1, mock_playlist2]
 
         result = self.mixin._find_playlist_by_title(
             self.mock_client, 12345, "my playlist"
         )
         assert result == mock_playlist1
+        self.mock_client.users_playlists.assert_not_called()
 
     def test_find_playlist_by_title_not_found(self):
         """Тест поиска плейлиста по названию (не найден)"""
         mock_playlist = Mock(title="Other Playlist")
-        self.mock_client.users_playlists.return_value = [mock_playlist]
+        self.mock_client.users_playlists_list.return_value = [mock_playlist]
 
         result = self.mixin._find_playlist_by_title(
             self.mock_client, 12345, "my playlist"
@@ -384,7 +399,7 @@ class TestYandexMusicHelperMixin:
     def test_find_playlist_by_title_case_insensitive(self):
         """Тест поиска плейлиста без учета регистра"""
         mock_playlist = Mock(title="My Playlist")
-        self.mock_client.users_playlists.return_value = [mock_playlist]
+        self.mock_client.users_playlists_list.return_value = [mock_playlist]
 
         result = self.mixin._find_playlist_by_title(
             self.mock_client, 12345, "MY PLAYLIST"
@@ -393,7 +408,7 @@ class TestYandexMusicHelperMixin:
 
     def test_find_playlist_by_title_error(self):
         """Тест поиска плейлиста с ошибкой"""
-        self.mock_client.users_playlists.side_effect = Exception("API Error")
+        self.mock_client.users_playlists_list.side_effect = Exception("API Error")
 
         result = self.mixin._find_playlist_by_title(
             self.mock_client, 12345, "my playlist"
@@ -402,7 +417,7 @@ class TestYandexMusicHelperMixin:
 
     def test_find_playlist_by_title_no_playlists(self):
         """Тест поиска плейлиста при их отсутствии"""
-        self.mock_client.users_playlists.return_value = None
+        self.mock_client.users_playlists_list.return_value = None
 
         result = self.mixin._find_playlist_by_title(
             self.mock_client, 12345, "my playlist"
@@ -373,17 +373,14 @@ class TestYandexMusicStatsMixin:
     ):
         """Тест успешного получения топ-жанров из библиотеки"""
         mock_likes = Mock()
-        mock_likes.tracks = ["liked_track1", "liked_track2"]
+        mock_likes.tracks = ["1:10", "2:20"]
 
-        mock_track1 = Mock()
+        mock_track1 = Mock(id=1, album_id=10)
         mock_track1.genre = "Rock"
 
-        mock_track2 = Mock()
+        mock_track2 = Mock(id=2, album_id=20)
         mock_track2.genre = "Pop"
 
-        mock_track3 = Mock()
-        mock_track3.genre = "Rock"
-
         mock_client.users_likes_tracks.return_value = mock_likes
 
         with patch.object(
@@ -392,15 +389,15 @@ class TestYandexMusicStatsMixin:
             with patch.object(
                 stats_mixin_with_get_client,
                 "_fetch_tracks",
-                side_effect=[[mock_track1, mock_track2], [mock_track3]],
-            ):
+                return_value=[mock_track1, mock_track2],
+            ) as mock_fetch:
                 with patch.object(
                     stats_mixin_with_get_client, "_get_account_uid", return_value=123456
                 ):
                     with patch.object(
                         stats_mixin_with_get_client,
-                        "_get_playlist_tracks",
-                        return_value=[mock_track3],
+                        "_get_playlist_track_refs",
+                        return_value=["1:10"],
                     ):
                         result = await stats_mixin_with_get_client._get_top_genres_from_library(
                             self.token, self.user_id, limit=2
@@ -411,6 +408,45 @@ class TestYandexMusicStatsMixin:
                         assert result[0]["count"] == 2
                         assert result[1]["name"] == "Pop"
                         assert result[1]["count"] == 1
+                        mock_fetch.assert_called_once_with(mock_client, ["1:10", "2:20"])
+
+    @pytest.mark.asyncio
+    async def test_get_top_genres_from_library_unique(
+        self, stats_mixin_with_get_client, mock_client
+    ):
+        """Тест подсчёта уникальных треков библиотеки"""
+        mock_likes = Mock()
+        mock_likes.tracks = ["1:10", "2:20"]
+
+        mock_track1 = Mock(id=1, album_id=10)
+        mock_track1.genre = "Rock"
+
+        mock_track2 = Mock(id=2, album_id=20)
+        mock_track2.genre = "Pop"
+
+        mock_client.users_likes_tracks.return_value = mock_likes
+
+        with patch.object(
+            stats_mixin_with_get_client, "get_client", return_value=mock_client
+        ):
+            with patch.object(
+                stats_mixin_with_get_client,
+                "_fetch_tracks",
+                return_value=[mock_track1, mock_track2],
+            ):
+                with patch.object(
+                    stats_mixin_with_get_client, "_get_account_uid", return_value=123456
+                ):
+                    with patch.object(
+                        stats_mixin_with_get_client,
+                        "_get_playlist_track_refs",
+                        return_value=["1:10", "1"],
+                    ):
+                        result = await stats_mixin_with_get_client._get_top_genres_from_library(
+                            self.token, self.user_id, limit=2, unique=True
+                        )
+
+                        assert {item["name"]: item["count"] for item in result} == {"Rock": 1, "Pop": 1}
 
     @pytest.mark.asyncio
     async def test_get_top_genres_from_library_no_genre(
@@ -462,7 +498,7 @@ class TestYandexMusicStatsMixin:
                 ):
                     with patch.object(
                         stats_mixin_with_get_client,
-                        "_get_playlist_tracks",
+                        "_get_playlist_track_refs",
                         return_value=[],
                     ):
                         result = await stats_mixin_with_get_client._get_top_genres_from_library(
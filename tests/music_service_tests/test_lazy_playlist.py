@@ -0,0 +1,51 @@
+from unittest.mock import MagicMock, Mock
+
+from src.services.lazy_playlist import LazyPlaylist
+
+
+def make_header(kind, track_count=1, tracks=None):
+    return Mock(kind=kind, title=f"Playlist {kind}", revision=3, track_count=track_count, tracks=tracks or [], uid=99)
+
+
+class TestLazyPlaylist:
+    """Тесты для ленивой загрузки треков плейлиста"""
+
+    def test_header_without_request(self):
+        """Тест доступа к заголовку без загрузки треков"""
+        client = MagicMock()
+        playlist = LazyPlaylist(client, make_header(5, track_count=12))
+
+        assert (playlist.kind, playlist.title, playlist.revision, playlist.track_count) == (5, "Playlist 5", 3, 12)
+        assert playlist.owner_uid == 99
+        assert not playlist.loaded
+        client.users_playlists.assert_not_called()
+
+    def test_tracks_loaded_on_iteration(self):
+        """Тест загрузки треков при первом обращении"""
+        client = MagicMock()
+        client.users_playlists.return_value = [Mock(kind=5, tracks=["a", "b"])]
+        playlist = LazyPlaylist(client, make_header(5), owner_uid=1)
+
+        assert list(playlist) == ["a", "b"]
+        assert list(playlist) == ["a", "b"]
+        client.users_playlists.assert_called_once_with([5], 1)
+
+    def test_load_many_single_request(self):
+        """Тест загрузки нескольких плейлистов одним запросом"""
+        client = MagicMock()
+        client.users_playlists.return_value = [Mock(kind=1, tracks=["a"]), Mock(kind=2, tracks=["b"])]
+        playlists = [LazyPlaylist(client, make_header(kind), owner_uid=1) for kind in (1, 2, 3)]
+
+        LazyPlaylist.load_many(client, playlists)
+
+        assert [p.tracks for p in playlists] == [["a"], ["b"], []]
+        client.users_playlists.assert_called_once_with([1, 2, 3], 1)
+
+    def test_pre_expanded_header(self):
+        """Тест использования треков, уже пришедших в заголовке"""
+        client = MagicMock()
+        playlist = LazyPlaylist(client, make_header(1, tracks=["a"]))
+
+        assert playlist.loaded
+        assert playlist.tracks == ["a"]
+        client.users_playlists.assert_not_called()
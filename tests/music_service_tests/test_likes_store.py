@@ -0,0 +1,117 @@
+import pytest
+from datetime import datetime, timedelta, timezone
+from unittest.mock import Mock
+
+from src.services.likes_store import LikesStore
+
+
+def make_like(track_id, album_id, timestamp):
+    like = Mock()
+    like.id = track_id
+    like.album_id = album_id
+    like.timestamp = timestamp
+    return like
+
+
+class TestLikesStore:
+    """Тесты для локального хранилища лайков"""
+
+    def test_apply_and_count(self):
+        """Тест применения списка лайков и подсчёта по времени"""
+        store = LikesStore()
+        added, removed = store.apply(1, [("1", 100.0), ("2", 200.0), ("3", None)])
+
+        assert (added, removed) == (3, 0)
+        assert len(store) == 3
+        assert store.revision == 1
+        assert store.count_since(150.0) == 1
+        assert store.count_since(0.0) == 2
+
+    def test_apply_delta(self):
+        """Тест применения только изменений"""
+        store = LikesStore()
+        store.apply(1, [(str(i), float(i)) for i in range(10)])
+        added, removed = store.apply(2, [(str(i), float(i)) for i in range(1, 10)] + [("new", 50.0)])
+
+        assert (added, removed) == (1, 1)
+        assert "0" not in store
+        assert "new" in store
+        assert store.count_since(9.0) == 2
+
+    def test_relike_updates_timestamp(self):
+        """Тест обновления времени при повторном лайке"""
+        store = LikesStore()
+        store.apply(1, [(str(i), float(i)) for i in range(10)])
+        store.apply(2, [(str(i), float(i)) for i in range(1, 10)] + [("0", 100.0)])
+
+        assert len(store) == 10
+        assert store.count_since(50.0) == 1
+
+    def test_iteration_is_snapshot(self):
+        """Тест обхода лайков, пока хранилище меняется синхронизацией"""
+        store = LikesStore()
+        store.apply(1, [(str(i), float(i)) for i in range(10)])
+
+        seen = []
+        for track_id in store:
+            if not seen:
+                store.apply(2, [(str(i), float(i)) for i in range(5, 10)])
+            seen.append(track_id)
+
+        assert len(seen) == 10
+        assert len(store) == 5
+
+
+class TestSyncLikes:
+    """Тесты для синхронизации лайков по ревизии"""
+
+    def test_unchanged_revision_skips_apply(self, music_service, mock_client):
+        """Тест пропуска применения при неизменной ревизии"""
+        now = datetime.now(timezone.utc)
+        likes = Mock()
+        likes.revision = 5
+        likes.tracks = [make_like(1, 10, now.isoformat()), make_like(2, 20, (now - timedelta(days=40)).isoformat())]
+        mock_client.users_likes_tracks.return_value = likes
+
+        store = music_service._sync_likes(mock_client, 1)
+        assert len(store) == 2
+        assert store.revision == 5
+        assert "1:10" in store
+
+        likes.tracks = []
+        same = music_service._sync_likes(mock_client, 1)
+
+        assert same is store
+        assert len(store) == 2
+        mock_client.users_likes_tracks.assert_called_with(if_modified_since_revision=5)
+
+    def test_refs_without_id_skipped(self, music_service, mock_client):
+        """Тест пропуска записей без id: позиции не превращаются в ложные id"""
+        now = datetime.now(timezone.utc).isoformat()
+        broken = Mock(id=None, track_id=None, album_id=None, timestamp=now)
+        likes = Mock()
+        likes.revision = 1
+        likes.tracks = [broken, make_like(1, 10, now)]
+        mock_client.users_likes_tracks.return_value = likes
+        store = music_service._sync_likes(mock_client, 1)
+        assert list(store) == ["1:10"]
+
+        likes.revision = 2
+        likes.tracks = [make_like(1, 10, now), broken]
+        music_service._sync_likes(mock_client, 1)
+
+        assert list(store) == ["1:10"]
+        assert store.revision == 2
+
+    @pytest.mark.asyncio
+    async def test_recent_likes_from_store(self, music_service, mock_client):
+        """Тест подсчёта недавних лайков по локальному хранилищу"""
+        now = datetime.now(timezone.utc)
+        likes = Mock()
+        likes.revision = 1
+        likes.tracks = [make_like(1, 10, now.isoformat()), make_like(2, 20, (now - timedelta(days=40)).isoformat())]
+        mock_client.users_likes_tracks.return_value = likes
+        music_service.clients[1] = mock_client
+
+        assert await music_service._get_liked_tracks_count("token", 1) == 2
+        assert await music_service._get_recent_likes_count("token", 1, days=30) == 1
@@ -0,0 +1,104 @@
+import pytest
+from datetime import datetime, timedelta, timezone
+from unittest.mock import Mock, patch
+
+from src.services.listening_history import DAY_SECONDS, ListeningHistory
+
+NOW = 1_700_000_000.0
+
+
+def play(days_ago, duration_ms=60000, artists=("Artist",), genre="rock", track_id="1"):
+    return NOW - days_ago * DAY_SECONDS, track_id, duration_ms, list(artists), genre
+
+
+class TestListeningHistory:
+    """Тесты для истории прослушиваний по дням"""
+
+    def test_window_queries(self):
+        """Тест запросов за разные окна"""
+        history = ListeningHistory()
+        history.extend([play(200), play(40, genre="pop"), play(3, 120000), play(1, artists=("A", "B"))])
+
+        assert history.plays(7, now=NOW) == 2
+        assert history.minutes(7, now=NOW) == 3
+        assert history.minutes(365, now=NOW) == 5
+        assert history.top_genres(90, now=NOW) == {"rock": 2, "pop": 1}
+        assert history.top_artists(7, now=NOW) == {"Artist": 1, "A": 1, "B": 1}
+
+    def test_extend_is_append_only(self):
+        """Тест дописывания только новых прослушиваний"""
+        history = ListeningHistory()
+        assert history.extend([play(5), play(2), play(2, track_id="2")]) != set()
+
+        changed = history.extend([play(5), play(2), play(1)])
+
+        assert changed == {int((NOW - DAY_SECONDS) // DAY_SECONDS)}
+        assert history.plays(30, now=NOW) == 4
+
+    def test_extend_dedups_by_timestamp_and_track(self):
+        """Тест: прослушивание с временем последнего сохранённого не теряется"""
+        history = ListeningHistory()
+        history.extend([play(2), play(1)])
+
+        changed = history.extend([play(1), play(1, track_id="2"), play(1, track_id="2")])
+
+        assert changed == {int((NOW - DAY_SECONDS) // DAY_SECONDS)}
+        assert history.plays(30, now=NOW) == 3
+
+    def test_legacy_bucket_keeps_strict_watermark(self):
+        """Тест: для данных без id треков время последней записи считается учтённым"""
+        history = ListeningHistory()
+        history.extend([play(1)])
+        data = history.to_dict()
+        for bucket in data.values():
+            del bucket["last_ids"]
+        restored = ListeningHistory.from_dict(data)
+
+        assert restored.extend([play(1, track_id="2")]) == set()
+        assert restored.extend([play(0.5, track_id="2")]) != set()
+        assert restored.plays(30, now=NOW) == 2
+
+    def test_roundtrip(self):
+        """Тест сериализации и восстановления"""
+        history = ListeningHistory()
+        history.extend([play(10), play(1, genre=None)])
+
+        restored = ListeningHistory.from_dict(
+            {str(day): bucket for day, bucket in history.to_dict().items()}
+        )
+
+        assert restored.plays(30, now=NOW) == 2
+        assert restored.top_genres(30, now=NOW) == {"rock": 1}
+        assert restored.last_ts == history.last_ts
+        assert restored.extend([play(1)]) == set()
+
+
+class TestSyncListeningHistory:
+    """Тесты для накопления истории прослушиваний сервисом"""
+
+    @pytest.mark.asyncio
+    async def test_history_outlives_upstream_window(self, music_service, mock_client):
+        """Тест сохранения прослушиваний, выпавших из истории API"""
+        now = datetime.now(timezone.utc)
+        old_track = Mock(duration_ms=600000, genre="rock", artists=[])
+        new_track = Mock(duration_ms=60000, genre="pop", artists=[])
+        music_service.clients[1] = mock_client
+
+        with patch.object(music_service, "_load_listening_history", return_value=ListeningHistory()):
+            with patch.object(music_service, "_save_listening_days") as mock_save:
+                with patch.object(music_service, "_get_recent_history", return_value=["item"]):
+                    with patch.object(
+                        music_service, "_collect_tracks_from_history",
+                        return_value=[(old_track, now - timedelta(days=2))],
+                    ):
+                        await music_service._get_listening_minutes("token", 1, days=7)
+                    with patch.object(
+                        music_service, "_collect_tracks_from_history",
+                        return_value=[(new_track, now)],
+                    ):
+                        minutes = await music_service._get_listening_minutes("token", 1, days=7)
+                        genres = await music_service._get_top_genres_from_recent("token", 1, days=90)
+
+        assert minutes == 11
+        assert {item["name"] for item in genres} == {"rock", "pop"}
+        assert mock_save.call_count == 2
@@ -0,0 +1,110 @@
+import pytest
+from unittest.mock import MagicMock, patch
+
+from src.services.lyrics_decoder import (
+    SyncedLine,
+    decode_lrc,
+    encode_lrc,
+    iter_response_lines,
+)
+
+
+class TestLyricsDecoder:
+    """Тесты для потокового разбора LRC"""
+
+    def test_decode_lrc_strips_timestamps(self):
+        """Тест удаления меток времени и пустых строк"""
+        lines = ["[00:01.50]Первая строка", "[00:03.00]", "  ", "Без метки"]
+        result = decode_lrc(lines)
+        assert [line.text for line in result] == ["Первая строка", "Без метки"]
+        assert all(line.time_ms is None for line in result)
+
+    def test_decode_lrc_keep_timings(self):
+        """Тест сохранения времени строк"""
+        result = decode_lrc(["[01:02.5]Hello", "[00:00:12]World", "Plain"], keep_timings=True)
+        assert result == [
+            SyncedLine(62500, "Hello"),
+            SyncedLine(120, "World"),
+            SyncedLine(None, "Plain"),
+        ]
+
+    def test_encode_lrc_round_trip(self):
+        """Тест записи строк с таймкодами и обратного разбора"""
+        lines = [SyncedLine(62500, "Hello"), SyncedLine(None, "Plain"), SyncedLine(3723004, "Late")]
+
+        assert encode_lrc(lines) == "[01:02.500] Hello\nPlain\n[62:03.004] Late"
+        assert encode_lrc(lines, with_ms=False).splitlines()[0] == "[01:02] Hello"
+        assert decode_lrc(encode_lrc(lines).split("\n"), keep_timings=True) == lines
+
+    def test_iter_response_lines_decodes_bytes(self):
+        """Тест декодирования строк ответа"""
+        response = MagicMock()
+        data = "Привет\r\nWorld".encode("utf-8")
+        # Куски режут многобайтовые символы и переводы строк пополам
+        response.iter_content.return_value = iter(data[i:i + 3] for i in range(0, len(data), 3))
+        assert list(iter_response_lines(response)) == ["Привет", "World"]
+
+    def test_iter_response_lines_caps_size(self):
+        """Тест ограничения объёма читаемого текста"""
+        response = MagicMock()
+        response.iter_content.return_value = iter([b"x" * 10 + b"\n"] * 100)
+        assert len(list(iter_response_lines(response, max_bytes=55))) == 5
+
+    def test_iter_response_lines_caps_text_without_newlines(self):
+        """Тест обрыва чтения ответа без переводов строк"""
+        chunks_read = 0
+
+        def chunks():
+            nonlocal chunks_read
+            while True:
+                chunks_read += 1
+                yield b"x" * 8
+
+        response = MagicMock()
+        response.iter_content.return_value = chunks()
+
+        assert list(iter_response_lines(response, max_bytes=64, chunk_size=8)) == []
+        assert chunks_read == 9
+        response.iter_content.assert_called_once_with(chunk_size=8)
+
+
+class TestMusicServiceLyricsDownload:
+    """Тесты загрузки текста по download_url"""
+
+    def test_download_lyrics_streams_response(self, music_service):
+        """Тест потоковой загрузки текста"""
+        response = MagicMock()
+        response.__enter__.return_value = response
+        response.iter_content.return_value = iter([b"[00:01.00]Line 1\n[00:02", b".00]Line 2\n"])
+
+        with patch(
+            "src.services.yandex_music_service.requests.get", return_value=response
+        ) as get:
+            result = music_service._download_lyrics("http://lyrics", keep_timings=True)
+
+        assert result == [SyncedLine(1000, "Line 1"), SyncedLine(2000, "Line 2")]
+        assert get.call_args.kwargs["stream"] is True
+
+    def test_download_lyrics_error(self, music_service):
+        """Тест ошибки загрузки"""
+        with patch(
+            "src.services.yandex_music_service.requests.get",
+            side_effect=Exception("Network error"),
+        ):
+            assert music_service._download_lyrics("http://lyrics") == []
+
+    @pytest.mark.asyncio
+    async def test_get_synced_lyrics_cached_as_lrc(self, music_service):
+        """Тест кэширования синхронизированного текста"""
+        lines = [SyncedLine(1000, "Line 1"), SyncedLine(2000, "Line 2")]
+        stored = {}
+
+        with patch("src.services.yandex_music_service.get_cached_lyrics", side_effect=stored.get), \
+                patch("src.services.yandex_music_service.set_cached_lyrics", side_effect=stored.__setitem__), \
+                patch.object(music_service, "_fetch_synced_lyrics", return_value=lines) as mock_fetch:
+            first = await music_service.get_synced_lyrics("token", 123, "42:7")
+            second = await music_service.get_synced_lyrics("token", 123, "42:7")
+
+        assert first == second == lines
+        assert list(stored) == ["42:lrc"]
+        mock_fetch.assert_called_once()
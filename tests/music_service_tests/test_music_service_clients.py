@@ -0,0 +1,56 @@
+from unittest.mock import MagicMock, patch
+
+from src.services.track_index import TrackSearchIndex
+
+
+class TestMusicServiceClients:
+    """Тесты для пула клиентов сервиса"""
+
+    def test_register_client_seeds_pool(self, music_service, mock_account):
+        """Тест добавления клиента после авторизации вместе с uid"""
+        client = MagicMock()
+        client.me = mock_account
+
+        music_service.register_client(1, client)
+
+        with patch("src.services.yandex_music_service.Client") as client_cls:
+            assert music_service.get_client("token", 1) is client
+        client_cls.assert_not_called()
+        assert music_service._get_user_uid(client, 1) == 123456
+        client.account_status.assert_not_called()
+
+    def test_register_client_replaces_previous_account(self, music_service, mock_account):
+        """Тест сброса данных прежнего аккаунта при повторной авторизации"""
+        music_service.clients[1] = MagicMock()
+        music_service.account_uids[1] = 1
+        music_service.track_indexes[1] = TrackSearchIndex()
+        client = MagicMock()
+        client.me = mock_account
+
+        music_service.register_client(1, client)
+
+        assert music_service.clients[1] is client
+        assert music_service.account_uids[1] == 123456
+        assert 1 not in music_service.track_indexes
+
+    def test_register_client_without_account(self, music_service):
+        """Тест добавления клиента без данных аккаунта"""
+        client = MagicMock()
+        client.me = None
+
+        music_service.register_client(1, client)
+
+        assert music_service.clients[1] is client
+        assert 1 not in music_service.account_uids
+
+    def test_forget_user(self, music_service):
+        """Тест удаления клиента и кэшей пользователя при выходе"""
+        music_service.clients[1] = MagicMock()
+        music_service.clients[2] = MagicMock()
+        music_service.account_uids[1] = 42
+
+        music_service.forget_user(1)
+
+        assert 1 not in music_service.clients
+        assert 1 not in music_service.account_uids
+        assert 2 in music_service.clients
@@ -67,3 +67,39 @@ class TestMusicServiceCreate:
 
                 result = await music_service.create_playlist(token, user_id, title)
                 assert result is None
+
+    @pytest.mark.asyncio
+    async def test_create_playlist_uses_cached_uid(self, music_service):
+        """Тест создания плейлиста с uid из памяти, без запроса account_status"""
+        mock_client = MagicMock()
+        mock_client.users_playlists_create.return_value = MagicMock(kind=789, title="New Playlist")
+        music_service.remember_account_uid(123, 654321)
+
+        with patch.object(music_service, "get_client", return_value=mock_client):
+            result = await music_service.create_playlist("test_token", 123, "New Playlist", ["1:2"])
+
+        assert result["uid"] == 654321
+        mock_client.account_status.assert_not_called()
+        mock_client.users_playlists_insert_track.assert_called_once_with(654321, 789, "1:2")
+
+    def test_user_uid_resolved_once(self, music_service):
+        """Тест однократного запроса uid и сохранения его в хранилище"""
+        mock_client = MagicMock()
+
+        with patch.object(music_service, "_load_account_uid", return_value=None), \
+                patch.object(music_service, "_save_account_uid") as save_uid, \
+                patch.object(music_service, "_get_account_uid", return_value=42) as get_uid:
+            assert music_service._get_user_uid(mock_client, 123) == 42
+            assert music_service._get_user_uid(mock_client, 123) == 42
+
+        get_uid.assert_called_once_with(mock_client)
+        save_uid.assert_called_once_with(123, 42)
+
+    def test_user_uid_from_storage(self, music_service):
+        """Тест чтения uid из хранилища без обращения к API"""
+        with patch.object(music_service, "_load_account_uid", return_value=77), \
+                patch.object(music_service, "_get_account_uid") as get_uid:
+            assert music_service._get_user_uid(MagicMock(), 123) == 77
+
+        get_uid.assert_not_called()
+        assert music_service.account_uids[123] == 77
@@ -75,3 +75,55 @@ class TestMusicServiceLyrics:
             result = await music_service.get_song_lyrics(token, user_id, track_id)
 
         assert result is None
+
+    @pytest.mark.asyncio
+    async def test_get_song_lyrics_from_cache(self, music_service):
+        """Тест получения текста из кэша без обращения к API"""
+        with patch(
+            "src.services.yandex_music_service.get_cached_lyrics",
+            return_value="Cached lyrics",
+        ) as cache_get:
+            with patch.object(music_service, "get_client") as get_client:
+                result = await music_service.get_song_lyrics("token", 123, "111:222")
+
+        assert result == "Cached lyrics"
+        cache_get.assert_called_once_with("111")
+        get_client.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_get_song_lyrics_stores_in_cache(
+        self, music_service, mock_track_with_lyrics
+    ):
+        """Тест сохранения полученного текста в кэш"""
+        mock_client = MagicMock()
+        mock_client.tracks.return_value = [mock_track_with_lyrics]
+        mock_track_with_lyrics.lyrics = None
+
+        with patch(
+            "src.services.yandex_music_service.get_cached_lyrics", return_value=None
+        ):
+            with patch(
+                "src.services.yandex_music_service.set_cached_lyrics"
+            ) as cache_set:
+                with patch.object(music_service, "get_client", return_value=mock_client):
+                    result = await music_service.get_song_lyrics("token", 123, "111")
+
+        assert result == "Test lyrics\nLine 1\nLine 2"
+        cache_set.assert_called_once_with("111", result)
+
+    @pytest.mark.asyncio
+    async def test_get_track_title_uses_track_cache(self, music_service):
+        """Тест названия трека по id: второй запрос обслуживается из кэша"""
+        artist = MagicMock()
+        artist.name = "Artist"
+        track = MagicMock(id=7, album_id=70, artists=[artist], title="Song <1>")
+
+        mock_client = MagicMock()
+        mock_client.tracks.return_value = [track]
+
+        with patch.object(music_service, "get_client", return_value=mock_client):
+            first = await music_service.get_track_title("token", 123, "7:70")
+            second = await music_service.get_track_title("token", 123, "7:70")
+
+        assert first == second == "Artist - Song <1>"
+        mock_client.tracks.assert_called_once_with(["7:70"])
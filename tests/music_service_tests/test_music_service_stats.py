@@ -0,0 +1,146 @@
+import pytest
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from src.services.listening_history import ListeningHistory
+from src.services.track_columns import TrackColumns
+
+
+async def stream(values):
+    for value in values:
+        yield value
+
+
+class TestMusicServiceStats:
+    """Тесты для сбора статистики пользователя"""
+
+    @pytest.mark.asyncio
+    async def test_iter_user_statistics_yields_sections_in_order(self, music_service):
+        """Тест пошаговой выдачи разделов статистики"""
+        with patch.object(music_service, "get_client", return_value=MagicMock()):
+            with patch.object(music_service, "_get_liked_tracks_count", AsyncMock(return_value=10)):
+                with patch.object(music_service, "_get_recent_likes_count", AsyncMock(return_value=2)):
+                    with patch.object(
+                        music_service, "_get_top_artists", AsyncMock(side_effect=Exception("API Error"))
+                    ):
+                        with patch.object(music_service, "_get_top_genres_from_recent", AsyncMock(return_value=[])):
+                            with patch.object(
+                                music_service, "_iter_top_genres_from_library", side_effect=lambda *_, **__: stream([[]])
+                            ):
+                                with patch.object(music_service, "_sync_listening_history"):
+                                    with patch.object(
+                                        music_service, "_get_listening_breakdown", AsyncMock(return_value={})
+                                    ):
+                                        sections = [
+                                            key async for key, _ in music_service.iter_user_statistics("token", 123)
+                                        ]
+                                        stats = await music_service.get_user_statistics("token", 123)
+
+        assert sections == [
+            "liked_tracks_count",
+            "recent_likes_last_month",
+            "top_genres_recent",
+            "listening_minutes",
+            "top_genres_library",
+        ]
+        assert stats["liked_tracks_count"] == 10
+        assert "top_artists" not in stats
+
+    @pytest.mark.asyncio
+    async def test_get_user_statistics_client_none(self, music_service):
+        """Тест статистики без клиента"""
+        with patch.object(music_service, "get_client", return_value=None):
+            assert await music_service.get_user_statistics("token", 123) == {}
+
+    @pytest.mark.asyncio
+    async def test_history_fetched_once_for_all_sections(self, music_service, mock_client):
+        """Тест общего снимка истории для жанров и времени прослушивания"""
+        history = ListeningHistory()
+        history.extend([(datetime.now(timezone.utc).timestamp(), "1", 180000, ["Artist"], "rock")])
+
+        with patch.object(music_service, "get_client", return_value=mock_client):
+            with patch.object(music_service, "_get_liked_tracks_count", AsyncMock(return_value=0)):
+                with patch.object(music_service, "_get_recent_likes_count", AsyncMock(return_value=0)):
+                    with patch.object(music_service, "_get_top_artists", AsyncMock(return_value=[])):
+                        with patch.object(
+                            music_service, "_iter_top_genres_from_library", side_effect=lambda *_, **__: stream([[]])
+                        ):
+                            with patch.object(
+                                music_service, "_sync_listening_history", return_value=history
+                            ) as mock_sync:
+                                stats = await music_service.get_user_statistics("token", 123)
+
+        mock_sync.assert_called_once()
+        assert stats["top_genres_recent"] == [{"name": "rock", "count": 1}]
+        assert stats["listening_minutes"]["total"] == 3
+        assert len(stats["listening_minutes"]["per_day"]) == 7
+        assert stats["listening_minutes"]["per_day"][-1]["minutes"] == 3
+
+    @pytest.mark.asyncio
+    async def test_top_artists_from_history(self, music_service, mock_client):
+        """Тест топа артистов по накопленной истории без повторной загрузки прослушиваний"""
+        now = datetime.now(timezone.utc).timestamp()
+        history = ListeningHistory()
+        history.extend([(now - 60, "1", 1000, ["A", "B"], None), (now, "2", 1000, ["A"], None)])
+        music_service.clients[1] = mock_client
+
+        with patch.object(music_service, "_get_recent_history") as mock_recent, \
+                patch.object(music_service, "_sync_likes") as mock_likes:
+            result = await music_service._get_top_artists("token", 1, limit=5, history=history)
+
+        assert result == [{"name": "A", "count": 2}, {"name": "B", "count": 1}]
+        mock_recent.assert_not_called()
+        mock_likes.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_top_artists_falls_back_to_likes(self, music_service, mock_client):
+        """Тест топа артистов по лайкам при пустой истории"""
+        artist = MagicMock()
+        artist.name = "Liked"
+        music_service.clients[1] = mock_client
+
+        with patch.object(music_service, "_sync_likes", return_value=["1"]), \
+                patch.object(music_service, "_iter_fetch_tracks", return_value=iter([[MagicMock(artists=[artist])]])):
+            result = await music_service._get_top_artists("token", 1, limit=5, history=ListeningHistory())
+
+        assert result == [{"name": "Liked", "count": 1}]
+
+    @pytest.mark.asyncio
+    async def test_top_artists_reuse_library_snapshot(self, music_service, mock_client):
+        """Тест топа артистов по лайкам из уже собранного снимка библиотеки"""
+        library = TrackColumns()
+        library.append(["Liked"], "rock", 0, key="1")
+        library.append(["Playlist only"], "pop", 0, key="2")
+        music_service.clients[1] = mock_client
+
+        with patch.object(music_service, "_sync_likes", return_value=["1:10"]), \
+                patch.object(music_service, "_iter_fetch_tracks") as mock_fetch:
+            result = await music_service._get_top_artists(
+                "token", 1, limit=5, history=ListeningHistory(), library=library
+            )
+
+        assert result == [{"name": "Liked", "count": 1}]
+        mock_fetch.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_library_genres_emitted_per_chunk(self, music_service, mock_client):
+        """Тест выдачи промежуточного топа жанров по мере гидрации"""
+        liked = [
+            MagicMock(genre="rock", artists=[]),
+            MagicMock(genre="pop", artists=[]),
+            MagicMock(genre="pop", artists=[]),
+        ]
+        music_service.clients[1] = mock_client
+
+        with patch.object(music_service, "_sync_likes", return_value=["1", "2", "3"]):
+            with patch.object(music_service, "_iter_fetch_tracks", return_value=iter([liked[:1], liked[1:]])):
+                with patch.object(music_service, "_get_account_uid", return_value=None):
+                    library = TrackColumns()
+                    partials = [
+                        result
+                        async for result in music_service._iter_top_genres_from_library("token", 1, library=library)
+                    ]
+
+        assert len(library) == 3
+        assert partials[0] == [{"name": "rock", "count": 1}]
+        assert partials[-1] == [{"name": "pop", "count": 2}, {"name": "rock", "count": 1}]
@@ -1,6 +1,8 @@
 import pytest
 from unittest.mock import MagicMock, patch
 
+from src.services.records import AddResult
+
 
 class TestMusicServiceAddTracks:
     """Тесты для методов добавления треков"""
@@ -35,3 +37,29 @@ class TestMusicServiceAddTracks:
                         mock_client.users_playlists_create.assert_called_once_with(
                             playlist_title
                         )
+
+    @pytest.mark.asyncio
+    async def test_iter_add_tracks_by_name_yields_per_track(self, music_service):
+        """Тест пошаговой выдачи результатов добавления"""
+        mock_client = MagicMock()
+        mock_playlist = MagicMock(kind=1)
+        mock_playlist.title = "Existing"
+        mock_client.users_playlists_list.return_value = [mock_playlist]
+        mock_client.users_playlists.return_value = mock_playlist
+
+        found = (MagicMock(title="Song"), 1, 2)
+        with patch.object(music_service, "get_client", return_value=mock_client):
+            with patch.object(
+                music_service, "_soft_find_track", side_effect=[found, None]
+            ):
+                results = [
+                    item
+                    async for item in music_service.iter_add_tracks_by_name(
+                        "token", 123, "existing", ["Song", "Missing", " "]
+                    )
+                ]
+
+        assert [status for status, _ in results] == ["added", "failed", "failed"]
+        assert results[1][1] == AddResult("Missing", reason="not_found")
+        assert results[2][1].reason == "empty"
+        mock_client.users_playlists_create.assert_not_called()
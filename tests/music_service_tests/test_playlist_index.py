@@ -0,0 +1,101 @@
+from unittest.mock import MagicMock, Mock
+
+from src.services.playlist_index import PlaylistTitleIndex, normalize_title
+
+
+def make_playlist(kind, title):
+    playlist = Mock(kind=kind, track_count=0, tracks=[])
+    playlist.title = title
+    return playlist
+
+
+class TestPlaylistTitleIndex:
+    """Тесты для индекса названий плейлистов"""
+
+    def test_normalize_title(self):
+        """Тест нормализации названия"""
+        assert normalize_title("  Мой   ПЛЕЙЛИСТ ") == "мой плейлист"
+        assert normalize_title("Straße") == normalize_title("STRASSE")
+
+    def test_rebuild_and_get(self):
+        """Тест построения индекса и поиска"""
+        index = PlaylistTitleIndex()
+        index.rebuild([make_playlist(1, "Rock"), make_playlist(2, "Pop")])
+
+        assert index.get("rock") == 1
+        assert index.get("POP") == 2
+        assert index.get("jazz") is None
+
+    def test_rename_and_discard(self):
+        """Тест обновления названия и удаления"""
+        index = PlaylistTitleIndex()
+        index.add(1, "Old")
+        index.add(1, "New")
+
+        assert index.get("old") is None
+        assert index.get("new") == 1
+
+        index.discard(1)
+        assert index.get("new") is None
+        assert len(index) == 0
+
+    def test_duplicate_titles(self):
+        """Тест плейлистов с одинаковыми названиями"""
+        index = PlaylistTitleIndex()
+        index.add(1, "Mix")
+        index.add(2, "mix")
+
+        assert index.get("Mix") == 1
+        index.discard(1)
+        assert index.get("Mix") == 2
+
+
+class TestResolvePlaylist:
+    """Тесты для поиска плейлиста через индекс"""
+
+    def test_hit_skips_listing(self, music_service):
+        """Тест поиска без запроса списка плейлистов при попадании в индекс"""
+        client = MagicMock()
+        rock = make_playlist(1, "Rock")
+        client.users_playlists_list.return_value = [rock]
+        client.users_playlists.return_value = rock
+
+        assert music_service._resolve_playlist(client, 7, "rock") is rock
+        assert music_service._resolve_playlist(client, 7, "ROCK") is rock
+        client.users_playlists_list.assert_called_once()
+
+    def test_requests_use_account_uid(self, music_service):
+        """Тест передачи uid аккаунта при построении индекса и загрузке плейлиста"""
+        client = MagicMock()
+        rock = make_playlist(1, "Rock")
+        client.users_playlists_list.return_value = [rock]
+        client.users_playlists.return_value = rock
+        music_service.account_uids[7] = 42
+
+        assert music_service._resolve_playlist(client, 7, "rock") is rock
+        client.users_playlists_list.assert_called_once_with(42)
+        client.users_playlists.assert_called_once_with(1, 42)
+
+    def test_stale_entry_rebuilds(self, music_service):
+        """Тест перестроения индекса после переименования плейлиста"""
+        client = MagicMock()
+        client.users_playlists_list.return_value = [make_playlist(1, "Rock")]
+        client.users_playlists.return_value = make_playlist(1, "Rock")
+        music_service._resolve_playlist(client, 7, "rock")
+
+        renamed = make_playlist(1, "Metal")
+        client.users_playlists_list.return_value = [renamed]
+        client.users_playlists.return_value = renamed
+
+        assert music_service._resolve_playlist(client, 7, "rock") is None
+        assert music_service.playlist_indexes[7].get("metal") == 1
+
+    def test_created_playlist_indexed(self, music_service):
+        """Тест добавления созданного плейлиста в индекс"""
+        client = MagicMock()
+        client.users_playlists_list.return_value = []
+        assert music_service._resolve_playlist(client, 7, "New") is None
+
+        music_service._index_playlist(7, make_playlist(9, "New"))
+
+        assert music_service.playlist_indexes[7].get("new") == 9
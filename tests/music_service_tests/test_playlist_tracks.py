@@ -0,0 +1,114 @@
+import pytest
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+from src.services.playlist_tracks import PlaylistTracks
+
+
+def make_track(track_id):
+    return SimpleNamespace(id=track_id, title=f"Song {track_id}", artists=[SimpleNamespace(name="Artist")])
+
+
+def make_ref(track_id, embedded=True):
+    return SimpleNamespace(id=track_id, album_id=100 + track_id, track=make_track(track_id) if embedded else None)
+
+
+def make_client(count, embedded=True):
+    client = MagicMock()
+    client.users_playlists.return_value = SimpleNamespace(
+        kind=7, title="Большой плейлист", revision=2, tracks=[make_ref(i, embedded) for i in range(1, count + 1)]
+    )
+    client.tracks.side_effect = lambda ids: [make_track(int(track_id.split(":")[0])) for track_id in ids]
+    return client
+
+
+class TestPlaylistTracks:
+    """Тесты для списка id треков открытого плейлиста"""
+
+    def test_window(self):
+        """Тест окна id треков по смещению"""
+        tracks = PlaylistTracks(7, "P", 1, [f"{i}:1" for i in range(25)])
+
+        assert tracks.window(10, 10) == (10, tuple(f"{i}:1" for i in range(10, 20)))
+        assert tracks.window(20, 10)[1] == tuple(f"{i}:1" for i in range(20, 25))
+
+    def test_window_clamped(self):
+        """Тест ограничения смещения за концом плейлиста"""
+        tracks = PlaylistTracks(7, "P", 1, [f"{i}:1" for i in range(25)])
+
+        assert tracks.window(100, 10)[0] == 20
+        assert tracks.window(-5, 10)[0] == 0
+        assert PlaylistTracks(7, "P", 1, []).window(0, 10) == (0, ())
+
+
+class TestMusicServicePlaylistTracks:
+    """Тесты для постраничных треков плейлиста"""
+
+    @pytest.mark.asyncio
+    async def test_first_page_from_response(self, music_service):
+        """Тест первой страницы из треков, вложенных в ответ, без запроса tracks"""
+        client = make_client(5000)
+        music_service.account_uids[1] = 42
+
+        with patch.object(music_service, "get_client", return_value=client):
+            page = await music_service.get_playlist_tracks_page("token", 1, 7, 0, 10)
+
+        client.users_playlists.assert_called_once_with(7, 42)
+        client.tracks.assert_not_called()
+        assert (page.title, page.total, page.total_pages) == ("Большой плейлист", 5000, 500)
+        assert page.items[0].track_id == "1:101"
+        assert page.items[0].title == "Artist - Song 1"
+        assert len(music_service.track_cache) == 10
+
+    @pytest.mark.asyncio
+    async def test_next_pages_loaded_by_chunk(self, music_service):
+        """Тест загрузки каждой следующей страницы одним запросом без повторной загрузки плейлиста"""
+        client = make_client(5000)
+        music_service.account_uids[1] = 42
+
+        with patch.object(music_service, "get_client", return_value=client):
+            await music_service.get_playlist_tracks_page("token", 1, 7, 0, 10)
+            page = await music_service.get_playlist_tracks_page("token", 1, 7, 4990, 10)
+            again = await music_service.get_playlist_tracks_page("token", 1, 7, 4990, 10)
+
+        client.users_playlists.assert_called_once()
+        client.tracks.assert_called_once_with([f"{i}:{100 + i}" for i in range(4991, 5001)])
+        assert [item.title for item in page.items] == [f"Artist - Song {i}" for i in range(4991, 5001)]
+        assert again == page
+        assert len(music_service.open_playlists[1]) == 5000
+
+    @pytest.mark.asyncio
+    async def test_unavailable_track(self, music_service):
+        """Тест трека, который не удалось загрузить"""
+        client = make_client(3, embedded=False)
+        client.tracks.side_effect = lambda ids: [make_track(1)]
+        music_service.account_uids[1] = 42
+
+        with patch.object(music_service, "get_client", return_value=client):
+            page = await music_service.get_playlist_tracks_page("token", 1, 7)
+
+        assert [item.title for item in page.items] == ["Artist - Song 1", "Трек недоступен", "Трек недоступен"]
+
+    @pytest.mark.asyncio
+    async def test_other_playlist_replaces_open(self, music_service):
+        """Тест замены открытого плейлиста при открытии другого"""
+        client = make_client(3)
+        music_service.account_uids[1] = 42
+
+        with patch.object(music_service, "get_client", return_value=client):
+            await music_service.get_playlist_tracks_page("token", 1, 7)
+            await music_service.get_playlist_tracks_page("token", 1, 8)
+
+        assert client.users_playlists.call_count == 2
+        assert music_service.open_playlists[1].kind == 8
+
+    @pytest.mark.asyncio
+    async def test_missing_playlist(self, music_service):
+        """Тест отсутствующего плейлиста"""
+        client = MagicMock()
+        client.users_playlists.return_value = None
+        music_service.account_uids[1] = 42
+
+        with patch.object(music_service, "get_client", return_value=client):
+            assert await music_service.get_playlist_tracks_page("token", 1, 7) is None
+        assert 1 not in music_service.open_playlists
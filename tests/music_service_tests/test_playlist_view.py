@@ -0,0 +1,91 @@
+import pytest
+from unittest.mock import AsyncMock, patch
+
+from src.services.playlist_view import PlaylistView
+from src.services.records import PlaylistInfo
+
+
+def make_playlists(count):
+    return [
+        PlaylistInfo(kind=i, title=f"Плейлист {i}", modified=f"2024-01-{i + 1:02d}T00:00:00")
+        for i in range(count)
+    ]
+
+
+class TestPlaylistView:
+    """Тесты для отсортированного снимка плейлистов"""
+
+    def test_sorted_by_modified(self):
+        """Тест сортировки: сначала недавно изменённые, без даты - в конце"""
+        view = PlaylistView([PlaylistInfo(kind=99, title="Без даты")] + make_playlists(3))
+
+        assert [pl.kind for pl in view.items] == [2, 1, 0, 99]
+
+    def test_page_by_offset(self):
+        """Тест страницы по смещению и размеру"""
+        page = PlaylistView(make_playlists(12)).page(3, 5)
+
+        assert [pl.kind for pl in page.items] == [8, 7, 6, 5, 4]
+        assert (page.page, page.total_pages, page.prev_offset, page.next_offset) == (0, 3, 0, 8)
+
+    def test_page_clamped(self):
+        """Тест ограничения смещения за пределами списка"""
+        view = PlaylistView(make_playlists(12))
+
+        assert view.page(100, 5).offset == 10
+        assert view.page(-3, 5).offset == 0
+        assert view.page(10, 5).next_offset is None
+
+    def test_search_by_prefix(self):
+        """Тест поиска по началу названия без учёта регистра"""
+        view = PlaylistView([
+            PlaylistInfo(kind=1, title="Rock Classics", modified="2024-01-03"),
+            PlaylistInfo(kind=2, title="Jazz", modified="2024-01-02"),
+            PlaylistInfo(kind=3, title="rock  ballads", modified="2024-01-04"),
+            PlaylistInfo(kind=4, title="Rockabilly", modified="2024-01-01"),
+        ])
+
+        assert [view.items[i].kind for i in view.search("ROCK")] == [3, 1, 4]
+        assert [view.items[i].kind for i in view.search("rock b")] == [3]
+        assert view.search("pop") == []
+        assert view.search("  ") == []
+
+    def test_expired(self):
+        """Тест истечения срока жизни снимка"""
+        assert PlaylistView([], ttl=0).expired
+        assert not PlaylistView([], ttl=60).expired
+
+
+class TestMusicServicePlaylistPages:
+    """Тесты для постраничного API плейлистов сервиса"""
+
+    @pytest.mark.asyncio
+    async def test_view_cached_between_pages(self, music_service):
+        """Тест одного запроса к API при листании страниц"""
+        with patch.object(music_service, "get_user_playlists", AsyncMock(return_value=make_playlists(12))) as fetch:
+            first = await music_service.get_playlists_page("token", 1, 0, 5)
+            second = await music_service.get_playlists_page("token", 1, 5, 5)
+            positions = await music_service.search_playlists("token", 1, "Плейлист 1")
+
+        fetch.assert_awaited_once()
+        assert [pl.kind for pl in first.items] == [11, 10, 9, 8, 7]
+        assert [pl.kind for pl in second.items] == [6, 5, 4, 3, 2]
+        assert [first.total, len(positions)] == [12, 3]
+
+    @pytest.mark.asyncio
+    async def test_refresh_reloads(self, music_service):
+        """Тест принудительного обновления снимка"""
+        with patch.object(music_service, "get_user_playlists", AsyncMock(return_value=make_playlists(2))) as fetch:
+            await music_service.get_playlists_page("token", 1)
+            await music_service.get_playlists_page("token", 1, refresh=True)
+
+        assert fetch.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_empty_not_cached(self, music_service):
+        """Тест отсутствия кэша для пустого списка плейлистов"""
+        with patch.object(music_service, "get_user_playlists", AsyncMock(return_value=[])):
+            assert await music_service.get_playlists_page("token", 1) is None
+            assert await music_service.search_playlists("token", 1, "a") == []
+
+        assert 1 not in music_service.playlist_views
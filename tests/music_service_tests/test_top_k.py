@@ -0,0 +1,45 @@
+from collections import Counter
+
+import pytest
+
+from src.services.top_k import SpaceSaving
+
+
+class TestSpaceSaving:
+    """Тесты для потокового топ-K"""
+
+    def test_exact_within_capacity(self):
+        """Тест точного подсчёта, пока элементов не больше capacity"""
+        items = ["rock", "pop", "rock", "jazz", "rock", "pop"]
+        top = SpaceSaving(capacity=10)
+        top.update(items)
+
+        assert top.exact
+        assert top.most_common(2) == Counter(items).most_common(2)
+
+    def test_update_with_mapping(self):
+        """Тест обновления готовыми счётчиками"""
+        top = SpaceSaving(capacity=10)
+        top.update({"rock": 3, "pop": 1})
+        top.update(Counter({"pop": 5}))
+
+        assert top.most_common(2) == [("pop", 6), ("rock", 3)]
+        assert top.total == 9
+
+    def test_bounded_memory_keeps_heavy_hitters(self):
+        """Тест ограничения памяти с сохранением частых элементов"""
+        top = SpaceSaving(capacity=5)
+        stream = []
+        for i in range(200):
+            stream.extend(["heavy", "medium", "heavy", f"rare{i}"])
+        top.update(stream)
+
+        assert len(top) == 5
+        assert not top.exact
+        assert [name for name, _ in top.most_common(2)] == ["heavy", "medium"]
+        assert top.counts["heavy"] - top.errors["heavy"] <= 400 <= top.counts["heavy"]
+
+    def test_invalid_capacity(self):
+        """Тест проверки ёмкости"""
+        with pytest.raises(ValueError):
+            SpaceSaving(capacity=0)
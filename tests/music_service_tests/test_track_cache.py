@@ -0,0 +1,89 @@
+import threading
+from unittest.mock import MagicMock, Mock, patch
+
+from src.services.track_cache import TrackCache
+
+
+def make_full_track(track_id, album_id):
+    track = Mock(id=track_id, album_id=album_id, artists=[], title=f"Song {track_id}")
+    return track
+
+
+class TestTrackCache:
+    """Тесты для LRU-кэша треков"""
+
+    def test_eviction(self):
+        """Тест вытеснения давно использованных треков"""
+        cache = TrackCache(max_size=2)
+        cache.put("1", "one")
+        cache.put("2", "two")
+        cache.get("1")
+        cache.put("3", "three")
+
+        assert "1" in cache
+        assert "2" not in cache
+        assert cache.get("3") == "three"
+
+    def test_ignores_empty_keys(self):
+        """Тест пропуска пустых ключей и значений"""
+        cache = TrackCache()
+        cache.put(None, "track")
+        cache.put("1", None)
+
+        assert len(cache) == 0
+        assert cache.get(None) is None
+
+    def test_concurrent_get_and_evict(self):
+        """Тест одновременного чтения и вытеснения из нескольких потоков"""
+        cache = TrackCache(max_size=8)
+        errors = []
+
+        def worker(seed):
+            try:
+                for i in range(5000):
+                    key = str((seed * 7 + i) % 32)
+                    cache.put(key, i)
+                    cache.get(str((seed + i) % 32))
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=worker, args=(seed,)) for seed in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert errors == []
+        assert len(cache) <= 8
+
+
+class TestHydrationPlanner:
+    """Тесты для планировщика загрузки треков"""
+
+    def test_embedded_tracks_not_fetched(self, music_service):
+        """Тест использования полных треков из ответа плейлиста без запросов"""
+        client = MagicMock()
+        header = Mock(kind=1, title="Playlist", track_count=2, tracks=[])
+        playlist = Mock(kind=1, tracks=[Mock(track=make_full_track(1, 10)), Mock(track=make_full_track(2, 20))])
+        client.users_playlists_list.return_value = [header]
+        client.users_playlists.return_value = [playlist]
+
+        result = music_service._get_playlist_tracks(client, 123)
+
+        assert [track.id for track in result] == [1, 2]
+        client.tracks.assert_not_called()
+        assert "1" in music_service.track_cache
+
+    def test_cached_tracks_not_fetched(self, music_service):
+        """Тест загрузки только отсутствующих в кэше треков"""
+        client = MagicMock()
+        cached = make_full_track(1, 10)
+        music_service.track_cache.put("1", cached)
+        fetched = make_full_track(2, 20)
+
+        with patch.object(music_service, "_fetch_tracks", return_value=[fetched]) as mock_fetch:
+            result = music_service._hydrate_tracks(client, ["1:10", "2:20"])
+
+        assert result == [cached, fetched]
+        mock_fetch.assert_called_once_with(client, ["2:20"])
+        assert music_service.track_cache.get("2") is fetched
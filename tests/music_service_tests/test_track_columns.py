@@ -0,0 +1,49 @@
+from src.services.track_columns import Interner, TrackColumns
+
+
+class TestTrackColumns:
+    """Тесты для колоночного представления треков"""
+
+    def test_interner(self):
+        """Тест присвоения последовательных id строкам"""
+        interner = Interner()
+
+        assert interner.intern("rock") == 0
+        assert interner.intern("pop") == 1
+        assert interner.intern("rock") == 0
+        assert interner.names == ["rock", "pop"]
+
+    def test_counts(self):
+        """Тест подсчёта жанров и артистов"""
+        columns = TrackColumns()
+        columns.append(["A", "B"], "rock", 1000)
+        columns.append(["A"], None, 2000)
+        columns.append([], "rock", None)
+
+        assert len(columns) == 3
+        assert columns.genre_counts() == {"rock": 2}
+        assert columns.artist_counts() == {"A": 2, "B": 1}
+        assert columns.total_duration_ms() == 3000
+
+    def test_counts_over_row_subset(self):
+        """Тест подсчёта по части строк снимка"""
+        columns = TrackColumns()
+        columns.append(["A", "B"], "rock", 1000, key="1")
+        columns.append(["A"], "pop", 2000, key="2")
+        columns.append(["C"], "pop", 0, key="3")
+
+        assert columns.keys == ["1", "2", "3"]
+        assert columns.artist_counts([0, 2]) == {"A": 1, "B": 1, "C": 1}
+        assert columns.genre_counts(start=1) == {"pop": 2}
+        assert columns.genre_counts([2, 1], start=1) == {"pop": 3}
+
+    def test_rows(self):
+        """Тест восстановления строк снимка"""
+        columns = TrackColumns()
+        columns.append(["A", "B"], "rock", 1000, 10.0)
+        columns.append([], None, 0)
+
+        assert list(columns.rows()) == [
+            (10.0, 1000, ["A", "B"], "rock"),
+            (None, 0, [], None),
+        ]
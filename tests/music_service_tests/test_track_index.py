@@ -0,0 +1,171 @@
+import pytest
+from unittest.mock import MagicMock, Mock, patch
+
+from src.services.records import TrackSummary
+from src.services.track_index import IndexedTrack, TrackSearchIndex, tokenize
+
+
+def make_artist(name):
+    artist = Mock()
+    artist.name = name
+    return artist
+
+
+def make_track(track_id, title, artists, album_id=10):
+    return Mock(
+        id=track_id,
+        title=title,
+        artists=[make_artist(name) for name in artists],
+        albums=[Mock(id=album_id)],
+    )
+
+
+class TestTrackSearchIndex:
+    """Тесты для локального индекса треков"""
+
+    def setup_method(self):
+        self.index = TrackSearchIndex()
+        self.index.add_many([
+            make_track(1, "Believer", ["Imagine Dragons"], album_id=100),
+            make_track(2, "Blinding Lights", ["The Weeknd"], album_id=200),
+            make_track(3, "Thunder", ["Imagine Dragons"], album_id=300),
+        ])
+
+    def test_tokenize(self):
+        """Тест токенизации с приведением регистра и ё"""
+        assert tokenize("Ёлка - ТЕСТ!") == ["елка", "тест"]
+
+    def test_len(self):
+        """Тест количества проиндексированных треков"""
+        assert len(self.index) == 3
+        assert 2 in self.index
+
+    def test_search_exact(self):
+        """Тест точного поиска по исполнителю и названию"""
+        result = self.index.search("Imagine Dragons Believer")
+        assert result == IndexedTrack(1, 100, "Believer", ("Imagine Dragons",))
+
+    def test_search_case_insensitive(self):
+        """Тест поиска без учёта регистра"""
+        assert self.index.search("BLINDING lights").track_id == 2
+
+    def test_search_fuzzy(self):
+        """Тест поиска с опечаткой"""
+        assert self.index.search("Imagin Dragons Thundr").track_id == 3
+
+    def test_search_prefers_tighter_match(self):
+        """Тест выбора трека с наибольшим покрытием токенов"""
+        self.index.add(make_track(4, "Believer (Remix)", ["Imagine Dragons", "Lil Wayne"]))
+        assert self.index.search("Believer").track_id == 1
+
+    def test_search_not_found(self):
+        """Тест отсутствия совпадений"""
+        assert self.index.search("Metallica Nothing Else Matters") is None
+
+    def test_search_empty_query(self):
+        """Тест пустого запроса"""
+        assert self.index.search("  ") is None
+
+    def test_add_invalid_track(self):
+        """Тест пропуска трека без id или названия"""
+        assert self.index.add(Mock(id=None, title="X")) is None
+        assert self.index.add(MagicMock()) is None
+        assert len(self.index) == 3
+
+
+class TestMusicServiceLocalSearch:
+    """Тесты использования локального индекса в сервисе"""
+
+    def test_soft_find_track_uses_local_index(self, music_service):
+        """Тест разрешения запроса без обращения к API"""
+        music_service._index_tracks(123, [make_track(1, "Believer", ["Imagine Dragons"], album_id=100)])
+        mock_client = MagicMock()
+
+        result = music_service._soft_find_track(mock_client, "Imagine Dragons - Believer", 123)
+
+        assert result[1:] == (1, 100)
+        mock_client.search.assert_not_called()
+
+    def test_search_requires_exact_share(self):
+        """Тест отказа от чисто нечёткого совпадения при заданной доле точных токенов"""
+        index = TrackSearchIndex()
+        index.add_many([
+            make_track(1, "Hells Bells", ["AC/DC"]),
+            make_track(2, "Thunderstruck", ["AC/DC"]),
+        ])
+
+        assert index.search("Hello").track_id == 1
+        assert index.search("Hello", min_exact_share=0.5) is None
+        assert index.search("Thunder", min_exact_share=0.5) is None
+        assert index.search("Hells Bels", min_exact_share=0.5).track_id == 1
+
+    def test_soft_find_track_fuzzy_only_falls_back_to_api(self, music_service):
+        """Тест: нечёткое локальное совпадение не заменяет поиск через API"""
+        music_service._index_tracks(123, [
+            make_track(1, "Hells Bells", ["AC/DC"], album_id=100),
+            make_track(2, "Thunderstruck", ["AC/DC"], album_id=200),
+        ])
+        mock_client = MagicMock()
+        mock_client.search.return_value = Mock(
+            tracks=Mock(results=[make_track(7, "Hello", ["Adele"], album_id=700)])
+        )
+
+        result = music_service._soft_find_track(mock_client, "Hello", 123)
+
+        assert result[1:] == (7, 700)
+        mock_client.search.assert_called_once()
+
+    def test_soft_find_track_does_not_index_search_result(self, music_service):
+        """Тест: найденный через API трек не попадает в индекс библиотеки"""
+        mock_client = MagicMock()
+        mock_client.search.return_value = Mock(
+            tracks=Mock(results=[make_track(5, "Thunder", ["Imagine Dragons"], album_id=500)])
+        )
+
+        first = music_service._soft_find_track(mock_client, "Thunder", 123)
+        second = music_service._soft_find_track(mock_client, "Thunder", 123)
+
+        assert first[1:] == second[1:] == (5, 500)
+        assert mock_client.search.call_count == 2
+        assert 5 not in music_service.track_indexes.get(123, ())
+
+    @pytest.mark.asyncio
+    async def test_build_track_index(self, music_service):
+        """Тест построения индекса из лайков и плейлистов"""
+        mock_client = MagicMock()
+        with patch.object(music_service, "get_client", return_value=mock_client), \
+                patch.object(music_service, "_sync_likes", return_value=["1:100"]):
+            with patch.object(
+                music_service,
+                "_fetch_tracks",
+                return_value=[make_track(1, "Believer", ["Imagine Dragons"])],
+            ):
+                with patch.object(music_service, "_get_account_uid", return_value=1):
+                    with patch.object(
+                        music_service,
+                        "_get_playlist_tracks",
+                        return_value=[make_track(2, "Thunder", ["Imagine Dragons"])],
+                    ):
+                        result = await music_service.build_track_index("token", 123)
+
+        assert result == 2
+        assert music_service.track_indexes[123].search("thunder").track_id == 2
+
+    @pytest.mark.asyncio
+    async def test_iter_build_track_index(self, music_service):
+        """Тест источника задачи построения индекса"""
+        with patch.object(music_service, "build_track_index", return_value=7) as mock_build:
+            sizes = [size async for size in music_service.iter_build_track_index("token", 123)]
+
+        assert sizes == [7]
+        mock_build.assert_called_once_with("token", 123)
+
+    @pytest.mark.asyncio
+    async def test_find_track_formats_result(self, music_service):
+        """Тест формата результата find_track"""
+        music_service._index_tracks(123, [make_track(1, "Believer", ["Imagine Dragons"], album_id=100)])
+
+        with patch.object(music_service, "get_client", return_value=MagicMock()):
+            result = await music_service.find_track("token", 123, "believer")
+
+        assert result == TrackSummary("1:100", "Imagine Dragons - Believer")